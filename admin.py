@@ -1,8 +1,26 @@
 from datetime import datetime
+import glob
+import hashlib
 import json
+import numpy as np
+import os
 import pandas as pd
-import re
+import pyarrow as pa
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from data import KakaoPlaceData
+from database import PlaceDatabase
+from index import QueryCache, ResultIds, get_distances
+import storage
+from profiler import profile_call, timer
+
+
+SERVICE_URLS = {
+    'kakao_search': 'https://dapi.kakao.com/v2/local/search/keyword.json',
+    'kakao_map': 'https://dapi.kakao.com/v2/maps/sdk.js',
+    'kakao_place': 'https://place.map.kakao.com',
+    'naver_clova': 'https://naveropenapi.apigw.ntruss.com/sentiment-analysis/v1/analyze'
+}
 
 
 class Person(object):
@@ -22,21 +40,51 @@ class KakaoAdmin(Admin):
 
     def __init__(self, name: str, address: str, service_keys: dict, local_info=dict()):
         super().__init__(name, address)
-        service_urls = dict()
-        service_urls['kakao_search'] = 'https://dapi.kakao.com/v2/local/search/keyword.json'
-        service_urls['kakao_map'] = 'https://dapi.kakao.com/v2/maps/sdk.js'
-        service_urls['naver_clova'] = 'https://naveropenapi.apigw.ntruss.com/sentiment-analysis/v1/analyze'
-        self.service_info = {'urls': service_urls, 'keys': service_keys}
+        self.service_info = {'urls': dict(SERVICE_URLS), 'keys': service_keys}
         self.local_info = local_info if local_info else {'si': '', 'gu': '', 'dong': '', 'name': ['']}
+        self.data_path = str()
+        self.data_stamp = None
+        self.data_type = json
+        self.database = None
+        self.query_cache = QueryCache()
+        self.use_api = True # 검색 결과가 없을 때 카카오 API로 새로운 맛집을 요청할지 여부
+        self.lock = threading.RLock()
 
 
-    def set_service_data(self, service_data=dict(), service_df=pd.DataFrame(), size=0):
+    def set_service_data(self, service_data=dict(), service_df=pd.DataFrame(), size=0, data_path=str()):
         """
         서비스 운영에 필요한 데이터를 서버로부터 가져오는 관리자 메소드
         서비스에 사용할 충분한 데이터가 없을 시 카카오 API를 통해 데이터 요청
+        data_path로 json 파일을 지정하면 원본 해시값에 해당하는 캐시 파일을 우선 불러오고,
+        캐시가 없을 때만 데이터프레임과 색인을 생성한 뒤 캐시 파일로 저장
+        data_path가 .arrow 파일이면 딕셔너리 없이 열 단위 저장 파일에서 데이터프레임을 바로 불러옴
         향후 다른 플랫폼(네이버 등)에 대한 검색 기능 추가 시 해당 메소드의 범용성을 개선해 상위 클래스 메소드로 변환
         """
 
+        if data_path:
+            self.data_path = data_path
+            self.data_stamp = self.get_data_stamp(data_path)
+            # 캐시 파일을 불러오는 경우에도 새로운 맛집을 원본과 같은 형식으로 저장하도록 먼저 지정
+            self.data_type = pa.Table if data_path.endswith('.arrow') else json
+            source = None
+            if not data_path.endswith('.arrow'): # Arrow 파일은 전체를 읽지 않고 필요한 열만 메모리 매핑
+                with open(data_path,'rb') as f:
+                    source = f.read()
+            artifact_path = self.get_artifact_path(data_path, source)
+
+            if os.path.exists(artifact_path):
+                try:
+                    self.service_data = KakaoPlaceData.load_artifact(artifact_path)
+                    return
+                except Exception as e:
+                    print(f'[{datetime.now()}] 캐시 파일을 불러오지 못했습니다. ({type(e)}, {e})') # 로그 기록
+
+            if data_path.endswith('.arrow'):
+                service_data = {'places': dict(), 'errors': dict()}
+                service_df = storage.read_service_df(data_path)
+            else:
+                service_data = json.loads(source.decode('UTF-8'))
+
         self.service_data = KakaoPlaceData(service_data, service_df)
 
         if not service_data:
@@ -45,177 +93,722 @@ class KakaoAdmin(Admin):
             service_df = self.service_data.dict_to_df(service_data['places'], self.local_info)
             self.service_data.update_dataframe(service_df)
 
+        if data_path:
+            self.save_artifact(artifact_path)
+
+
+    def set_database(self, db_path: str):
+        """
+        맛집 정보를 데이터프레임 대신 SQLite 데이터베이스에서 검색하도록 설정하는 관리자 메소드
+        데이터베이스가 비어 있으면 현재 서비스 데이터의 맛집과 유사 맛집 목록을 옮겨서 저장
+        """
+
+        database = PlaceDatabase(db_path, KakaoPlaceData.rank_weights)
+
+        if not database.count() and hasattr(self, 'service_data'):
+            database.import_data(self.service_data)
+
+        self.database = database
+
+
+    def save_artifact(self, artifact_path: str):
+        """
+        같은 원본에 대한 이전 캐시 파일을 지우고 현재 서비스 데이터를 캐시 파일로 저장하는 메소드
+        """
+
+        for stale_path in glob.glob(artifact_path.rsplit('.',2)[0]+'.*.pkl'):
+            os.remove(stale_path)
+        self.service_data.save_artifact(artifact_path)
+
+
+    def get_data_stamp(self, data_path: str) -> tuple:
+        """
+        서비스 데이터 파일의 변경 여부를 확인하기 위한 수정 시각과 크기를 반환하는 메소드
+        """
+
+        stat = os.stat(data_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+
+    def is_outdated(self) -> bool:
+        """
+        관리자 객체가 불러온 이후 서비스 데이터 파일이 다른 곳에서 변경되었는지 확인하는 메소드
+        공유 객체를 다시 생성해야 하는지 판단하는 용도로 사용
+        """
+
+        if not self.data_path or self.data_stamp is None:
+            return True
+
+        try:
+            return self.get_data_stamp(self.data_path) != self.data_stamp
+        except OSError:
+            return True
+
+
+    def get_artifact_path(self, data_path: str, source=None) -> str:
+        """
+        원본 데이터와 서비스 지역 정보의 해시값을 포함한 캐시 파일 경로를 반환하는 메소드
+        원본 데이터(source)를 전달하지 않으면 파일을 읽지 않고 수정 시각과 크기로 해시값을 계산
+        """
+
+        if source is None:
+            source = json.dumps(self.get_data_stamp(data_path)).encode('UTF-8')
+
+        source_hash = hashlib.sha256(source)
+        source_hash.update(json.dumps(self.local_info, ensure_ascii=False, sort_keys=True).encode('UTF-8'))
+        source_hash.update(KakaoPlaceData.artifact_version.encode('UTF-8'))
+
+        data_name = os.path.splitext(os.path.basename(data_path))[0]
+        return f'cache/{data_name}.{source_hash.hexdigest()[:16]}.pkl'
+
 
     def update_service_data(self, data_type: type):
         """
         관리자가 보유한 서비스 데이터를 서버에 저장하는 관리자 메소드
-        현재는 json 및 pd.DataFrame 타입만 지원
+        현재는 json, pd.DataFrame 및 pa.Table(열 단위 Arrow 파일) 타입만 지원
         """
 
         if type(self.service_data.get_data()) is not dict:
             raise Exception('해당 객체가 요청에 적합한 데이터를 가지고 있지 않습니다.')
 
         if data_type is json:
-            data = self.service_data.get_data()
-            with open('data/service_data.json','w') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            with open(f'log/service_data_{datetime.now()}.json','w') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            data_path = self.data_path if self.data_path.endswith('.json') else 'data/service_data.json'
+            source = json.dumps(self.service_data.get_data(), ensure_ascii=False, indent=4).encode('UTF-8')
+            with open(data_path,'wb') as f:
+                f.write(source)
+            with open(f'log/service_data_{datetime.now()}.json','wb') as f:
+                f.write(source)
         elif data_type is pd.DataFrame:
+            data_path = 'data/service_data.csv'
             df = self.service_data.get_dataframe().set_index('식당명')
-            df.to_csv('data/service_data.csv')
+            df.to_csv(data_path)
             df.to_csv(f'log/service_data_{datetime.now()}.csv')
+        elif data_type is pa.Table:
+            data_path = self.data_path if self.data_path.endswith('.arrow') else 'data/service_data.arrow'
+            storage.write_service_table(self.service_data.get_dataframe(), data_path)
+            storage.write_service_table(self.service_data.get_dataframe(), f'log/service_data_{datetime.now()}.arrow')
         else:
             raise Exception(f'{data_type} 타입은 현재 지원하지 않습니다.')
 
+        # 직접 기록한 파일은 메모리 상의 데이터와 같으므로 캐시를 갱신하고 변경 기록을 새로 남김
+        # 같은 파일을 불러온 다른 프로세스의 관리자 객체는 is_outdated()를 통해 다시 생성됨
+        if data_path == self.data_path:
+            if data_type is pa.Table:
+                self.save_artifact(self.get_artifact_path(data_path))
+            else:
+                with open(data_path,'rb') as f:
+                    self.save_artifact(self.get_artifact_path(data_path, f.read()))
+            self.data_stamp = self.get_data_stamp(data_path)
+
         print(f'[{datetime.now()}] {data_type} 서비스 데이터가 업데이트 되었습니다.') # 로그 기록
 
 
-    def advanced_search(self, keywords: list, target='일반 검색', display=None, exact=False) -> dict:
+    def advanced_search(self, keywords: list, target='일반 검색', display=None, exact=False,
+                        origin=None, radius=None) -> dict:
         """
         카카오 맛집 데이터프레임 상에서 키워드와 연관성이 있는 맛집 정보를 검색해 결과를 반환하는 메소드
+        origin으로 기준 위치 (x, y)를 지정하면 가까운 순으로 정렬하고, radius(미터)가 있으면 반경 밖의 맛집은 제외
         해당 메소드는 향후 KakaoPlaceData 클래스로 이동 가능
         """
 
-        if type(self.service_data.get_data()) is not dict:
+        # 검색한 행 번호가 데이터프레임을 만들기 전에 바뀌지 않도록 서비스 데이터 변경과 동시에 실행하지 않음
+        with self.lock, timer.stage('advanced_search', keywords=keywords, target=target, exact=exact):
+            if origin is None:
+                row_ids = self.search_ids(keywords, target, display, exact)
+            else:
+                row_ids = self.search_nearby(keywords, target, display, exact, origin, radius)
+
+            # 반환할 행에 대해서만 데이터프레임 생성
+            return self.get_records(row_ids) # 데이터프레임 반환
+        return self.get_records(row_ids).set_index('식당명').T.to_dict() # 딕셔너리 반환
+
+
+    def profile_search(self, keywords: list, target='일반 검색', display=None, exact=False,
+                       path=str(), limit=30) -> tuple:
+        """
+        검색 하나를 cProfile로 실행해 검색 결과와 누적 시간 기준 상위 limit개 함수의 통계 문자열을 반환하는 메소드
+        path를 지정하면 pstats 형식의 원본 통계를 파일로 저장
+        """
+
+        return profile_call(self.advanced_search, keywords, target, display, exact, path=path, limit=limit)
+
+
+    def search_cursor(self, keywords: list, target='일반 검색', exact=False, batch_size=10) -> 'SearchCursor':
+        """
+        검색 결과 전체 대신 필요한 만큼만 순위를 계산하고 페이지 단위로 맛집 정보를 생성하는 커서를 반환하는 메소드
+        """
+
+        cursor = SearchCursor(self, keywords, target, exact, batch_size)
+        cursor.rank(1) # 검색 결과가 없으면 이 단계에서 예외 발생
+
+        return cursor
+
+
+    def search_ids(self, keywords: list, target='일반 검색', display=None, exact=False) -> list:
+        """
+        키워드와 연관성이 있는 맛집의 행 번호를 최대 display개까지 순서대로 반환하는 메소드
+        같은 검색은 데이터 버전이 바뀌기 전까지 캐시된 결과를 사용
+        여러 세션이 공유하는 색인은 add_places()에서 제자리 갱신되므로 검색 중에는 lock을 유지
+        """
+
+        keywords = list(dict.fromkeys([keyword.strip() for keyword in keywords if keyword.strip()]))
+        key = self.query_cache.get_key(keywords, target, exact, display)
+
+        with self.lock:
+            version = self.get_data_version()
+
+            row_ids = self.query_cache.get(key, version)
+            if row_ids is None:
+                row_ids = self.find_ids(keywords, target, display, exact)
+                # 검색 도중 카카오 API 결과 추가 등으로 데이터가 바뀌었다면 이전 버전으로 저장하지 않음
+                if self.get_data_version() == version:
+                    self.query_cache.put(key, version, row_ids)
+
+        return row_ids
+
+
+    def find_ids(self, keywords: list, target='일반 검색', display=None, exact=False) -> list:
+        """
+        캐시를 거치지 않고 키워드와 연관성이 있는 맛집의 행 번호를 최대 display개까지 순서대로 계산하는 메소드
+        """
+
+        if self.database is None and type(self.service_data.get_data()) is not dict:
             raise Exception('해당 객체가 요청에 적합한 데이터를 가지고 있지 않습니다.')
 
-        df = self.service_data.get_dataframe()
-        result_df = df.iloc[:0]
-        display = len(df) if not display else display
+        # 데이터베이스를 사용하면 데이터프레임 대신 맛집 id를 전달
+        df = self.service_data.get_dataframe() if self.database is None else None
+        size = len(df) if self.database is None else self.database.count()
+        display = size if not display else display
 
         if not keywords:
-            return df.iloc[:display]
+            return self.get_popular_ids(display)
+
+        # 검색 단계마다 데이터프레임을 복사하지 않고 중복을 제거한 행 번호만 순서대로 전달
+        result = ResultIds(display)
 
         if target == '일반 검색': # 식당명, 메뉴 검색
-            result_df = self.search_name(df, result_df, keywords, display, exact)
-            result_df = self.search_by_row('메뉴', df, result_df, keywords, display, exact)
+            result = self.search_name(df, result, keywords, exact)
+            result = self.search_by_row('메뉴', df, result, keywords, exact)
         elif target == '식당명 검색': # 식당명 검색
-            result_df = self.search_name(df, result_df, keywords, display, exact)
+            result = self.search_name(df, result, keywords, exact)
         elif target == '메뉴 검색': # 메뉴 검색
-            result_df = self.search_by_row('메뉴', df, result_df, keywords, display, exact)
+            result = self.search_by_row('메뉴', df, result, keywords, exact)
         elif target == '리뷰 검색': # 리뷰 검색
-            result_df = self.search_by_row('리뷰', df, result_df, keywords, display, exact)
+            result = self.search_by_row('리뷰', df, result, keywords, exact)
         elif target == '전체 검색': # 모든 조건 검색
-            result_df = self.search_name(df, result_df, keywords, display, exact)
-            result_df = self.search_by_row('메뉴', df, result_df, keywords, display, exact)
-            result_df = self.search_by_row('리뷰', df, result_df, keywords, display, exact)
+            result = self.search_name(df, result, keywords, exact)
+            result = self.search_by_row('메뉴', df, result, keywords, exact)
+            result = self.search_by_row('리뷰', df, result, keywords, exact)
         else:
             raise Exception('검색 대상이 유효하지 않습니다.')
 
         # 검색 결과가 없으면 전체 검색을 진행해보고 카카오 API에 키워드를 요청
-        if not len(result_df):
-            verify_df = self.search_name(df, result_df, keywords, 1, exact)
-            verify_df = self.search_by_row('메뉴', df, verify_df, keywords, 1, exact)
-            verify_df = self.search_by_row('리뷰', df, verify_df, keywords, 1, exact)
-            if not len(verify_df):
-                result_df = self.search_api(' '.join(keywords), display)
+        if not len(result):
+            if not self.has_match(keywords, exact) and self.use_api:
+                result.extend(self.search_api(' '.join(keywords), display))
             else:
                 raise Exception('{} 검색 결과가 없어요.'.format(' '.join(keywords)))
 
         # 목록 개수가 요구사항보다 적으면 코사인 유사도 기반 탐색 진행
-        if len(result_df) < display:
-            result_df = self.service_data.get_similar_places(result_df, '식당명', display)
+        if not result.is_full():
+            result = self.get_similar_places(result)
 
-        return result_df.set_index('식당명').reset_index() # 데이터프레임 반환
-        return result_df.set_index('식당명').T.to_dict() # 딕셔너리 반환
+        return result.row_ids
 
 
-    def search_name(self, df: pd.DataFrame, result_df: pd.DataFrame, keywords: list, display: int, exact: bool) -> pd.DataFrame:
+    def search_nearby(self, keywords: list, target: str, display: int, exact: bool,
+                      origin: tuple, radius=None) -> list:
         """
-        카카오 맛집 데이터프레임 상에서 키워드와 연관성이 있는 식당명을 검색해 결과를 반환하는 메소드
+        검색 결과 중 기준 위치에서 radius미터 안에 있는 맛집을 가까운 순서대로 최대 display개 반환하는 메소드
+        키워드가 없으면 공간 색인에서 가장 가까운 맛집을 바로 탐색하고,
+        radius가 없으면 연관성 순위 상위 display개의 맛집을 거리순으로 다시 정렬
         """
 
-        if len(result_df) >= display:
-            return result_df
+        with self.lock:
+            if not keywords and self.database is None:
+                spatial_index = self.service_data.spatial_index
+                display = len(spatial_index) if not display else display
+                if radius is None:
+                    return spatial_index.query_knn(origin, display)
+                return spatial_index.query_radius(origin, radius)[:display]
 
-        target = df['식당명'].copy()
-        match_df = df['식당명'].notnull() if exact else df['식당명'].isnull()
+            # 반경 제한이 있거나 키워드가 없으면 display개를 채울 수 있도록 전체 순위를 대상으로 거리 계산
+            full_rank = radius is not None or not keywords
+            row_ids = self.search_ids(keywords, target, None if full_rank else display, exact)
+            distances = self.get_distances(origin, row_ids)
 
-        if exact:
-            for keyword in keywords:
-                    match_df &= (target == keyword)
-        else:
-            for keyword in keywords:
-                    match_df |= target.str.contains(keyword)
+            order = np.argsort(distances, kind='stable') if not keywords else np.arange(len(row_ids))
+            if radius is not None:
+                order = order[distances[order] <= radius]
+            order = order[:display] if display else order
 
-        result_df = result_df.append(df[match_df])
-        result_df.drop_duplicates(['식당명'], inplace=True)
+            return [row_ids[i] for i in order[np.argsort(distances[order], kind='stable')]]
 
-        return result_df.iloc[:display] if len(result_df) > display else result_df
+
+    def get_distances(self, origin: tuple, row_ids: list) -> np.ndarray:
+        """
+        기준 위치에서 각 행(데이터베이스 사용 시 맛집 id)까지의 거리(미터) 배열을 반환하는 메소드
+        """
+
+        if self.database is not None:
+            x, y = self.database.get_coords(row_ids)
+            return get_distances(origin, x, y)
+        return self.service_data.spatial_index.get_distances(origin, row_ids)
 
 
-    def search_by_row(self, column: str, df: pd.DataFrame, result_df: pd.DataFrame, keywords: list, display: int, exact: bool) -> pd.DataFrame:
+    def get_popular_ids(self, display: int) -> list:
+        if self.database is not None:
+            return self.database.get_popular_ids(display)
+        return list(range(min(display, len(self.service_data.get_dataframe()))))
+
+
+    def get_similar_places(self, result: ResultIds) -> ResultIds:
         """
-        카카오 맛집 데이터프레임 상에서 키워드와 연관성이 있는 목록 내 데이터를 검색해 결과를 반환하는 메소드
+        첫 번째 검색 결과와 유사한 맛집을 결과에 추가하고, 부족하면 나머지 맛집을 인기도 순으로 추가하는 메소드
         """
 
-        if column not in {'메뉴','리뷰'}:
-            raise Exception('검색 대상이 유효하지 않습니다.')
+        with timer.stage('get_similar_places'):
+            if self.database is None:
+                return self.service_data.get_similar_places(result)
+
+            if len(result):
+                result.extend(self.database.get_neighbors(result.row_ids[0]))
+
+            if not result.is_full():
+                result.extend(self.database.get_popular_ids(result.display + len(result)))
+
+            return result
 
-        if len(result_df) >= display:
-            return result_df
-
-        target = df[column].copy()
-        match_df = df['식당명'].notnull() if exact else df['식당명'].isnull()
-
-        match_list = list()
-
-        for target_items in target.iteritems():
-            # 데이터프레임을 직접 가져올 때 리스트가 문자열로 합쳐지는 문제에 대한 대비책
-            # try:
-            #     target_items[1].replace('"',"'")
-            #     target_items = re.search("\['(.*)'\]",target_items[1])
-            #     target_items = target_items[1].split("', '")
-            # except:
-            #     match_list.append(False)
-            #     continue
-
-            word_list = list()
-            for target_item in target_items[1]:
-                word_list += target_item.split()
-
-            for keyword in keywords:
-                if exact:
-                    match_row = True
-                    match_keyword = sum([(word == keyword) for word in word_list])
-                    match_row &= True if match_keyword else False
-                else:
-                    match_row = False
-                    match_keyword = sum([word.__contains__(keyword) for word in word_list])
-                    match_row |= True if match_keyword else False
-
-            match_list.append(match_row)
-
-        if exact:
-            for keyword in keywords:
-                    match_df &= match_list
-        else:
-            for keyword in keywords:
-                    match_df |= match_list
 
-        match_df &= match_list
+    def get_records(self, row_ids: list) -> pd.DataFrame:
+        """
+        행 번호(데이터베이스 사용 시 맛집 id) 순서대로 맛집 정보 데이터프레임을 반환하는 메소드
+        """
 
-        result_df = result_df.append(df[match_df])
-        result_df.drop_duplicates(['식당명'], inplace=True)
+        if self.database is not None:
+            return self.database.get_frame(row_ids)
+        with self.lock:
+            return self.service_data.get_dataframe().iloc[row_ids].reset_index(drop=True)
 
-        return result_df.iloc[:display] if len(result_df) > display else result_df
 
+    def get_data_version(self) -> int:
+        if self.database is not None:
+            return self.database.get_version()
+        return self.service_data.version
 
-    def search_api(self, keyword: str, display: int) -> pd.DataFrame:
+
+    def search_name(self, df: pd.DataFrame, result: ResultIds, keywords: list, exact: bool) -> ResultIds:
         """
-        카카오 API에 키워드와 연관성이 있는 장소를 검색한 결과를 반환하는 메소드
+        카카오 맛집 데이터프레임 상에서 키워드와 연관성이 있는 식당명을 검색해 결과 행 번호를 추가하는 메소드
         """
 
-        kakao_data = KakaoPlaceData()
+        with timer.stage('search_name'):
+            if result.is_full():
+                return result
 
-        try:
-            kakao_data.request_data(self.service_info, self.local_info, keyword)
-        except:
-            raise Exception(f'{keyword} 검색 결과가 없어요.')
+            if self.database is not None:
+                return result.extend(self.database.search_name(keywords, exact, result.display + len(result)))
+
+            target = df['식당명']
+            match_df = target.notnull() if exact else target.isnull()
+
+            if exact:
+                for keyword in keywords:
+                        match_df &= (target == keyword)
+            else:
+                for keyword in keywords:
+                        match_df |= target.str.contains(keyword, regex=False)
+
+            return result.extend(np.flatnonzero(match_df.values))
+
+
+    def search_by_row(self, column: str, df: pd.DataFrame, result: ResultIds, keywords: list, exact: bool) -> ResultIds:
+        """
+        카카오 맛집 데이터프레임 상에서 키워드와 연관성이 있는 목록 내 데이터를 검색해 결과 행 번호를 추가하는 메소드
+        """
+
+        with timer.stage(f'search_by_row:{column}'):
+            if column not in {'메뉴','리뷰'}:
+                raise Exception('검색 대상이 유효하지 않습니다.')
+
+            if result.is_full():
+                return result
+
+            if self.database is not None:
+                return result.extend(self.database.search(column, keywords, exact, result.display + len(result)))
+
+            # 전체 행을 순회하지 않고 KakaoPlaceData의 역색인에서 집합 연산으로 일치하는 행을 탐색
+            return result.extend(self.service_data.search_rows(column, keywords, exact))
+
+
+    def has_match(self, keywords: list, exact: bool) -> bool:
+        """
+        식당명, 메뉴, 리뷰 중 하나라도 키워드와 연관성이 있는 맛집이 있는지 여부를 반환하는 메소드
+        """
+
+        with self.lock:
+            df = self.service_data.get_dataframe() if self.database is None else None
+            verify = self.search_name(df, ResultIds(1), keywords, exact)
+            verify = self.search_by_row('메뉴', df, verify, keywords, exact)
+            verify = self.search_by_row('리뷰', df, verify, keywords, exact)
+
+        return len(verify) > 0
+
+
+    def search_api(self, keyword: str, display: int) -> list:
+        """
+        카카오 API에 키워드와 연관성이 있는 장소를 검색해 서비스 데이터에 추가하고 해당 행 번호를 반환하는 메소드
+        """
+
+        kakao_data = self.request_places(self.service_info, self.local_info, keyword)
+        return self.add_places(kakao_data.get_data(), kakao_data.get_dataframe())[:display]
+
+
+    @staticmethod
+    def request_places(service_info: dict, local_info: dict, keyword: str) -> KakaoPlaceData:
+        """
+        카카오 API에 키워드를 검색해 서비스 지역 내 음식점의 상세 정보를 수집한 데이터 객체를 반환하는 메소드
+        """
+
+        with timer.stage('search_api', keyword=keyword):
+            kakao_data = KakaoPlaceData(dict(), pd.DataFrame())
+
+            try:
+                kakao_data.request_data(service_info, local_info, keyword)
+            except:
+                raise Exception(f'{keyword} 검색 결과가 없어요.')
+
+        return kakao_data
+
+
+    def add_places(self, data: dict, result_df: pd.DataFrame) -> list:
+        """
+        새로 수집한 맛집을 서비스 데이터에 추가하고 해당 행 번호(데이터베이스 사용 시 맛집 id)를 반환하는 메소드
+        """
+
+        # 데이터베이스는 전체 파일을 다시 쓰지 않고 새로운 맛집만 하나의 트랜잭션으로 추가
+        if self.database is not None:
+            self.database.upsert_places(result_df)
+            return self.database.get_ids(result_df['식당명'].tolist())
+
+        # 여러 세션이 같은 관리자 객체를 공유하므로 서비스 데이터 변경은 한 번에 하나씩 진행
+        with self.lock:
+            self.service_data.update_data(data)
+            self.service_data.update_dataframe(result_df) # 기존 색인에 새로운 맛집만 추가
+            self.update_service_data(self.data_type)
 
-        result_df = kakao_data.get_dataframe()
-        self.service_data.update_data(kakao_data.get_data())
-        self.update_service_data(json)
+            service_names = self.service_data.get_dataframe()['식당명']
+            row_ids = np.flatnonzero(service_names.isin(result_df['식당명']).values)
+
+        return row_ids.tolist()
+
+
+class RegionAdmin(Admin):
+
+    def __init__(self, name: str, address: str, service_keys: dict, regions=dict(), workers=4,
+                 stage_log_path='log/stage_timing.jsonl'):
+        super().__init__(name, address)
+        timer.set_log_path(stage_log_path) # 지역별 데이터 불러오기와 검색 단계의 소요 시간을 한 줄씩 기록
+        self.service_keys = service_keys
+        self.service_info = {'urls': dict(SERVICE_URLS), 'keys': service_keys}
+        self.regions = dict()
+        self.shards = dict()
+        self.shard_locks = dict()
+        self.use_api = True # 모든 지역에 검색 결과가 없을 때 카카오 API로 새로운 맛집을 요청할지 여부
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+        for region, region_info in regions.items():
+            self.add_region(region, region_info['local_info'], region_info['data_path'])
+
+
+    def add_region(self, region: str, local_info: dict, data_path: str):
+        """
+        서비스 지역과 해당 지역의 서비스 데이터 파일을 등록하는 관리자 메소드
+        데이터는 해당 지역이 처음 검색될 때 불러오므로 지역을 추가해도 다른 지역의 검색에는 영향이 없음
+        """
+
+        with self.lock:
+            self.regions[region] = {'local_info': local_info, 'data_path': data_path}
+            self.shard_locks.setdefault(region, threading.Lock())
+            self.shards.pop(region, None)
+
+
+    def get_regions(self, regions=None) -> list:
+        """
+        검색할 지역 목록을 반환하는 메소드 (지정하지 않으면 등록된 모든 지역)
+        """
+
+        if not regions:
+            return list(self.regions.keys())
+
+        regions = [regions] if isinstance(regions, str) else list(dict.fromkeys(regions))
+        for region in regions:
+            if region not in self.regions:
+                raise Exception(f'{region} 지역은 현재 서비스하지 않습니다.')
+
+        return regions
+
+
+    def get_shard(self, region: str) -> KakaoAdmin:
+        """
+        지역별 관리자 객체를 반환하는 메소드
+        처음 요청되거나 서비스 데이터 파일이 바뀐 경우에만 해당 지역의 데이터와 색인을 불러오며,
+        불러오는 동안에는 같은 지역의 요청만 기다림
+        """
+
+        shard = self.shards.get(region)
+        if shard is not None and not shard.is_outdated():
+            return shard
+
+        with self.shard_locks[region]:
+            shard = self.shards.get(region)
+            if shard is None or shard.is_outdated():
+                region_info = self.regions[region]
+                with timer.stage('load_shard', region=region):
+                    shard = KakaoAdmin(self.name, self.address, self.service_keys, region_info['local_info'])
+                    shard.use_api = False # 지역마다 요청하지 않고 RegionAdmin.search_api()에서 한 번만 요청
+                    shard.set_service_data(data_path=region_info['data_path'])
+                self.shards[region] = shard
+
+        return shard
+
+
+    def advanced_search(self, keywords: list, target='일반 검색', display=None, exact=False,
+                        origin=None, radius=None, regions=None) -> pd.DataFrame:
+        """
+        여러 지역의 맛집 데이터에서 키워드와 연관성이 있는 맛집 정보를 검색해 하나의 결과로 반환하는 메소드
+        regions로 검색할 지역 이름 또는 목록을 지정하며, 지정하지 않으면 모든 지역을 검색
+        """
+
+        with timer.stage('federated_search', keywords=keywords, target=target, regions=regions):
+            place_ids = self.search_ids(keywords, target, display, exact, origin, radius, regions)
+
+        return self.get_records(place_ids)
+
+
+    def search_cursor(self, keywords: list, target='일반 검색', exact=False, batch_size=10,
+                      regions=None) -> 'SearchCursor':
+        """
+        지정한 지역들을 대상으로 페이지 단위로 맛집 정보를 생성하는 커서를 반환하는 메소드
+        """
+
+        cursor = SearchCursor(self, keywords, target, exact, batch_size, regions=self.get_regions(regions))
+        cursor.rank(1) # 검색 결과가 없으면 이 단계에서 예외 발생
+
+        return cursor
+
+
+    def search_ids(self, keywords: list, target='일반 검색', display=None, exact=False,
+                   origin=None, radius=None, regions=None) -> list:
+        """
+        지역별 검색을 동시에 실행하고 결과를 합쳐 (지역, 행 번호) 목록을 최대 display개까지 순서대로 반환하는 메소드
+        기준 위치가 있으면 거리순으로, 없으면 지역별 순위가 같은 맛집끼리 인기도 순으로 합치며,
+        일부 지역에서 예외가 발생해도 다른 지역의 결과가 있으면 로그만 기록하며,
+        모든 지역에 키워드와 연관성이 있는 맛집이 없으면 카카오 API에 한 번 요청해 해당 지역에 추가
+        """
+
+        regions = self.get_regions(regions)
+        futures = {region: self.executor.submit(self.search_region, region, keywords, target, display,
+                                                exact, origin, radius) for region in regions}
+        ranked, errors = list(), list()
+
+        for region, future in futures.items():
+            try:
+                ranked += future.result()
+            except Exception as e:
+                errors.append(e)
+                print(f'[{datetime.now()}] {region} 지역 검색 실패 ({type(e)}, {e})') # 로그 기록
+
+        if not ranked and self.use_api and not self.has_match(keywords, exact, regions):
+            place_ids = self.search_api(' '.join(keywords), display, regions)
+            if place_ids:
+                return place_ids
+
+        if not ranked and errors:
+            raise errors[0]
+
+        ranked.sort(key=lambda item: item[0])
+        place_ids = [place_id for _, place_id in ranked]
+
+        return place_ids[:display] if display else place_ids
+
+
+    def has_match(self, keywords: list, exact: bool, regions: list) -> bool:
+        """
+        불러온 지역 중 하나라도 키워드와 연관성이 있는 맛집이 있는지 여부를 반환하는 메소드
+        """
+
+        shards = [self.shards.get(region) for region in regions]
+        return any(shard.has_match(keywords, exact) for shard in shards if shard is not None)
+
+
+    def search_api(self, keyword: str, display: int, regions: list) -> list:
+        """
+        카카오 API에 지역 제한 없이 한 번만 키워드를 검색하고, 새로운 맛집을 주소가 일치하는 지역에 추가해
+        (지역, 행 번호) 목록을 반환하는 메소드 (검색 대상 지역에 속하지 않는 맛집은 제외)
+        """
+
+        local_info = {'si': '', 'gu': '', 'dong': '', 'address': ['']}
+        places = dict(KakaoAdmin.request_places(self.service_info, local_info, keyword).get_data()['places'])
+        place_ids = list()
+
+        for region in regions:
+            addresses = self.regions[region]['local_info']['address']
+            region_places = {name: place for name, place in places.items()
+                             if any(address in place.get('address_name', '') for address in addresses)}
+
+            if not region_places:
+                continue
+
+            for name in region_places:
+                places.pop(name)
+
+            shard = self.get_shard(region)
+            result_df = shard.service_data.dict_to_df(region_places, shard.local_info)
+            place_ids += [(region, row_id) for row_id in shard.add_places({'places': region_places}, result_df)]
+
+        return place_ids[:display] if display else place_ids
+
+
+    def search_region(self, region: str, keywords: list, target: str, display: int, exact: bool,
+                      origin=None, radius=None) -> list:
+        """
+        한 지역의 검색 결과를 (정렬 기준, (지역, 행 번호)) 목록으로 반환하는 메소드
+        """
+
+        shard = self.get_shard(region)
+
+        # 행 번호로 인기도를 읽는 동안 해당 지역에 맛집이 추가되지 않도록 지역별 관리자 객체의 lock을 유지
+        with shard.lock, timer.stage('search_region', region=region):
+            if origin is None:
+                row_ids = shard.search_ids(keywords, target, display, exact)
+                df = shard.service_data.get_dataframe()
+                popularity = shard.service_data.get_popularity(df.iloc[row_ids]).values
+                keys = [(rank, -score) for rank, score in enumerate(popularity)]
+            else:
+                row_ids = shard.search_nearby(keywords, target, display, exact, origin, radius)
+                keys = shard.get_distances(origin, row_ids).tolist()
+
+        return [(key, (region, row_id)) for key, row_id in zip(keys, row_ids)]
+
+
+    def get_records(self, place_ids: list) -> pd.DataFrame:
+        """
+        (지역, 행 번호) 순서대로 지역 이름을 포함한 맛집 정보 데이터프레임을 반환하는 메소드
+        """
+
+        region_ids = dict()
+        for i, (region, row_id) in enumerate(place_ids):
+            region_ids.setdefault(region, list()).append((i, row_id))
+
+        frames = list()
+        for region, items in region_ids.items():
+            df = self.get_shard(region).get_records([row_id for _, row_id in items])
+            df.index = [i for i, _ in items]
+            df.insert(0, '지역', region)
+            frames.append(df)
+
+        if not frames:
+            return pd.DataFrame()
+
+        return pd.concat(frames).sort_index().reset_index(drop=True)
+
+
+    def get_data_version(self, regions=None) -> tuple:
+        """
+        검색 대상 지역들의 데이터 버전을 반환하는 메소드 (다른 지역의 변경은 반영하지 않음)
+        데이터 파일이 바뀌어 지역별 관리자 객체를 다시 생성한 경우에도 버전이 달라지도록 객체 id를 포함
+        """
+
+        shards = [(region, self.get_shard(region)) for region in sorted(self.get_regions(regions))]
+        return tuple((region, id(shard), shard.get_data_version()) for region, shard in shards)
+
+
+    def get_cache_stats(self) -> dict:
+        return {region: shard.query_cache.get_stats() for region, shard in self.shards.items()}
+
+
+class SearchCursor:
+
+    def __init__(self, admin: KakaoAdmin, keywords: list, target: str, exact: bool, batch_size=10, **options):
+        self.admin = admin
+        self.keywords = keywords
+        self.target = target
+        self.exact = exact
+        self.batch_size = batch_size
+        self.options = options # RegionAdmin의 검색 지역 등 관리자 객체별 추가 검색 조건
+        self.version = admin.get_data_version(**options)
+        self.row_ids = list()
+        self.exhausted = False
+        self.records = dict()
+
+
+    def sync(self):
+        """
+        커서 생성 이후 서비스 데이터가 바뀌었다면 행 번호가 달라졌으므로 순위를 다시 계산하도록 초기화하는 메소드
+        """
+
+        version = self.admin.get_data_version(**self.options)
+
+        if self.version != version:
+            self.version = version
+            self.row_ids = list()
+            self.exhausted = False
+            self.records = dict()
+
+
+    def rank(self, size: int):
+        """
+        최소 size개의 행 번호가 준비되도록 검색 범위를 두 배씩 늘려가며 순위를 계산하는 메소드
+        이미 반환한 순위는 유지하고 뒤에 새로운 행 번호만 추가
+        """
+
+        self.sync()
+
+        if size <= len(self.row_ids) or self.exhausted:
+            return
+
+        display = max(size, len(self.row_ids)*2, self.batch_size)
+        row_ids = self.admin.search_ids(self.keywords, self.target, display, self.exact, **self.options)
+
+        self.row_ids = ResultIds(display).extend(self.row_ids).extend(row_ids).row_ids
+        self.exhausted = len(self.row_ids) < display
+
+
+    def has_page(self, page: int) -> bool:
+        self.rank(page+1)
+        return page < len(self.row_ids)
+
+
+    def get_record(self, page: int) -> dict:
+        """
+        해당 페이지의 맛집 정보를 반환하는 메소드
+        다음 페이지의 맛집 정보를 미리 생성해두고, 나머지 페이지의 정보는 메모리에서 제거
+        """
+
+        while True:
+            self.rank(page+2)
+            version = self.version
+
+            prefetch = [i for i in [page, page+1] if i not in self.records and i < len(self.row_ids)]
+            df = self.admin.get_records([self.row_ids[i] for i in prefetch])
+
+            # 순위를 계산한 뒤 맛집 정보를 가져오기 전에 데이터가 바뀌었다면 순위부터 다시 계산
+            if self.admin.get_data_version(**self.options) == version:
+                break
+
+        for i, record in zip(prefetch, df.to_dict('records')):
+            self.records[i] = record
+
+        self.records = {key: value for key, value in self.records.items() if key in {page, page+1}}
+
+        return self.records[page]
+
+
+    def get_page_frame(self) -> pd.DataFrame:
+        """
+        현재 메모리에 있는 페이지의 맛집 정보를 데이터프레임으로 반환하는 메소드 (디버깅 용도)
+        """
 
-        return result_df.iloc[:display] if len(result_df) > display else result_df
+        return pd.DataFrame([self.records[page] for page in sorted(self.records)])
@@ -1,13 +1,21 @@
-import json
 import pandas as pd
-import re
 import streamlit as st
 import streamlit.components.v1 as components
-from admin import KakaoAdmin
+from admin import RegionAdmin
+from profiler import timer
 from api import get_service_keys
 
 
-def load_main_page(session: st.AutoSessionState, admin: KakaoAdmin):
+# 지역마다 별도의 서비스 데이터 파일과 색인을 사용하며, 지역을 추가해도 다른 지역의 검색 속도에는 영향 없음
+SERVICE_REGIONS = {
+    '광명': {'local_info': {'si': '경기도', 'gu': '광명시', 'dong': '', 'address': ['경기 광명시 광명동']},
+             'data_path': 'data/gm_service_data.json'},
+    '삼성동': {'local_info': {'si': '서울특별시', 'gu': '강남구', 'dong': '삼성동', 'address': ['서울 강남구 삼성동']},
+               'data_path': 'data/service_data.json'}
+}
+
+
+def load_main_page(session: st.AutoSessionState, admin: RegionAdmin):
     """
     맛집 검색 페이지를 불러오는 함수
     """
@@ -37,9 +45,12 @@ def load_main_page(session: st.AutoSessionState, admin: KakaoAdmin):
     # 서비스 데이터가 커지면 보고 싶은 맛집 수를 제어할 필요가 있음
     # st.slider('보고 싶은 맛집 수를 설정해주세요.', 1, 30, 3, key='display')
 
-    exact, margin, search = st.columns([2,7,1])
+    exact, regions, search = st.columns([2,7,1])
     with exact:
         st.checkbox('키워드와 일치', key='exact')
+    with regions:
+        # 지역을 선택하지 않으면 모든 지역의 검색 결과를 합쳐서 표시
+        st.multiselect(label='', options=admin.get_regions(), key='regions')
     with search:
         search_bt = st.button('검색')
 
@@ -50,19 +61,21 @@ def load_main_page(session: st.AutoSessionState, admin: KakaoAdmin):
     # 서비스 데이터가 커지면 키워드를 반드시 입력하도록 검색 조건 변경
     if search_bt:
         try:
-            session.data = admin.advanced_search(keywords=session.keywords.split(),
+            # 전체 결과 대신 순위가 매겨진 행 번호와 검색 조건만 가진 커서를 저장
+            session.cursor = admin.search_cursor(keywords=session.keywords.split(),
                                                  target=session.target,
-                                                 exact=session.exact)
+                                                 exact=session.exact,
+                                                 regions=session.regions)
             session.search = True
             session.page = 0
         except Exception as e:
             print(e) # 에러 메시지 로그 기록
             session.search = False
             st.markdown(f"<center><h3>{e}</h3></center>",unsafe_allow_html=True)
-            load_debug_div(session, unfold=True)
+            load_debug_div(session, admin, unfold=True)
 
 
-def load_result_page(session: st.AutoSessionState, admin: KakaoAdmin):
+def load_result_page(session: st.AutoSessionState, admin: RegionAdmin):
     """
     맛집 검색 결과 페이지를 불러오는 함수
     """
@@ -74,65 +87,68 @@ def load_result_page(session: st.AutoSessionState, admin: KakaoAdmin):
     with prev:
         prev_bt = st.button('이전', disabled=(not session.page))
     with next:
-        next_bt = st.button('다음', disabled=(session.page > len(session.data)-2))
+        next_bt = st.button('다음', disabled=(not session.cursor.has_page(session.page+1)))
 
     if prev_bt:
         session.page -= 1
     if next_bt:
         session.page += 1
 
-    load_summary_div(session)
-    load_list_div(session, '메뉴')
-    load_kakao_map(session, admin)
-    load_list_div(session, '리뷰')
-    load_debug_div(session)
+    # 현재 페이지의 맛집 정보만 생성하고 다음 페이지는 미리 준비
+    record = session.cursor.get_record(session.page)
+
+    load_summary_div(record)
+    load_list_div(record, '메뉴')
+    load_kakao_map(record, admin)
+    load_list_div(record, '리뷰')
+    load_debug_div(session, admin)
 
 
-def load_summary_div(session: st.AutoSessionState):
+def load_summary_div(record: dict):
     """
     맛집 검색 결과 중 요약 정보에 해당하는 부분을 불러오는 함수
     """
 
-    if session.data['이미지 주소'][session.page]:
+    if record['이미지 주소']:
         components.html(f"""
-                            <a href="{session.data['웹페이지 주소'][session.page]}" target="_blank">
-                            <img src={session.data['이미지 주소'][session.page]}
+                            <a href="{record['웹페이지 주소']}" target="_blank">
+                            <img src={record['이미지 주소']}
                                 style="margin-top:-20%;margin-left:-8%">
                             </a>""",width=None,height=280)
 
-    st.markdown(f"<center><h1>{session.data['식당명'][session.page]}</h1></center>",
+    st.markdown(f"<center><h1>{record['식당명']}</h1></center>",
                 unsafe_allow_html=True)
 
     lmargin, category, raiting, review_num, rmargin = st.columns([2,2,2,2,2])
 
     with category:
         st.markdown("<center><h5>{}</h5></center>".format(
-                        session.data['분류명'][session.page].split(' > ')[-1]),
+                        record['분류명'].split(' > ')[-1]),
                     unsafe_allow_html=True)
     with raiting:
         st.markdown("<center><h5>별점 {}</h5></center>".format(
-                        session.data['별점'][session['page']]),
+                        record['별점']),
                     unsafe_allow_html=True)
     with review_num:
         st.markdown("<center><h5>리뷰 {}</h5></center>".format(
-                        session.data['리뷰 수'][session['page']]+
-                        session.data['블로그 리뷰 수'][session['page']]),
+                        record['리뷰 수']+
+                        record['블로그 리뷰 수']),
                     unsafe_allow_html=True)
 
     lmargin, sentiment_gauge, rmargin = st.columns([2,6,2])
     with sentiment_gauge:
-        total_review = session.data['리뷰 수'][session['page']]
+        total_review = record['리뷰 수']
         total_review = total_review if total_review else 1
-        negative_review = session.data['부정 리뷰 수'][session['page']]
+        negative_review = record['부정 리뷰 수']
         st.progress(int((total_review-negative_review)/(total_review)*100))
 
 
-def load_list_div(session: st.AutoSessionState, name: str):
+def load_list_div(record: dict, name: str):
     """
     맛집 검색 결과 중 목록에 해당하는 부분을 불러오는 함수
     """
 
-    if session.data[name][session.page]:
+    if record[name]:
         st.markdown('---')
         st.markdown(f"<center><h3>{name}</h3></center>",unsafe_allow_html=True)
         st.markdown('&nbsp;')
@@ -140,11 +156,11 @@ def load_list_div(session: st.AutoSessionState, name: str):
         left_div, right_div = st.columns(2)
 
         # 데이터프레임을 직접 가져올 때 리스트가 문자열로 합쳐지는 문제에 대한 대비책
-        # item_list = session.data[name][session.page].replace('"',"'")
+        # item_list = record[name].replace('"',"'")
         # item_list = re.search("\['(.*)'\]",item_list)
         # item_list = item_list[1].split("', '")
 
-        for i, item in enumerate(session.data[name][session.page][:20]):
+        for i, item in enumerate(record[name][:20]):
             if i%2 == 0:
                 with left_div:                    
                     st.markdown(f"<center><p>{item}</p></center>",unsafe_allow_html=True)
@@ -153,7 +169,7 @@ def load_list_div(session: st.AutoSessionState, name: str):
                     st.markdown(f"<center><p>{item}</p></center>",unsafe_allow_html=True)
 
 
-def load_kakao_map(session: st.AutoSessionState, admin: KakaoAdmin):
+def load_kakao_map(record: dict, admin: RegionAdmin):
     """
     맛집 검색 결과 중 카카오 지도에 해당하는 부분을 불러오는 함수
     """
@@ -162,8 +178,8 @@ def load_kakao_map(session: st.AutoSessionState, admin: KakaoAdmin):
 
     service_url = admin.service_info['urls']['kakao_map']
     service_key = admin.service_info['keys']['kakao_js']
-    kakao_x = session.data['x'][session.page]
-    kakao_y = session.data['y'][session.page]
+    kakao_x = record['x']
+    kakao_y = record['y']
 
     kakao_map =  """
                  <div id="map" style="width:100%;height:480px;"></div>
@@ -188,16 +204,16 @@ def load_kakao_map(session: st.AutoSessionState, admin: KakaoAdmin):
     components.html(kakao_map, width=None, height=400, scrolling=False)
 
     st.markdown("<center><h5>📍&nbsp;&nbsp;{}</h5></center>".format(
-                    session.data['도로명 주소'][session['page']]),
+                    record['도로명 주소']),
                 unsafe_allow_html=True)
 
-    if session.data['전화번호'][session['page']]:
+    if record['전화번호']:
         st.markdown("<center><h5>📞&nbsp;&nbsp;{}</h5></center>".format(
-                        session.data['전화번호'][session['page']]),
+                        record['전화번호']),
                     unsafe_allow_html=True)
 
 
-def load_debug_div(session: st.AutoSessionState, unfold=False):
+def load_debug_div(session: st.AutoSessionState, admin: RegionAdmin, unfold=False):
     """
     맛집 검색 결과에 대한 디버깅 정보를 불러오는 함수
     """
@@ -209,41 +225,39 @@ def load_debug_div(session: st.AutoSessionState, unfold=False):
         debug_bt = st.button('DEBUG')
 
     if debug_bt or unfold:
-        st.markdown("<center><h3>DataFrame</h3></center>",unsafe_allow_html=True)
-        st.dataframe(session.data)
+        if 'cursor' in session:
+            st.markdown("<center><h3>DataFrame</h3></center>",unsafe_allow_html=True)
+            st.dataframe(session.cursor.get_page_frame())
+        st.markdown("<center><h3>Stage Timing</h3></center>",unsafe_allow_html=True)
+        st.dataframe(pd.DataFrame(timer.get_summary()))
+        st.markdown("<center><h3>Query Cache</h3></center>",unsafe_allow_html=True)
+        st.json(admin.get_cache_stats())
         st.markdown("<center><h3>Session Info</h3></center>",unsafe_allow_html=True)
         st.session_state
 
 
-def main():
+@st.experimental_singleton
+def load_admin() -> RegionAdmin:
     """
-    서비스 데이터를 관리하는 관리자 객체를 생성하고 검색 서비스를 실행하는 메인 함수
+    지역별 서비스 데이터를 관리하는 관리자 객체를 생성하는 함수
+    모든 세션과 재실행이 하나의 객체를 공유하므로 위젯을 조작할 때마다 데이터를 다시 준비하지 않음
+    지역별 데이터는 처음 검색될 때 불러오며, 서비스 데이터 파일이 바뀐 지역만 다시 불러옴
     """
 
     # API 키는 개인정보 문제로 숨김 처리
     service_keys = get_service_keys()
 
-    # 프로젝트 시간 제약에 의해 서비스 지역을 서울시 강남구 삼성동으로 한정
-    # local_info = {'si': '서울특별시', 'gu': '강남구', 'dong': '삼성동', 'address': ['서울 강남구 삼성동']}
+    # 스크래핑이 필요한 경우 지역별로 KakaoAdmin.set_service_data()를 사용해 서비스 데이터 파일을 먼저 생성
+    # 데이터프레임을 직접 가져올 경우 리스트가 하나의 문자열로 합쳐지는 문제 발생
+    return RegionAdmin('minyeamer','abcd@likelion.org',service_keys,SERVICE_REGIONS)
 
-    # 개인적인 목적으로 광명동 맛집을 탐색하기 위해 설정, 향후 서비스 확대 시 서울 외 지역 간 호환을 위해 파라미터 재조정 필요
-    gm_local_info = {'si': '경기도', 'gu': '광명시', 'dong': '',
-                     'address': ['경기 광명시 광명동']}
 
-    admin = KakaoAdmin('minyeamer','abcd@likelion.org',service_keys,gm_local_info)
+def main():
+    """
+    공유 관리자 객체를 가져와 검색 서비스를 실행하는 메인 함수
+    """
 
-    try:
-        # 스크래핑이 필요한 경우 (디버그 시 size 파라미터를 사용해 요청할 데이터 수 제한)
-        # admin.set_service_data()
-
-        # 스크래핑한 데이터가 있을 경우
-        with open('data/gm_service_data.json','r', encoding='UTF-8') as f:
-            service_data = json.load(f)
-        # 데이터프레임을 직접 가져올 경우 리스트가 하나의 문자열로 합쳐지는 문제 발생
-        # service_df = pd.read_csv('data/service_data.csv')
-        admin.set_service_data(service_data)
-    except Exception as e:
-        print(type(e), e) # 에러 메시지 로그 기록
+    admin = load_admin()
 
     try:
         # 웹서비스 구동
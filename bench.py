@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime
+import pandas as pd
+from admin import KakaoAdmin
+from data import KakaoPlaceData
+
+
+SEARCH_TARGETS = ['일반 검색','식당명 검색','메뉴 검색','리뷰 검색','전체 검색']
+
+LOCAL_INFO = {'si': '', 'gu': '', 'dong': '', 'address': ['']} # 지역 필터 없이 모든 장소 사용
+
+MIN_DELTA = {'seconds': 0.01, 'peak_bytes': 1<<20} # 측정 오차로 볼 수 있는 최소 변화량
+
+
+def make_service_data(source: dict, size: int, seed=0) -> dict:
+    """
+    실제 서비스 데이터의 분류, 메뉴, 리뷰를 무작위로 조합해 size개의 장소를 가진 서비스 데이터를 생성하는 함수
+    분류, 메뉴, 리뷰는 각각 다른 장소에서 가져오되 토큰화 결과는 원본과 함께 옮기고, 좌표는 원본 주변으로 이동
+    """
+
+    rng = random.Random(seed)
+    templates = list(source['places'].items())
+    places = dict()
+
+    for i in range(size):
+        name, base = rng.choice(templates)
+        _, category = rng.choice(templates)
+        _, menu = rng.choice(templates)
+        _, review = rng.choice(templates)
+
+        place = dict(base)
+        place['id'] = str(i)
+        place['category_name'], place['category_token'] = category['category_name'], category['category_token']
+        place['menu'], place['menu_token'] = list(menu['menu']), menu['menu_token']
+        place['review'], place['review_token'] = list(review['review']), review['review_token']
+        place['review_sentiment'] = list(review['review_sentiment'])
+        place['positive'], place['negative'] = review['positive'], review['negative']
+        place['review_num'] = review['review_num']
+
+        for axis in ['x','y']:
+            if place.get(axis):
+                place[axis] = str(float(place[axis]) + rng.uniform(-0.01, 0.01))
+
+        places[f'{name} {i}'] = place
+
+    return {'places': places, 'errors': dict()}
+
+
+def measure(func, *args, **kwargs) -> tuple:
+    """
+    함수의 실행 결과와 함께 실행 시간(초) 및 파이썬 할당 메모리 최댓값(바이트)을 반환하는 함수
+    """
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        result = func(*args, **kwargs)
+        error = None
+    except Exception as e:
+        result, error = None, f'{type(e).__name__}: {e}'
+
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, {'seconds': seconds, 'peak_bytes': peak, 'error': error}
+
+
+def get_keywords(service_data: dict, seed=0) -> dict:
+    """
+    생성된 데이터에 실제로 존재하는 식당명과 메뉴 단어로 검색 대상별 키워드를 반환하는 함수
+    """
+
+    rng = random.Random(seed)
+    name, place = rng.choice([(name, place) for name, place in service_data['places'].items()
+                              if place['menu'] and place['review']])
+    menu_word = rng.choice(rng.choice(place['menu']).split())
+    review_word = rng.choice(rng.choice(place['review']).split())
+
+    keywords = {target: [menu_word] for target in SEARCH_TARGETS}
+    keywords['식당명 검색'] = [name]
+    keywords['리뷰 검색'] = [review_word]
+
+    return keywords
+
+
+def run_size(source: dict, size: int, display=10, seed=0) -> list:
+    """
+    장소 수가 size개인 데이터에 대해 단계별 실행 시간과 메모리 사용량을 측정하는 함수
+    """
+
+    results = list()
+
+    def record(stage: str, stats: dict, **extra):
+        results.append({'size': size, 'stage': stage, **extra, **stats})
+        print(f'[{datetime.now()}] {size} {stage} {extra if extra else ""} {stats}') # 로그 기록
+
+    service_data = make_service_data(source, size, seed)
+    source_bytes = json.dumps(service_data, ensure_ascii=False).encode('UTF-8')
+
+    service_data, stats = measure(json.loads, source_bytes.decode('UTF-8'))
+    record('load', stats, source_bytes=len(source_bytes))
+
+    place_data = KakaoPlaceData(service_data, pd.DataFrame())
+
+    df, stats = measure(place_data.dict_to_df, service_data['places'], LOCAL_INFO)
+    record('dict_to_df', stats)
+
+    _, stats = measure(place_data.update_dataframe, df)
+    record('update_dataframe', stats)
+
+    _, stats = measure(place_data.make_similar_index)
+    record('make_similar_index', stats)
+
+    _, stats = measure(place_data.make_search_index)
+    record('make_search_index', stats)
+
+    admin = KakaoAdmin('benchmark', '', dict(), LOCAL_INFO)
+    admin.service_data = place_data
+
+    for target, keywords in get_keywords(service_data, seed).items():
+        for exact in [False, True]:
+            _, stats = measure(admin.advanced_search, keywords, target, display, exact)
+            record('advanced_search', stats, target=target, exact=exact)
+
+    return results
+
+
+def compare(results: list, baseline_path: str, tolerance=0.2) -> list:
+    """
+    기준 결과 파일과 비교해 실행 시간 또는 메모리 사용량이 tolerance 비율 이상 증가한 단계 목록을 반환하는 함수
+    증가량이 MIN_DELTA보다 작은 경우는 측정 오차로 보고 제외
+    """
+
+    with open(baseline_path,'r', encoding='UTF-8') as f:
+        baseline = json.load(f)['results']
+
+    get_key = lambda result: (result['size'], result['stage'], result.get('target'), result.get('exact'))
+    baseline = {get_key(result): result for result in baseline}
+    regressions = list()
+
+    for result in results:
+        previous = baseline.get(get_key(result))
+        if previous is None:
+            continue
+        for metric in ['seconds','peak_bytes']:
+            delta = result[metric] - previous[metric]
+            if delta > MIN_DELTA[metric] and delta > previous[metric] * tolerance:
+                regressions.append({**result, 'metric': metric, 'baseline': previous[metric]})
+
+    return regressions
+
+
+def main():
+    """
+    실제 데이터를 기반으로 생성한 1천~100만 개 장소 데이터에 대해 벤치마크를 실행하고 결과를 json 파일로 저장하는 함수
+    ex) python bench.py --sizes 1000 10000 --output log/benchmark.json --baseline log/benchmark_prev.json
+    """
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--source', default='data/gm_service_data.json')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--display', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='log/benchmark.json')
+    parser.add_argument('--baseline', default=str())
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    with open(args.source,'r', encoding='UTF-8') as f:
+        source = json.load(f)
+
+    results = list()
+    for size in args.sizes:
+        results += run_size(source, size, args.display, args.seed)
+
+    report = {'time': str(datetime.now()), 'python': platform.python_version(),
+              'pandas': pd.__version__, 'sizes': args.sizes, 'results': results}
+
+    if args.baseline:
+        report['regressions'] = compare(results, args.baseline, args.tolerance)
+        for regression in report['regressions']:
+            print(f'[{datetime.now()}] 성능 저하 {regression}') # 로그 기록
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output,'w', encoding='UTF-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from profiler import timer
+
+
+class APIClient:
+
+    def __init__(self, workers=4, retries=3, backoff=0.5, timeout=10, pool_size=None):
+        self.workers = max(workers, 1)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        # 여러 스레드가 하나의 클라이언트를 공유하면 동시에 보낼 수 있는 전체 요청 수만큼 연결을 유지
+        self.session = requests.Session()
+        pool_size = max(pool_size if pool_size else self.workers, 1)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        연결을 재사용하는 세션으로 요청을 보내고, 429 또는 5xx 응답과 연결 오류, 시간 초과는 지수적으로 간격을 늘리며
+        재시도하는 메소드 (Retry-After 헤더가 있으면 해당 시간만큼 대기)
+        """
+
+        for attempt in range(self.retries+1):
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2**attempt)
+                continue
+
+            if response.status_code != 429 and response.status_code < 500:
+                break
+
+            if attempt < self.retries:
+                retry_after = response.headers.get('Retry-After', str())
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2**attempt
+                time.sleep(delay)
+
+        response.raise_for_status()
+        return response
+
+
+    def close(self):
+        self.session.close()
+
+
+class KakaoSearchClient(APIClient):
+
+    def __init__(self, service_info: dict, workers=4, retries=3, backoff=0.5, timeout=10, max_pages=1):
+        super().__init__(workers, retries, backoff, timeout)
+        self.max_pages = max(max_pages, 1)
+        self.service_url = service_info['urls']['kakao_search']
+        self.headers = {"Authorization": 'KakaoAK '+service_info['keys']['kakao_rest']}
+        self.cache = dict()
+        self.lock = threading.Lock()
+
+
+    def search(self, query: str) -> list:
+        """
+        카카오 키워드 검색 결과의 장소 목록을 반환하는 메소드
+        마지막 페이지(meta.is_end)에 도달하거나 max_pages개의 페이지를 받을 때까지 다음 페이지를 요청하고,
+        같은 검색어는 한 번만 요청하며, 호출한 쪽에서 결과를 수정해도 캐시에 영향이 없도록 복사본을 반환
+        """
+
+        with self.lock:
+            if query in self.cache:
+                return copy.deepcopy(self.cache[query])
+
+        documents = list()
+
+        with timer.stage('kakao_search', query=query):
+            for page in range(1, self.max_pages+1):
+                response = self.request('GET', self.service_url, headers=self.headers,
+                                        params={'query': query, 'page': page})
+                result = response.json()
+                documents += result['documents']
+
+                if result.get('meta', dict()).get('is_end', True):
+                    break
+
+        with self.lock:
+            self.cache[query] = documents
+
+        return copy.deepcopy(documents)
+
+
+    def search_all(self, queries: list) -> dict:
+        """
+        중복을 제거한 검색어 목록을 최대 workers개씩 동시에 요청하고 검색어별 장소 목록을 순서대로 반환하는 메소드
+        """
+
+        queries = list(dict.fromkeys(queries))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self.search, queries))
+
+        return dict(zip(queries, results))
+
+
+class KakaoPlaceClient(APIClient):
+
+    def __init__(self, service_info: dict, workers=4, retries=3, backoff=0.5, timeout=10):
+        super().__init__(workers, retries, backoff, timeout)
+        self.base_url = service_info['urls'].get('kakao_place', 'https://place.map.kakao.com').rstrip('/')
+        self.headers = {'Referer': self.base_url+'/', 'User-Agent': 'Mozilla/5.0'}
+
+
+    def get_place_id(self, place_url: str) -> str:
+        return place_url.rstrip('/').split('/')[-1]
+
+
+    def request_json(self, path: str, rate_limiter=None) -> dict:
+        """
+        카카오 맛집 페이지가 사용하는 json 데이터를 요청하는 메소드
+        차단 응답(403, 429)을 받으면 요청 속도를 낮추도록 알리고 예외 발생
+        """
+
+        if rate_limiter is not None:
+            with timer.stage('rate_limiter_wait'):
+                rate_limiter.wait()
+
+        try:
+            response = self.request('GET', self.base_url+path, headers=self.headers)
+        except requests.HTTPError as e:
+            if rate_limiter is not None and e.response is not None and e.response.status_code in {403, 429}:
+                rate_limiter.report_block()
+            raise
+
+        if rate_limiter is not None:
+            rate_limiter.report_success()
+
+        return response.json()
+
+
+    def request_main(self, place_url: str, rate_limiter=None) -> dict:
+        return self.request_json(f'/main/v/{self.get_place_id(place_url)}', rate_limiter)
+
+
+    def request_details(self, place_url: str, rate_limiter=None) -> dict:
+        """
+        브라우저 없이 카카오 맛집 페이지의 별점, 리뷰 수, 블로그 리뷰 수, 메뉴, 리뷰를 수집하는 메소드
+        KakaoPlaceData.request_details()와 같은 형태의 딕셔너리를 반환
+        """
+
+        main = self.request_main(place_url, rate_limiter)
+
+        details = self.get_summary(main)
+        details['menu'] = self.get_menu(main)
+        details['review'] = [review for reviews in self.iter_review_pages(place_url, main, rate_limiter)
+                             for review in reviews]
+
+        return details
+
+
+    def get_summary(self, main: dict) -> dict:
+        """
+        맛집 페이지 데이터에서 대표 이미지, 별점, 리뷰 수, 블로그 리뷰 수를 추출하는 메소드
+        """
+
+        basic_info = main.get('basicInfo', dict())
+        feedback = basic_info.get('feedback', dict())
+        summary = dict()
+
+        summary['bg_image'] = basic_info.get('mainphotourl', '')
+
+        score_count = feedback.get('scorecnt', 0)
+        raiting = round(feedback.get('scoresum', 0) / score_count, 1) if score_count else 0.0
+        summary['raiting'] = 0.0 if raiting > 5.0 else raiting
+
+        summary['review_num'] = int(feedback.get('comntcnt', main.get('comment', dict()).get('kamapComntcnt', 0)))
+        summary['blog_num'] = int(feedback.get('blogrvwcnt', main.get('blogReview', dict()).get('blogrvwcnt', 0)))
+
+        return summary
+
+
+    def get_menu(self, main: dict) -> list:
+        return [menu['menu'] for menu in main.get('menuInfo', dict()).get('menuList', list()) if menu.get('menu')]
+
+
+    def iter_review_pages(self, place_url: str, main: dict, rate_limiter=None):
+        """
+        맛집 페이지 데이터의 첫 리뷰 목록부터 마지막 리뷰 id를 기준으로 다음 목록을 요청하며
+        목록별 리뷰 내용을 반환하는 제너레이터 메소드
+        """
+
+        comment = main.get('comment', dict())
+        place_id = self.get_place_id(place_url)
+
+        while True:
+            comments = comment.get('list', list())
+            yield [item['contents'] for item in comments if item.get('contents')]
+
+            if not comment.get('hasNext') or not comments:
+                break
+
+            last_id = comments[-1]['commentid']
+            comment = self.request_json(f'/commentlist/v/{place_id}/{last_id}', rate_limiter).get('comment', dict())
+
+
+    def get_new_reviews(self, place_url: str, main: dict, stored_reviews: set, rate_limiter=None) -> tuple:
+        """
+        요약 정보를 위해 요청한 맛집 페이지 데이터부터 이미 저장된 리뷰가 나오기 전까지의 리뷰 목록만 수집하고
+        (메뉴 목록, 새로운 리뷰 목록, 저장된 리뷰 발견 여부)를 반환하는 메소드
+        """
+
+        new_reviews = list()
+
+        for reviews in self.iter_review_pages(place_url, main, rate_limiter):
+            for review in reviews:
+                if review in stored_reviews:
+                    return self.get_menu(main), new_reviews, True
+                new_reviews.append(review)
+
+        return self.get_menu(main), new_reviews, False
+
+
+class ClovaSentimentClient(APIClient):
+
+    def __init__(self, service_info: dict, cache_path='cache/sentiment.json',
+                 workers=4, retries=3, backoff=0.5, timeout=10, callers=1):
+        # analyze_all()을 동시에 호출하는 스크래핑 작업자(callers)마다 workers개의 요청을 보낼 수 있음
+        super().__init__(workers, retries, backoff, timeout, pool_size=max(workers, 1)*max(callers, 1))
+        self.service_url = service_info['urls']['naver_clova']
+        self.headers = {
+            'X-NCP-APIGW-API-KEY-ID': service_info['keys']['naver_clova'][0],
+            'X-NCP-APIGW-API-KEY': service_info['keys']['naver_clova'][1],
+            'Content-Type': 'application/json'
+        }
+        self.cache_path = cache_path
+        self.cache = self.load_cache(cache_path)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+    def load_cache(self, cache_path: str) -> dict:
+        """
+        리뷰 해시값별 감정 분류 결과를 저장한 캐시 파일을 불러오는 메소드
+        """
+
+        if not cache_path or not os.path.exists(cache_path):
+            return dict()
+
+        with open(cache_path,'r', encoding='UTF-8') as f:
+            return json.load(f)
+
+
+    def save_cache(self):
+        """
+        감정 분류 결과 캐시를 파일로 저장하는 메소드
+        """
+
+        if not self.cache_path:
+            return
+
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+
+        with self.lock:
+            with open(self.cache_path+'.tmp','w', encoding='UTF-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+        os.replace(self.cache_path+'.tmp', self.cache_path)
+
+
+    def get_review_hash(self, review: str) -> str:
+        return hashlib.sha1(review.encode('UTF-8')).hexdigest()
+
+
+    def update_cache(self, reviews: list, sentiments: list):
+        """
+        이미 분류된 리뷰와 감정 목록을 캐시에 추가하는 메소드 (기존 서비스 데이터 활용)
+        """
+
+        with self.lock:
+            for review, sentiment in zip(reviews, sentiments):
+                if sentiment != 'error':
+                    self.cache[self.get_review_hash(review)] = sentiment
+
+
+    def analyze(self, review: str) -> str:
+        """
+        리뷰 하나의 감정을 분류해 반환하는 메소드
+        """
+
+        try:
+            response = self.request('POST', self.service_url, headers=self.headers,
+                                    data=json.dumps({'content': review}))
+            return response.json()['document']['sentiment']
+        except Exception:
+            return 'error'
+
+
+    def analyze_all(self, reviews: list) -> list:
+        """
+        리뷰 목록의 감정을 순서대로 반환하는 메소드
+        캐시에 없는 리뷰만 중복을 제거해 최대 workers개씩 동시에 요청하며, 실패한 결과는 캐시하지 않음
+        """
+
+        review_hashes = [self.get_review_hash(review) for review in reviews]
+        new_reviews = dict()
+
+        with self.lock:
+            for review, review_hash in zip(reviews, review_hashes):
+                if review_hash in self.cache:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    new_reviews[review_hash] = review
+
+        if new_reviews:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                sentiments = list(executor.map(self.analyze, new_reviews.values()))
+        else:
+            sentiments = list()
+
+        results = dict(zip(new_reviews.keys(), sentiments))
+
+        with self.lock:
+            self.cache.update({review_hash: sentiment for review_hash, sentiment in results.items()
+                               if sentiment != 'error'})
+            return [results[review_hash] if review_hash in results else self.cache[review_hash]
+                    for review_hash in review_hashes]
+
+
+    def get_stats(self) -> dict:
+        """
+        캐시 적중 및 실패 횟수를 반환하는 메소드
+        """
+
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0}
@@ -1,16 +1,23 @@
+from datetime import datetime
 import numpy as np
 import pandas as pd
-import json
-import requests
-import time
+import os
+import pickle
 import re
-from webdriver_manager.chrome import ChromeDriverManager 
-from selenium.webdriver.chrome.service import Service
-from selenium import webdriver
-from konlpy.tag import Okt
-from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+from functools import partial
+from typing import TYPE_CHECKING
+import registry
+import tokenizer
+from index import BM25Index, InvertedIndex, ResultIds, SimilarityIndex, SpatialIndex
+from scraper import AdaptiveRateLimiter, Checkpoint, DriverPool, HTTPPool, wait_until
+from client import ClovaSentimentClient, KakaoPlaceClient, KakaoSearchClient
+from profiler import timer
+from sentiment import LocalSentimentModel
 import warnings
+
+if TYPE_CHECKING:
+    from selenium import webdriver
 warnings.filterwarnings("ignore")
 
 
@@ -30,7 +37,11 @@ class Data:
 
 
     def update_data(self, data: dict):
-        self.data.update(data)
+        for key, value in data.items():
+            if isinstance(value, dict) and isinstance(self.data.get(key), dict):
+                self.data[key].update(value)
+            else:
+                self.data[key] = value
 
 
     def update_dataframe(self, df: pd.DataFrame):
@@ -45,74 +56,190 @@ class PlaceData(Data):
 
 class KakaoPlaceData(PlaceData):
 
-    def __init__(self, data=dict(), df=pd.DataFrame()):
+    artifact_version = '6' # 색인 구조가 바뀌면 값을 올려 기존 캐시 파일을 무효화
+
+    rank_weights = {'분류명 토큰화': 0.5, '메뉴 토큰화': 1.0, '리뷰 토큰화': 0.5} # 연관도 점수에 사용할 토큰 열별 가중치
+
+    def __init__(self, data=dict(), df=pd.DataFrame(), similar_k=50):
         super().__init__(data, df)
+        self.similar_k = similar_k
+        self.version = 0 # 데이터프레임이 바뀔 때마다 증가하는 데이터 버전
         self.similr_index = self.make_similar_index()
+        self.search_index = self.make_search_index()
+        self.spatial_index = self.make_spatial_index()
+        self.rank_index = self.make_rank_index()
 
 
-    def request_data(self, service_info: dict, local_info: dict, keyword=str(), size=1):
+    def request_data(self, service_info: dict, local_info: dict, keyword=str(), size=1, workers=1, rate=1.0,
+                     token_workers=None, checkpoint_path=str(), sentiment_model=str(), refresh=False,
+                     fetcher='selenium', stage_log_path='log/stage_timing.jsonl'):
         """
         카카오 API로부터 장소 정보를 요청하고 추가적인 정보를 스크래핑하는 메인 메소드
         키워드가 없을 경우 빅데이터를 기반으로 모든 장소에 대한 정보 요청
+        카카오 API 검색은 연결을 재사용하는 클라이언트로 동시에 요청해 스크래핑 대상 목록을 먼저 구성하고,
+        workers개의 헤드리스 브라우저가 공유 큐에서 장소를 가져가 병렬로 스크래핑하며,
+        차단을 피하기 위해 전체 작업자의 페이지 요청은 초당 rate회로 제한하고 차단 페이지가 확인되면 속도를 낮춤
+        토큰화는 스크래핑이 끝난 뒤 token_workers개의 프로세스에서 일괄적으로 진행
+        checkpoint_path를 지정하면 스크래핑이 끝난 장소를 즉시 파일에 기록하고, 재시작 시 완료된 장소는 건너뛰며
+        이전에 실패한 장소는 먼저 다시 시도
+        sentiment_model로 학습된 감정 분류 모델 파일을 지정하면 CLOVA API 대신 로컬 모델로 리뷰 감정을 분류
+        fetcher가 'http'이면 브라우저 없이 맛집 페이지가 사용하는 json 데이터를 workers개의 스레드에서 직접 요청
+        refresh가 True이면 이미 보유한 장소는 요약 정보만 비교해 바뀐 장소만 다시 스크래핑하고, 새로운 리뷰만 추가
+        단계별 소요 시간은 profiler.timer에 누적되어 stage_log_path에 한 줄씩 기록되며, 종료 시 요약 결과를 기록
         향후 다른 플랫폼(네이버 등)에 대한 검색 기능 추가 시 해당 메소드의 범용성을 개선해 상위 클래스 메소드로 변환
         """
 
+        if fetcher not in {'selenium','http'}:
+            raise Exception(f'{fetcher} 수집 방식은 현재 지원하지 않습니다.')
+
+        timer.set_log_path(stage_log_path)
         place_dict = {'places': dict(), 'errors': dict()}
         place_list = [keyword] if keyword else self.make_place_list(local_info)
-
-        service_url = service_info['urls']['kakao_search']
-        headers = {"Authorization": 'KakaoAK '+service_info['keys']['kakao_rest']}
         size = min(size,len(place_list)) if size else None
 
-        service = Service(executable_path=ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service)
+        checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+
+        search_client = KakaoSearchClient(service_info)
+        candidates = self.request_candidates(search_client, place_list[:size], local_info, place_dict)
+        search_client.close()
+
+        if checkpoint is not None:
+            place_dict['places'].update(checkpoint.places)
+            retry_queue = checkpoint.get_retry_queue()
+            candidates = {**retry_queue, **{name: place for name, place in candidates.items()
+                                            if name not in checkpoint.places and name not in retry_queue}}
 
-        for place_name in place_list[:size]:
-            response = requests.get(url=service_url, headers=headers,
-                                    params={'query': place_name}).json()
-            for place in response['documents']:
+        sentiment_client = self.make_sentiment_client(service_info, sentiment_model, workers)
+        rate_limiter = AdaptiveRateLimiter(rate)
+        place_client = KakaoPlaceClient(service_info, workers) if fetcher == 'http' else None
+        pool = HTTPPool(workers) if fetcher == 'http' else DriverPool(workers)
+        context = {'service_info': service_info, 'place_dict': place_dict, 'lock': threading.Lock(),
+                   'rate_limiter': rate_limiter, 'sentiment_client': sentiment_client,
+                   'checkpoint': checkpoint, 'stored': self.data.get('places', dict()) if refresh else dict(),
+                   'unchanged': set(), 'place_client': place_client}
+
+        try:
+            pool.run(list(candidates.items()), partial(self.request_place, context=context))
+        finally:
+            sentiment_client.save_cache()
+            sentiment_client.close()
+            if place_client is not None:
+                place_client.close()
+            print(f'[{datetime.now()}] 리뷰 감정 분석 {sentiment_client.get_stats()}') # 로그 기록
+            print(f'[{datetime.now()}] 요청 속도 제한 {rate_limiter.get_stats()}') # 로그 기록
+
+        # 바뀌지 않은 장소는 기존 토큰과 데이터프레임 행을 그대로 사용
+        changed = {name: place for name, place in place_dict['places'].items() if name not in context['unchanged']}
+        print(f'[{datetime.now()}] 변경된 장소 {len(changed)}개, 변경 없는 장소 {len(context["unchanged"])}개') # 로그 기록
+
+        self.tokenize_places(changed, token_workers)
+        self.update_data(place_dict)
+        if changed or not refresh:
+            with timer.stage('update_dataframe'):
+                self.update_dataframe(self.dict_to_df(changed, local_info))
+
+        print(f'[{datetime.now()}] 스크래핑 단계별 소요 시간\n{timer.get_report()}') # 로그 기록
+
+
+    def request_candidates(self, search_client: KakaoSearchClient, place_list: list,
+                           local_info: dict, place_dict: dict) -> dict:
+        """
+        장소명 목록에 대한 카카오 API 검색 결과 중 서비스 지역 내 음식점만 골라 스크래핑 대상으로 반환하는 메소드
+        같은 장소명이 여러 번 검색되면 처음 조건을 만족한 장소만 사용
+        """
+
+        candidates = dict()
+
+        for documents in search_client.search_all(place_list).values():
+            for place in documents:
                 place_name = place.pop('place_name','')
 
-                if (place_name in place_dict['places'] or
+                if (place_name in candidates or
                     place_name in place_dict['errors']):
                     continue
 
                 try:
                     if place['address_name'].__contains__(local_info['address'][0]):
                         if place['category_group_name'] == '음식점':
-                            place.update(self.request_details(driver, place['place_url']))
-                            place.update(self.get_token_dict(
-                                place['category_name'], place['menu'], place['review']))
-                            place.update(self.request_sentiment(service_info, place['review']))
-                            place_dict['places'][place_name] = place
+                            candidates[place_name] = place
                 except Exception as e:
-                    place['log'] = (type(e), e) # 에러 메시지 로그 기록
+                    place['log'] = self.make_error_log(e) # 에러 메시지 로그 기록
                     place_dict['errors'][place_name] = place
 
-        driver.close()
-        self.update_data(place_dict)
-        self.update_dataframe(self.dict_to_df(place_dict['places'], local_info))
+        return candidates
+
+
+    def request_place(self, driver: 'webdriver.Chrome', candidate: tuple, context: dict):
+        """
+        스크래핑 대상 장소 하나의 상세 정보를 수집해 공유 결과 딕셔너리에 추가하는 작업자 메소드
+        HTTP 수집 방식에서는 driver 대신 context의 place_client로 상세 정보를 요청
+        """
+
+        place_name, place = candidate
+        place_dict, lock, checkpoint = context['place_dict'], context['lock'], context['checkpoint']
+        place_client, rate_limiter = context['place_client'], context['rate_limiter']
+        stored = context['stored'].get(place_name)
+
+        try:
+            if stored is None:
+                with timer.stage('request_details', place=place_name):
+                    if place_client is None:
+                        place.update(self.request_details(driver, place['place_url'], rate_limiter))
+                    else:
+                        place.update(place_client.request_details(place['place_url'], rate_limiter))
+                new_reviews, stored_sentiments = place['review'], list()
+            else:
+                with timer.stage('request_delta', place=place_name):
+                    new_reviews, stored_sentiments = self.request_delta(
+                        driver, place, stored, rate_limiter, place_client)
+                if new_reviews is None:
+                    with lock:
+                        context['unchanged'].add(place_name)
+
+            if new_reviews is not None:
+                with timer.stage('request_sentiment', place=place_name):
+                    sentiment_dict = self.request_sentiment(
+                        context['service_info'], new_reviews, context['sentiment_client'])
+                place['review_sentiment'] = sentiment_dict['review_sentiment'] + stored_sentiments
+                place['positive'] = place['review_sentiment'].count('positive')
+                place['negative'] = place['review_sentiment'].count('negative')
+
+            with lock:
+                place_dict['places'][place_name] = place
+            if checkpoint is not None:
+                checkpoint.write_place(place_name, place)
+        except Exception as e:
+            place['log'] = self.make_error_log(e) # 에러 메시지 로그 기록
+            with lock:
+                place_dict['errors'][place_name] = place
+            if checkpoint is not None:
+                checkpoint.write_error(place_name, place)
+            if driver is not None: # 작업자가 실패한 브라우저를 교체하도록 알림
+                raise
+
+
+    def make_error_log(self, e: Exception) -> dict:
+        """
+        예외 객체를 파일로 저장할 수 있는 형태의 에러 기록으로 변환하는 메소드
+        """
+
+        return {'type': type(e).__name__, 'message': str(e), 'time': str(datetime.now())}
 
 
     def make_place_list(self, local_info: dict) -> list:
         """
         전국 인허가 음식점 빅데이터를 기반으로 서비스 지역 내 장소 목록을 반환하는 메소드
         용량 문제로 원본 파일 미첨부 @ https://www.localdata.go.kr/datafile/each/07_24_05_P_CSV.zip
+        원본 파일은 registry.ingest_registry()로 지역별 후보 파일을 미리 생성해 사용하며,
+        해당 지역의 후보 파일이 없으면 전처리된 data/rest.csv를 사용
         """
 
-        place_df = pd.read_csv('data/rest.csv')
+        place_list = registry.load_candidates(local_info)
 
-        # 원본 파일 전처리 시 아래 코드 사용
-        # place_df = pd.read_csv('debugs/rest.csv', encoding='cp949')
+        if place_list is None:
+            place_list = pd.read_csv('data/rest.csv')['사업장명'].tolist()
 
-        # place_df = place_df[place_df['영업상태명'] != '폐업']
-        # place_df = place_df[['도로명전체주소','사업장명']]
-        # place_df = place_df[(place_df['도로명전체주소'].notnull()) &
-        #                     (place_df['도로명전체주소'].str.contains(local_info['si'])) &
-        #                     (place_df['도로명전체주소'].str.contains(local_info['gu'])) &
-        #                     (place_df['도로명전체주소'].str.contains(local_info['dong']))]
-
-        return place_df['사업장명'].tolist()
+        return place_list
 
 
     # =================================================================================
@@ -120,26 +247,86 @@ class KakaoPlaceData(PlaceData):
     # =================================================================================
 
 
-    def request_details(self, driver: webdriver.Chrome, place_url: str) -> dict:
+    def request_details(self, driver: 'webdriver.Chrome', place_url: str, rate_limiter=None) -> dict:
         """
         카카오 맛집 페이지에서 별점, 메뉴, 리뷰 데이터를 스크래핑하는 메소드
         스크래핑과 별도로 메뉴와 리뷰에 대한 TF-IDF 벡터값을 계산하여 데이터에 추가
         """
 
-        details = dict()
-
-        driver.get(place_url)
-        content_xpath= 'html' # '/html/body/div[2]/div[2]'
-        self.wait_for_xpath(driver, content_xpath, delay=3)
-
-        details.update(self.get_details_summary(driver))
+        details = self.request_summary(driver, place_url, rate_limiter)
         details['menu'] = self.get_details_menu(driver)
         details['review'] = self.get_details_review(driver, details['review_num'])
 
         return details
 
 
-    def get_details_summary(self, driver: webdriver.Chrome) -> dict:
+    def request_summary(self, driver: 'webdriver.Chrome', place_url: str, rate_limiter=None) -> dict:
+        """
+        카카오 맛집 페이지를 불러와 별점, 리뷰 개수, 블로그 리뷰 개수만 추출하는 메소드
+        """
+
+        if rate_limiter is not None:
+            with timer.stage('rate_limiter_wait'):
+                rate_limiter.wait()
+
+        driver.get(place_url)
+        self.wait_for_page(driver, rate_limiter)
+
+        return self.get_details_summary(driver)
+
+
+    def request_delta(self, driver: 'webdriver.Chrome', place: dict, stored: dict, rate_limiter=None,
+                      place_client=None) -> tuple:
+        """
+        이미 보유한 장소의 바뀐 부분만 스크래핑해 장소 딕셔너리에 반영하는 메소드
+        바뀌지 않았다면 기존 정보를 그대로 옮기고 (None, None)을 반환
+        바뀌었다면 메뉴는 다시 수집하고, 리뷰는 저장된 리뷰가 나올 때까지만 넘기며 새로운 리뷰를 앞에 추가한 뒤
+        (감정 분류가 필요한 리뷰 목록, 나머지 리뷰의 기존 감정 목록)을 반환
+        """
+
+        if place_client is None:
+            summary = self.request_summary(driver, place['place_url'], rate_limiter)
+        else:
+            main = place_client.request_main(place['place_url'], rate_limiter) # 리뷰 수집에도 같은 응답을 사용
+            summary = place_client.get_summary(main)
+
+        if not self.is_place_changed(place, summary, stored):
+            place.update({**stored, **place, **summary})
+            return None, None
+
+        place.update(summary)
+        stored_reviews = stored.get('review', list())
+
+        if place_client is None:
+            place['menu'] = self.get_details_menu(driver)
+            new_reviews, found = self.get_new_reviews(driver, summary['review_num'], set(stored_reviews))
+        else:
+            place['menu'], new_reviews, found = place_client.get_new_reviews(
+                place['place_url'], main, set(stored_reviews), rate_limiter)
+
+        if not found: # 저장된 리뷰가 모두 사라진 경우 전체 리뷰를 새로 분류
+            place['review'] = new_reviews
+            return new_reviews, list()
+
+        place['review'] = new_reviews + stored_reviews
+        return new_reviews, list(stored.get('review_sentiment', list()))
+
+
+    def is_place_changed(self, place: dict, summary: dict, stored: dict) -> bool:
+        """
+        카카오 API 검색 결과와 페이지 요약 정보를 저장된 장소 정보와 비교해 다시 스크래핑할지 판단하는 메소드
+        """
+
+        search_keys = ['place_url','category_name','address_name','road_address_name','phone','x','y']
+
+        if any([place.get(key) != stored.get(key) for key in search_keys]):
+            return True
+
+        return (summary['review_num'] != stored.get('review_num') or
+                summary['blog_num'] != stored.get('blog_num'))
+
+
+    def get_details_summary(self, driver: 'webdriver.Chrome') -> dict:
         """
         카카오 맛집 페이지에서 별점, 리뷰 개수, 블로그 리뷰 개수를 추출하는 메소드
         """
@@ -175,7 +362,7 @@ class KakaoPlaceData(PlaceData):
         return summary
 
 
-    def get_details_menu(self, driver: webdriver.Chrome) -> list:
+    def get_details_menu(self, driver: 'webdriver.Chrome') -> list:
         """
         카카오 맛집 페이지에서 메뉴 목록을 추출하는 메소드
         """
@@ -199,55 +386,109 @@ class KakaoPlaceData(PlaceData):
         return menu_list
 
 
-    def get_details_review(self, driver: webdriver.Chrome, review_num: int) -> list:
+    def get_details_review(self, driver: 'webdriver.Chrome', review_num: int) -> list:
         """
         카카오 맛집 페이지에서 리뷰 목록을 추출하는 메소드
         """
 
         review_list = list()
+
+        for reviews in self.iter_review_pages(driver, review_num):
+            review_list += reviews
+
+        return review_list
+
+
+    def get_new_reviews(self, driver: 'webdriver.Chrome', review_num: int, stored_reviews: set) -> tuple:
+        """
+        카카오 맛집 페이지에서 이미 저장된 리뷰가 나오기 전까지의 리뷰 목록만 추출하는 메소드
+        저장된 리뷰를 찾으면 이후 페이지는 넘기지 않으며, (새로운 리뷰 목록, 저장된 리뷰 발견 여부)를 반환
+        """
+
+        new_reviews = list()
+
+        for reviews in self.iter_review_pages(driver, review_num):
+            for review in reviews:
+                if review in stored_reviews:
+                    return new_reviews, True
+                new_reviews.append(review)
+
+        return new_reviews, False
+
+
+    def iter_review_pages(self, driver: 'webdriver.Chrome', review_num: int):
+        """
+        카카오 맛집 페이지의 리뷰를 한 페이지씩 넘기며 페이지별 리뷰 목록을 반환하는 제너레이터 메소드
+        """
+
         page_num = int(np.ceil(review_num / 5))
 
         try:
             for i in range(1,page_num+1):
                 review_div = driver.find_element_by_class_name('evaluation_review')
-                comments = review_div.find_elements_by_class_name('txt_comment ')
-                [review_list.append(comment.text) if comment.text else None for comment in comments]
+                comments = [comment.text for comment in review_div.find_elements_by_class_name('txt_comment ')]
+                yield [comment for comment in comments if comment]
+
+                if i == page_num:
+                    break
 
                 if i < 6:
-                    review_div.find_element_by_xpath(f'div/a[{i}]').click()
+                    xpath = f'div/a[{i}]'
                 elif i % 5 == 0:
-                    review_div.find_element_by_xpath(f'div/a[6]').click()
+                    xpath = f'div/a[6]'
                 else:
-                    review_div.find_element_by_xpath(f'div/a[{i%5+1}]').click()
-                self.wait_for_xpath(driver, 'html')
-        except:
-            pass
+                    xpath = f'div/a[{i%5+1}]'
 
-        return review_list
+                # 다음 페이지 버튼이 없거나 비활성화되어 있으면 목록 변경을 기다리지 않고 종료
+                buttons = review_div.find_elements_by_xpath(xpath)
+                if not buttons or not buttons[0].is_enabled():
+                    break
+
+                buttons[0].click()
+                self.wait_for_reviews(driver, comments)
+        except Exception: # 마지막 페이지 이후 또는 페이지 구조가 다른 경우
+            pass
 
 
-    def wait_for_xpath(self, driver: webdriver.Chrome, xpath: str, delay=1):
+    def wait_for_page(self, driver: 'webdriver.Chrome', rate_limiter=None):
         """
-        셀레니움 스크래핑 중 딜레이를 발생시키기 위한 메소드
+        고정된 시간 동안 기다리지 않고 맛집 페이지의 요약 영역이 나타날 때까지 짧은 간격으로 확인하는 메소드
+        차단 또는 오류 페이지가 확인되거나 시간이 초과되면 요청 속도를 낮추도록 알리고 예외 발생
         """
 
-        time.sleep(delay)
-        accum_delay = delay
+        def get_page_state():
+            for class_name in ['inner_place','total_evaluation','list_menu']:
+                if driver.find_elements_by_class_name(class_name):
+                    return 'ready'
+            page_text = driver.title + driver.find_element_by_tag_name('body').text[:200]
+            if any([marker in page_text for marker in ['Forbidden','404 Not Found','Too Many Requests']]):
+                return 'blocked'
 
-        while True:
-            try:
-                if driver.find_element_by_xpath(xpath).text:
-                    break
-            except:
-                pass
+        try:
+            state = wait_until(get_page_state, timeout=10)
+        except Exception:
+            state = 'timeout'
+
+        if state != 'ready':
+            if rate_limiter is not None:
+                rate_limiter.report_block()
+            raise Exception(f'카카오 플레이스 페이지를 요청하는 과정에서 문제가 발생했습니다. ({state})')
+
+        if rate_limiter is not None:
+            rate_limiter.report_success()
 
-            if accum_delay > 10:
-                raise Exception('카카오 플레이스 페이지를 요청하는 과정에서 문제가 발생했습니다.')
 
-            time.sleep(delay)
+    def wait_for_reviews(self, driver: 'webdriver.Chrome', prev_comments: list):
+        """
+        리뷰 페이지를 넘긴 뒤 리뷰 목록이 실제로 바뀔 때까지 짧은 간격으로 확인하는 메소드
+        """
+
+        def is_changed():
+            review_div = driver.find_element_by_class_name('evaluation_review')
+            comments = [comment.text for comment in review_div.find_elements_by_class_name('txt_comment ')]
+            return comments != prev_comments
 
-            accum_delay += delay
-            delay += delay
+        wait_until(is_changed, timeout=5, interval=0.05)
 
 
     # =================================================================================
@@ -260,14 +501,7 @@ class KakaoPlaceData(PlaceData):
         분류, 메뉴, 리뷰 데이터를 토큰화하는 메소드
         """
 
-        token_dict = dict()
-
-        token_dict['category_token'] = ' '.join(
-            [cat.replace(',',' ') for cat in category.split(' > ')[1:]])
-        token_dict['menu_token'] = self.get_tokenized_menu(' '.join(menus))
-        token_dict['review_token'] = self.get_tokenized_review(' '.join(reviews))
-
-        return token_dict
+        return tokenizer.get_token_dict(category, menus, reviews)
 
 
     def get_tokenized_menu(self, menu: str) -> str:
@@ -275,12 +509,7 @@ class KakaoPlaceData(PlaceData):
         메뉴 데이터를 토큰화하는 메소드
         """
 
-        okt = Okt()
-
-        menu = re.sub('[-=+,#/\?:^.@*\"※~ㆍ!』‘|\(\)\[\]`\'…》\”\“\’·]', '', menu)
-        menu = ' '.join(okt.phrases(menu))
-
-        return ' '.join(set(menu.split()))
+        return tokenizer.get_tokenized_menu(menu)
 
 
     def get_tokenized_review(self, review: str) -> str:
@@ -288,17 +517,30 @@ class KakaoPlaceData(PlaceData):
         리뷰 데이터를 토큰화하는 메소드
         """
 
-        token_list = list()
-        okt = Okt()
+        return tokenizer.get_tokenized_review(review)
 
-        review = re.sub('[-=+,#/\?:^.@*\"※~ㆍ!』‘|\(\)\[\]`\'…》\”\“\’·]', '', review)
-        review = re.sub('([ㄱ-ㅎㅏ-ㅣ]+)', '', review)
 
-        for word, pos in okt.pos(review, norm=True, stem=True):
-            if pos in ['Noun','Verb','Adjective','Adverb']:
-                token_list.append(word)  
+    def tokenize_places(self, places: dict, workers=None):
+        """
+        스크래핑한 장소들의 분류, 메뉴, 리뷰 데이터를 여러 프로세스에서 한 번에 토큰화하는 메소드
+        """
+
+        # 작업자 프로세스의 장소별 시간은 합칠 수 없으므로 전체 시간을 장소 수와 함께 기록
+        with timer.stage('get_token_dict', count=len(places)):
+            token_dicts = tokenizer.tokenize_places(list(places.values()), workers)
+
+        for place, token_dict in zip(places.values(), token_dicts):
+            place.update(token_dict)
+
+
+    def retokenize_data(self, local_info: dict, workers=None):
+        """
+        스크래핑 없이 보유한 서비스 데이터를 다시 토큰화하고 데이터프레임과 색인을 새로 생성하는 메소드
+        """
 
-        return ' '.join(token_list)
+        self.tokenize_places(self.data['places'], workers)
+        self.df = pd.DataFrame()
+        self.update_dataframe(self.dict_to_df(self.data['places'], local_info), incremental=False)
 
 
     # =================================================================================
@@ -306,93 +548,123 @@ class KakaoPlaceData(PlaceData):
     # =================================================================================
 
 
-    def make_similar_index(self) -> np.ndarray:
+    def make_similar_index(self) -> SimilarityIndex:
         """
-        분류, 메뉴, 리뷰에 대한 코사인 유사도 합을 반환하는 메소드
+        분류, 메뉴, 리뷰에 대한 코사인 유사도 합을 기준으로 각 맛집의 최근접 이웃 색인을 반환하는 메소드
+        전체 유사도 행렬을 저장하지 않고 맛집마다 similar_k개의 유사한 맛집만 보관
         """
 
-        try:
-            category_similarity = self.get_cosine_similarity('분류명 토큰화') * 0.3
-            menu_similarity = self.get_cosine_similarity('메뉴 토큰화') * 0.5
-            review_similarity = self.get_cosine_similarity('리뷰 토큰화') * 1
-            similarity = category_similarity + menu_similarity + review_similarity
-        except:
-            similarity = np.zeros([len(self.df), len(self.df)])
+        weights = {'분류명 토큰화': 0.3, '메뉴 토큰화': 0.5, '리뷰 토큰화': 1.0}
+        return SimilarityIndex(weights, self.similar_k).fit(self.df)
+
 
-        return similarity.argsort()[:, ::-1]
+    def make_search_index(self) -> dict:
+        """
+        메뉴와 리뷰 열에 대해 단어별 행 번호 목록을 가진 역색인을 생성하는 메소드
+        """
+
+        search_index = dict()
 
+        for column in ['메뉴','리뷰']:
+            docs = self.df[column] if column in self.df else list()
+            search_index[column] = InvertedIndex(docs)
 
-    def get_cosine_similarity(self, column: str) -> np.ndarray:
+        return search_index
+
+
+    def make_spatial_index(self) -> SpatialIndex:
         """
-        특정 열에 대한 코사인 유사도를 반환하는 메소드
+        맛집의 경도(x)와 위도(y)로 반경 및 최근접 검색을 위한 공간 색인을 생성하는 메소드
+        좌표가 없는 맛집은 색인에서 제외
         """
 
-        tokenized_data = self.df[column].fillna('')
+        x = pd.to_numeric(self.df.get('x', pd.Series(dtype=float)), errors='coerce')
+        y = pd.to_numeric(self.df.get('y', pd.Series(dtype=float)), errors='coerce')
 
-        if not len(tokenized_data):
-            raise Exception('해당 객체가 요청에 적합한 데이터를 가지고 있지 않습니다.')
+        return SpatialIndex(x.values, y.values)
 
-        if column in {'분류명 토큰화', '메뉴 토큰화'}:
-            vectorizer = CountVectorizer(min_df=0, ngram_range=(1,2))
-            array = vectorizer.fit_transform(tokenized_data)
-            return cosine_similarity(array, array)
-        elif column in {'리뷰 토큰화'}:
-            vectorizer = TfidfVectorizer()
-            array = vectorizer.fit_transform(tokenized_data).todense()
-            return cosine_similarity(array, array)
-        else:
-            raise Exception(f'대상이 유효하지 않습니다.')
 
+    def make_rank_index(self) -> BM25Index:
+        """
+        분류, 메뉴, 리뷰 토큰에 대한 BM25 점수와 인기도를 함께 사용하는 연관도 색인을 생성하는 메소드
+        """
+
+        popularity = self.get_popularity(self.df).values if len(self.df) else None
+
+        return BM25Index(self.rank_weights).fit(self.df, popularity)
 
-    def get_similar_places(self, result_df: pd.DataFrame, column: str, display: int) -> pd.DataFrame:
+
+    def search_rows(self, column: str, keywords: list, exact: bool) -> list:
         """
-        코사인 유사도에 기반하여 특정 조건을 만족하는 행과 유사한 데이터프레임을 반환하는 메소드
+        역색인을 통해 키워드와 연관성이 있는 행 번호 목록을 연관도 점수가 높은 순서대로 반환하는 메소드
         """
 
-        place_value = result_df.iloc[0][column]
-        place_index = self.df[self.df[column] == place_value].index.values
-        max_index = min(display*2, len(self.df))
+        if column not in self.search_index:
+            raise Exception('검색 대상이 유효하지 않습니다.')
 
-        similar_df = self.df.loc[self.similr_index[place_index,1:max_index][0]]
-        result_df = result_df.append(similar_df)
-        result_df.drop_duplicates(['식당명'], inplace=True)
+        row_ids = self.search_index[column].search(keywords, exact)
 
-        return result_df.iloc[:display] if len(result_df) > display else result_df
+        with timer.stage('rank_rows', count=len(row_ids)):
+            return self.rank_index.rank(row_ids, keywords, exact)
 
 
-    def request_sentiment(self, service_info: dict, reviews: list) -> dict:
+    def get_similar_places(self, result: ResultIds) -> ResultIds:
         """
-        네이버 CLOVA Sentiment를 통해 리뷰의 감정을 분류하고 각 분류별 개수를 반환하는 메소드
+        코사인 유사도에 기반하여 첫 번째 검색 결과와 유사한 맛집의 행 번호를 결과에 추가하는 메소드
+        최근접 이웃보다 많은 결과가 필요하면 나머지 맛집을 인기도 순으로 추가
         """
 
-        sentiment_dict = {'review_sentiment': list()}
+        if len(result):
+            result.extend(self.similr_index.get_neighbors(result.row_ids[0]))
+
+        if not result.is_full():
+            result.extend(range(len(self.df)))
 
-        service_url = service_info['urls']['naver_clova']
-        client_id = service_info['keys']['naver_clova'][0]
-        client_secret = service_info['keys']['naver_clova'][1]
+        return result
 
-        headers = {
-            'X-NCP-APIGW-API-KEY-ID': client_id,
-            'X-NCP-APIGW-API-KEY': client_secret,
-            'Content-Type': 'application/json'
-        }
 
-        for review in reviews:
+    def request_sentiment(self, service_info: dict, reviews: list, sentiment_client=None) -> dict:
+        """
+        네이버 CLOVA Sentiment를 통해 리뷰의 감정을 분류하고 각 분류별 개수를 반환하는 메소드
+        이전에 분류한 리뷰는 캐시된 결과를 사용하고, 새로운 리뷰만 동시에 요청
+        sentiment_client로 LocalSentimentModel을 전달하면 네트워크 요청 없이 한 번에 분류
+        request_data()는 실행마다 하나의 클라이언트를 전달하며, 전달하지 않으면 이번 요청에만 사용할 클라이언트를
+        생성하고 분류 결과를 캐시 파일에 저장한 뒤 종료
+        """
+
+        if sentiment_client is None:
+            sentiment_client = self.make_sentiment_client(service_info)
             try:
-                data = {'content': review}
-                response = requests.post(service_url, headers=headers,
-                                         data=json.dumps(data)).json()
-                sentiment = response['document']['sentiment']
-                sentiment_dict['review_sentiment'].append(sentiment)
-            except:
-                sentiment_dict['review_sentiment'].append('error')
+                return self.request_sentiment(service_info, reviews, sentiment_client)
+            finally:
+                sentiment_client.save_cache()
+                sentiment_client.close()
 
+        sentiment_dict = {'review_sentiment': sentiment_client.analyze_all(reviews)}
         sentiment_dict['positive'] = sentiment_dict['review_sentiment'].count('positive')
         sentiment_dict['negative'] = sentiment_dict['review_sentiment'].count('negative')
 
         return sentiment_dict
 
 
+    def make_sentiment_client(self, service_info: dict, sentiment_model=str(), callers=1) -> ClovaSentimentClient:
+        """
+        보유한 서비스 데이터의 리뷰 감정 분류 결과로 캐시를 채운 감정 분석 클라이언트를 반환하는 메소드
+        sentiment_model 파일을 지정하면 해당 로컬 감정 분류 모델을 대신 반환
+        callers는 클라이언트를 공유하며 동시에 요청하는 스크래핑 작업자 수
+        """
+
+        if sentiment_model:
+            return LocalSentimentModel.load(sentiment_model)
+
+        sentiment_client = ClovaSentimentClient(service_info, callers=callers)
+
+        for place in self.data.get('places', dict()).values():
+            sentiment_client.update_cache(place.get('review', list()), place.get('review_sentiment', list()))
+
+        return sentiment_client
+
+
     # =================================================================================
     # =================================== Data Part ===================================
     # =================================================================================
@@ -414,7 +686,7 @@ class KakaoPlaceData(PlaceData):
             match_df =  df['address_name'].isnull()
             for local in local_info['address']:
                 match_df |= df['address_name'].str.contains(local)
-            df = df[df['address_name'].str.contains(local)]
+            df = df[match_df]
 
         kr_dict = dict()
         kr_dict['place_name'] = '식당명'
@@ -447,17 +719,99 @@ class KakaoPlaceData(PlaceData):
         return df.reset_index()
 
 
-    def update_dataframe(self, df: pd.DataFrame):
+    def update_dataframe(self, df: pd.DataFrame, incremental=True):
         """
         데이터프레임 및 코사인 유사도 배열을 업데이트하는 메소드
+        이미 있는 맛집은 새로운 행으로 교체하며, 기존 데이터에 새로운 맛집만 추가되는 경우 학습된 벡터 공간에 투영해 색인을 부분적으로 갱신
         """
 
+        if not len(df): # 바뀐 내용이 없으면 색인을 유지
+            return
+
+        self.version += 1 # 행 번호가 바뀔 수 있으므로 데이터 버전 갱신
+        prev_names = self.df['식당명'] if len(self.df) else pd.Series(dtype=object)
+        incremental &= not prev_names.isin(df['식당명']).any()
+
+        # 다시 스크래핑한 맛집은 인기도와 관계없이 기존 행을 새로운 행으로 교체
+        if len(self.df) and len(df):
+            self.df = self.df[~self.df['식당명'].isin(df['식당명'])]
+
         self.df = self.df.append(df)
-        self.df['인기도'] = (self.df['별점'] +
-                           ((self.df['리뷰 수']-self.df['부정 리뷰 수'])/(self.df['리뷰 수']+1))*5.0)
+        self.df['인기도'] = self.get_popularity(self.df)
         self.df.sort_values(by=['인기도','긍정 리뷰 수','별점','식당명'],
                             ascending=[False,False,False,True], inplace=True)
         del self.df['인기도']
         self.df.drop_duplicates(['식당명'], inplace=True)
         self.df = self.df.set_index('식당명').reset_index()
-        self.similr_index = self.make_similar_index()
+
+        if not (incremental and self.update_index(prev_names)):
+            self.similr_index = self.make_similar_index()
+            self.search_index = self.make_search_index()
+            self.rank_index = self.make_rank_index()
+
+        self.spatial_index = self.make_spatial_index() # 행 순서가 바뀌므로 매번 생성 (O(N log N))
+
+
+    def get_popularity(self, df: pd.DataFrame) -> pd.Series:
+        """
+        별점과 부정적이지 않은 리뷰 비율로 맛집별 인기도를 계산하는 메소드 (데이터프레임 정렬 기준)
+        """
+
+        return df['별점'] + ((df['리뷰 수']-df['부정 리뷰 수'])/(df['리뷰 수']+1))*5.0
+
+
+    def update_index(self, prev_names: pd.Series) -> bool:
+        """
+        기존 색인 순서 뒤에 새로운 맛집을 추가한 뒤 정렬된 데이터프레임의 행 순서에 맞게 색인을 재배열하는 메소드
+        어휘 변화가 커서 전체 재학습이 필요하면 False를 반환
+        """
+
+        new_df = self.df[~self.df['식당명'].isin(prev_names)]
+
+        if len(prev_names) + len(new_df) != len(self.df):
+            return False
+
+        if not self.similr_index.append(new_df):
+            return False
+
+        names = pd.Index(prev_names.tolist() + new_df['식당명'].tolist())
+        order = names.get_indexer(self.df['식당명'])
+        self.similr_index.reorder(order)
+
+        for column, search_index in self.search_index.items():
+            for items in new_df[column]:
+                search_index.add_document(items)
+            search_index.reorder(order)
+
+        self.rank_index.append(new_df)
+        self.rank_index.reorder(order)
+        self.rank_index.set_popularity(self.get_popularity(self.df).values) # 인기도 최댓값이 바뀔 수 있으므로 매번 갱신
+
+        return True
+
+
+    def save_artifact(self, path: str):
+        """
+        데이터프레임, 학습된 벡터화 객체, 유사도 및 검색 색인을 포함한 객체 전체를 바이너리 파일로 저장하는 메소드
+        """
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path+'.tmp','wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path+'.tmp', path)
+
+
+    @staticmethod
+    def load_artifact(path: str) -> 'KakaoPlaceData':
+        """
+        save_artifact()로 저장한 객체를 색인 재계산 없이 불러오는 메소드
+        """
+
+        with open(path,'rb') as f:
+            place_data = pickle.load(f)
+
+        if not isinstance(place_data, KakaoPlaceData):
+            raise Exception('해당 파일이 요청에 적합한 데이터를 가지고 있지 않습니다.')
+
+        return place_data
@@ -0,0 +1,526 @@
+import json
+import sqlite3
+import threading
+from collections import Counter
+import numpy as np
+import pandas as pd
+from index import BM25Index
+
+
+# (데이터베이스 열 이름, 데이터프레임 열 이름)
+PLACE_COLUMNS = [
+    ('name', '식당명'), ('category', '분류명'), ('rating', '별점'), ('review_num', '리뷰 수'),
+    ('positive', '긍정 리뷰 수'), ('negative', '부정 리뷰 수'), ('blog_num', '블로그 리뷰 수'),
+    ('place_url', '웹페이지 주소'), ('bg_image', '이미지 주소'), ('road_address', '도로명 주소'),
+    ('address', '지번 주소'), ('phone', '전화번호'), ('x', 'x'), ('y', 'y'),
+    ('menu', '메뉴'), ('review', '리뷰'), ('review_sentiment', '리뷰 감정'),
+    ('category_token', '분류명 토큰화'), ('menu_token', '메뉴 토큰화'), ('review_token', '리뷰 토큰화'),
+]
+
+LIST_COLUMNS = {'menu', 'review', 'review_sentiment'}
+
+NUMBER_COLUMNS = {'rating': 'REAL', 'review_num': 'INTEGER', 'positive': 'INTEGER',
+                  'negative': 'INTEGER', 'blog_num': 'INTEGER'}
+
+# 검색 대상 데이터프레임 열 이름과 단어 색인 열 이름 (InvertedIndex와 같이 목록의 항목을 공백으로 분리)
+MATCH_COLUMNS = {'메뉴': 'menu', '리뷰': 'review'}
+
+# 연관도 순위에 사용하는 토큰 열 이름 (BM25Index와 같이 공백으로 분리)
+TOKEN_COLUMNS = ['category_token', 'menu_token', 'review_token']
+
+RANK_ORDER = 'popularity DESC, positive DESC, rating DESC, name ASC'
+
+# FTS5 trigram 토크나이저가 색인할 수 있는 최소 키워드 길이 (더 짧은 키워드는 n-gram 테이블에서 탐색)
+TRIGRAM_SIZE = 3
+
+
+class PlaceDatabase:
+
+    def __init__(self, path: str, rank_weights=dict(), neighbor_k=50):
+        self.path = path
+        self.neighbor_k = neighbor_k
+        self.rank_index = BM25Index({column: rank_weights[df_column] for column, df_column in PLACE_COLUMNS
+                                     if df_column in rank_weights})
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.create_tables()
+
+
+    def create_tables(self):
+        """
+        맛집 테이블, 단어 색인, 부분 문자열 색인, 유사 맛집 테이블을 생성하는 메소드
+        단어와 식당명의 부분 문자열은 대소문자를 구분하는 FTS5 trigram 색인으로 찾고,
+        trigram으로 찾을 수 없는 1~2글자 키워드는 해당 길이의 n-gram 테이블에서 탐색
+        이전 형식의 데이터베이스는 처음 열 때 한 번만 색인과 맛집 수, 문서 길이 합계를 다시 계산
+        """
+
+        place_columns = ', '.join([f'{column} {NUMBER_COLUMNS.get(column, "TEXT")}'
+                                   for column, _ in PLACE_COLUMNS if column != 'name'])
+        trigram = f"tokenize='trigram case_sensitive 1'"
+
+        with self.lock, self.conn:
+            tables = {name for name, in self.conn.execute('SELECT name FROM sqlite_master')}
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS places (id INTEGER PRIMARY KEY, '
+                              f'name TEXT UNIQUE NOT NULL, {place_columns}, popularity REAL)')
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS places_rank ON places ({RANK_ORDER})')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS terms (col TEXT, term TEXT, id INTEGER, count INTEGER, '
+                              'PRIMARY KEY (col, term, id)) WITHOUT ROWID')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS terms_id ON terms (id)')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS vocab (col TEXT, term TEXT, '
+                              'PRIMARY KEY (col, term)) WITHOUT ROWID')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS lengths (col TEXT, id INTEGER, length INTEGER, '
+                              'PRIMARY KEY (col, id)) WITHOUT ROWID')
+            self.conn.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS vocab_fts USING fts5(term, col UNINDEXED, {trigram})')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS vocab_grams (col TEXT, gram TEXT, term TEXT, '
+                              'PRIMARY KEY (col, gram, term)) WITHOUT ROWID')
+            self.conn.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS name_fts USING fts5(name, {trigram})')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS name_grams (gram TEXT, id INTEGER, '
+                              'PRIMARY KEY (gram, id)) WITHOUT ROWID')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS neighbors (id INTEGER, rank INTEGER, neighbor INTEGER, '
+                              'PRIMARY KEY (id, rank)) WITHOUT ROWID')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)')
+            self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('version', 0)")
+
+            # 검색마다 전체 테이블을 세지 않도록 맛집 수와 토큰 열별 문서 길이 합계를 유지
+            if not self.conn.execute("SELECT 1 FROM meta WHERE key = 'count'").fetchone():
+                self.conn.execute("INSERT INTO meta SELECT 'count', COUNT(*) FROM places")
+                for column in TOKEN_COLUMNS:
+                    self.conn.execute('INSERT INTO meta SELECT ?, IFNULL(SUM(length), 0) FROM lengths WHERE col = ?',
+                                      (f'length:{column}', column))
+
+            if 'name_fts' not in tables:
+                for column in list(MATCH_COLUMNS.values()) + TOKEN_COLUMNS:
+                    self.index_vocab(column, [term for term, in self.conn.execute(
+                        'SELECT term FROM vocab WHERE col = ?', (column,)).fetchall()])
+                for place_id, name in self.conn.execute('SELECT id, name FROM places').fetchall():
+                    self.index_name(place_id, name)
+
+            if 'places_fts' in tables:
+                self.conn.execute('DROP TABLE IF EXISTS places_vocab')
+                self.conn.execute('DROP TABLE IF EXISTS places_fts')
+                columns = ['id'] + list(MATCH_COLUMNS.values()) + TOKEN_COLUMNS
+                for row in self.conn.execute(f'SELECT {", ".join(columns)} FROM places').fetchall():
+                    self.index_terms(dict(zip(columns, row)))
+
+
+    # =================================================================================
+    # =================================== Write Part ==================================
+    # =================================================================================
+
+
+    def make_rows(self, df: pd.DataFrame) -> list:
+        """
+        서비스 데이터프레임을 데이터베이스 행 목록으로 변환하는 메소드
+        """
+
+        rows = list()
+
+        for record in df.to_dict('records'):
+            row = dict()
+            for column, df_column in PLACE_COLUMNS:
+                value = record.get(df_column, '')
+                if column in LIST_COLUMNS:
+                    value = json.dumps(list(value) if isinstance(value, (list, tuple, np.ndarray)) else list(),
+                                       ensure_ascii=False)
+                elif column in NUMBER_COLUMNS:
+                    value = pd.to_numeric(value, errors='coerce')
+                    value = 0 if pd.isnull(value) else value
+                    value = float(value) if NUMBER_COLUMNS[column] == 'REAL' else int(value)
+                else:
+                    value = '' if pd.isnull(value) else str(value)
+                row[column] = value
+            row['popularity'] = row['rating'] + ((row['review_num']-row['negative'])/(row['review_num']+1))*5.0
+            rows.append(row)
+
+        return rows
+
+
+    def upsert_places(self, df: pd.DataFrame, neighbors=True) -> list:
+        """
+        맛집을 추가하거나 같은 이름의 맛집을 갱신하고 단어 색인을 함께 수정하는 메소드
+        전달된 맛집 전체를 하나의 트랜잭션으로 처리하며, 맛집별 id 목록을 반환
+        neighbors가 True이면 전달된 맛집의 유사 맛집 목록도 함께 갱신
+        """
+
+        columns = [column for column, _ in PLACE_COLUMNS] + ['popularity']
+        updates = ', '.join([f'{column}=excluded.{column}' for column in columns if column != 'name'])
+        ids = list()
+        rows = self.make_rows(df)
+
+        with self.lock, self.conn:
+            prev_ids = set(self.get_ids([row['name'] for row in rows]))
+            for row in rows:
+                self.conn.execute(f'INSERT INTO places ({", ".join(columns)}) '
+                                  f'VALUES ({", ".join(["?"]*len(columns))}) '
+                                  f'ON CONFLICT(name) DO UPDATE SET {updates}',
+                                  [row[column] for column in columns])
+                row['id'] = self.conn.execute('SELECT id FROM places WHERE name = ?', (row['name'],)).fetchone()[0]
+                if row['id'] not in prev_ids: # 식당명은 바뀌지 않으므로 새로운 맛집만 식당명 색인에 추가
+                    self.index_name(row['id'], row['name'])
+                    self.add_meta('count', 1)
+                self.index_terms(row)
+                ids.append(row['id'])
+
+            if neighbors:
+                for place_id in ids:
+                    self.update_neighbors(place_id)
+
+            self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+        return ids
+
+
+    def index_terms(self, row: dict):
+        """
+        맛집 행의 메뉴, 리뷰 단어와 토큰별 빈도, 토큰 열의 문서 길이를 단어 색인에 기록하는 메소드
+        호출한 쪽의 트랜잭션 안에서 실행되며, 같은 맛집의 기존 기록은 먼저 삭제하고 문서 길이 합계에 차이만 반영
+        """
+
+        prev_lengths = dict(self.conn.execute('SELECT col, length FROM lengths WHERE id = ?', (row['id'],)).fetchall())
+        self.conn.execute('DELETE FROM terms WHERE id = ?', (row['id'],))
+        self.conn.execute('DELETE FROM lengths WHERE id = ?', (row['id'],))
+
+        for column in list(MATCH_COLUMNS.values()) + TOKEN_COLUMNS:
+            counts = Counter(self.get_terms(row, column))
+            self.conn.executemany('INSERT INTO terms VALUES (?, ?, ?, ?)',
+                                  [(column, term, row['id'], count) for term, count in counts.items()])
+
+            new_terms = set(counts)
+            for terms in [list(counts)[i:i+500] for i in range(0, len(counts), 500)]:
+                new_terms -= {term for term, in self.conn.execute(
+                    f'SELECT term FROM vocab WHERE col = ? AND term IN ({", ".join(["?"]*len(terms))})',
+                    [column] + terms)}
+            self.conn.executemany('INSERT INTO vocab VALUES (?, ?)', [(column, term) for term in new_terms])
+            self.index_vocab(column, new_terms)
+
+            if column in TOKEN_COLUMNS:
+                length = sum(counts.values())
+                self.conn.execute('INSERT INTO lengths VALUES (?, ?, ?)', (column, row['id'], length))
+                self.add_meta(f'length:{column}', length - prev_lengths.get(column, 0))
+
+
+    def index_vocab(self, column: str, terms):
+        """
+        새로운 단어들을 부분 문자열 색인(trigram 및 1~2글자 n-gram)에 추가하는 메소드
+        """
+
+        self.conn.executemany('INSERT INTO vocab_fts (term, col) VALUES (?, ?)', [(term, column) for term in terms])
+        self.conn.executemany('INSERT OR IGNORE INTO vocab_grams VALUES (?, ?, ?)',
+                              [(column, gram, term) for term in terms for gram in self.get_short_grams(term)])
+
+
+    def index_name(self, place_id: int, name: str):
+        """
+        새로운 맛집의 식당명을 부분 문자열 색인(trigram 및 1~2글자 n-gram)에 추가하는 메소드
+        """
+
+        self.conn.execute('INSERT INTO name_fts (rowid, name) VALUES (?, ?)', (place_id, name))
+        self.conn.executemany('INSERT OR IGNORE INTO name_grams VALUES (?, ?)',
+                              [(gram, place_id) for gram in self.get_short_grams(name)])
+
+
+    def update_neighbors(self, place_id: int):
+        """
+        맛집의 분류, 메뉴, 리뷰 토큰 전체를 쿼리로 사용한 BM25 점수가 높은 순서대로 유사 맛집 목록을 기록하는 메소드
+        유사도 색인 없이 추가된 맛집에 사용하며, 기존 맛집의 유사 맛집 목록은 다음 import_data() 전까지 유지
+        """
+
+        queries = {column: Counter() for column in TOKEN_COLUMNS}
+        for column, term, count in self.conn.execute(
+                f'SELECT col, term, count FROM terms WHERE id = ? AND col IN ({", ".join(["?"]*len(TOKEN_COLUMNS))})',
+                [place_id] + TOKEN_COLUMNS):
+            queries[column][term] = count
+
+        scores = self.get_scores(queries)
+        scores.pop(place_id, None)
+        neighbors = sorted(scores, key=lambda neighbor: (-scores[neighbor], neighbor))[:self.neighbor_k]
+
+        self.conn.execute('DELETE FROM neighbors WHERE id = ?', (place_id,))
+        self.conn.executemany('INSERT INTO neighbors VALUES (?, ?, ?)',
+                              [(place_id, rank, neighbor) for rank, neighbor in enumerate(neighbors)])
+
+
+    def get_short_grams(self, text: str) -> set:
+        return {text[i:i+size] for size in range(1, TRIGRAM_SIZE) for i in range(len(text)-size+1)}
+
+
+    def add_meta(self, key: str, value: int):
+        self.conn.execute('UPDATE meta SET value = value + ? WHERE key = ?', (value, key))
+
+
+    def get_terms(self, row: dict, column: str) -> list:
+        if column in LIST_COLUMNS:
+            return [word for item in json.loads(row[column] or '[]') for word in str(item).split()]
+        return row[column].split() if isinstance(row[column], str) else list()
+
+
+    def import_data(self, place_data):
+        """
+        KakaoPlaceData 객체의 데이터프레임과 유사 맛집 색인을 데이터베이스로 옮기는 메소드
+        """
+
+        df = place_data.get_dataframe()
+        ids = self.upsert_places(df, neighbors=False) # 학습된 유사도 색인의 이웃 목록을 그대로 사용
+
+        neighbors = list()
+        for row_id, place_id in enumerate(ids):
+            for rank, neighbor in enumerate(place_data.similr_index.get_neighbors(row_id)):
+                neighbors.append((place_id, rank, ids[neighbor]))
+
+        with self.lock, self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO neighbors VALUES (?, ?, ?)', neighbors)
+
+
+    # =================================================================================
+    # =================================== Read Part ===================================
+    # =================================================================================
+
+
+    def get_version(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+
+    def count(self) -> int:
+        return self.get_meta('count')
+
+
+    def get_meta(self, key: str) -> int:
+        with self.lock:
+            return self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()[0]
+
+
+    def quote(self, term: str) -> str:
+        return '"' + term.replace('"', '""') + '"'
+
+
+    def get_term_query(self, column: str, keyword: str) -> tuple:
+        """
+        어휘 중 키워드를 포함하는 단어를 부분 문자열 색인에서 찾는 쿼리와 매개변수를 반환하는 메소드
+        """
+
+        if len(keyword) >= TRIGRAM_SIZE:
+            return 'SELECT term FROM vocab_fts WHERE vocab_fts MATCH ? AND col = ?', [self.quote(keyword), column]
+        return 'SELECT term FROM vocab_grams WHERE col = ? AND gram = ?', [column, keyword]
+
+
+    def get_name_query(self, keyword: str) -> tuple:
+        """
+        식당명에 키워드를 포함하는 맛집 id를 부분 문자열 색인에서 찾는 쿼리와 매개변수를 반환하는 메소드
+        """
+
+        if len(keyword) >= TRIGRAM_SIZE:
+            return 'SELECT rowid FROM name_fts WHERE name_fts MATCH ?', [self.quote(keyword)]
+        return 'SELECT id FROM name_grams WHERE gram = ?', [keyword]
+
+
+    def match_terms(self, column: str, keyword: str) -> list:
+        """
+        단어 색인의 어휘 중 키워드를 포함하는 단어 목록을 반환하는 메소드
+        """
+
+        query, params = self.get_term_query(column, keyword)
+
+        with self.lock:
+            return [term for term, in self.conn.execute(query, params)]
+
+
+    def search(self, column: str, keywords: list, exact: bool, limit: int) -> list:
+        """
+        단어 색인에서 키워드와 연관성이 있는 맛집 id를 연관도 점수가 높은 순서대로 최대 limit개 반환하는 메소드
+        일치 검색은 모든 키워드 단어를 포함하는 맛집, 부분 검색은 키워드를 포함하는 단어가 하나라도 있는 맛집
+        """
+
+        if not keywords:
+            return list()
+
+        match_column = MATCH_COLUMNS[column]
+
+        if exact:
+            query = ' INTERSECT '.join(['SELECT id FROM terms WHERE col = ? AND term = ?'] * len(keywords))
+            params = [value for keyword in keywords for value in (match_column, keyword)]
+        else:
+            queries, params = list(), list()
+            for keyword in keywords:
+                term_query, term_params = self.get_term_query(match_column, keyword)
+                queries.append(f'SELECT id FROM terms WHERE col = ? AND term IN ({term_query})')
+                params += [match_column] + term_params
+            query = ' UNION '.join(queries)
+
+        with self.lock:
+            ids = [place_id for place_id, in self.conn.execute(
+                f'SELECT id FROM places WHERE id IN ({query}) ORDER BY {RANK_ORDER}', params)]
+
+        return self.rank(ids, keywords, exact)[:limit]
+
+
+    def rank(self, ids: list, keywords: list, exact: bool) -> list:
+        """
+        인기도 순으로 정렬된 맛집 id를 KakaoPlaceData.rank_index와 같은 연관도 점수가 높은 순서대로 정렬하는 메소드
+        키워드와 일치하는 토큰을 가진 맛집에 대해서만 BM25 점수를 계산해 전체 최댓값으로 나누고 인기도와 함께 사용
+        """
+
+        if not ids:
+            return list()
+
+        queries = dict()
+        for column in self.rank_index.weights:
+            queries[column] = Counter()
+            for keyword in keywords:
+                queries[column].update([keyword] if exact else self.match_terms(column, keyword))
+
+        scores = self.get_scores(queries)
+
+        with self.lock:
+            max_popularity = self.conn.execute('SELECT MAX(popularity) FROM places').fetchone()[0] or 0.0
+            popularity = dict()
+            for i in range(0, len(ids), 500):
+                chunk = list(ids[i:i+500])
+                popularity.update(self.conn.execute(
+                    f'SELECT id, popularity FROM places WHERE id IN ({", ".join(["?"]*len(chunk))})', chunk).fetchall())
+
+        max_score = max(scores.values()) if scores else 0.0
+        score = np.array([scores.get(place_id, 0.0) for place_id in ids])
+        score = score / max_score if max_score > 0 else score
+        popularity = np.array([popularity[place_id] for place_id in ids], dtype=float)
+        popularity = popularity / max_popularity if max_popularity > 0 else popularity
+
+        popularity_weight = self.rank_index.popularity_weight
+        score = (1 - popularity_weight) * score + popularity_weight * popularity
+        order = np.argsort(-score, kind='stable')
+
+        return [ids[i] for i in order]
+
+
+    def get_scores(self, queries: dict) -> dict:
+        """
+        토큰 열별 {토큰: 가중치} 쿼리에 대해 해당 토큰을 가진 맛집의 BM25 점수 가중합을 맛집 id별로 반환하는 메소드
+        맛집 수와 문서 길이 합계는 meta 테이블에 유지한 값을 사용하므로 전체 테이블을 순회하지 않음
+        """
+
+        rank_index = self.rank_index
+        scores = dict()
+
+        with self.lock:
+            size = self.count()
+
+            for column, weight in rank_index.weights.items():
+                query = queries.get(column, Counter())
+
+                postings = list()
+                for terms in [list(query)[i:i+500] for i in range(0, len(query), 500)]:
+                    postings += self.conn.execute(
+                        f'SELECT term, id, count FROM terms WHERE col = ? AND term IN ({", ".join(["?"]*len(terms))})',
+                        [column] + terms).fetchall()
+
+                if not postings:
+                    continue
+
+                total_len = self.get_meta(f'length:{column}')
+                avg_len = total_len / size if size and total_len else 1.0
+                doc_lens = dict()
+                place_ids = list({place_id for _, place_id, _ in postings})
+                for i in range(0, len(place_ids), 500):
+                    chunk = place_ids[i:i+500]
+                    doc_lens.update(self.conn.execute(
+                        f'SELECT id, length FROM lengths WHERE col = ? AND id IN ({", ".join(["?"]*len(chunk))})',
+                        [column] + chunk).fetchall())
+
+                terms, place_ids, counts = zip(*postings)
+                doc_freq = Counter(terms)
+                values = rank_index.get_bm25_values(np.array(counts, dtype=float),
+                                                    np.array([doc_freq[term] for term in terms]),
+                                                    np.array([doc_lens[place_id] for place_id in place_ids]),
+                                                    avg_len, size) * weight
+
+                for term, place_id, value in zip(terms, place_ids, values):
+                    scores[place_id] = scores.get(place_id, 0.0) + value * query[term]
+
+        return scores
+
+
+    def search_name(self, keywords: list, exact: bool, limit: int) -> list:
+        """
+        식당명과 일치하거나 식당명에 키워드를 포함하는 맛집 id를 인기도 순으로 반환하는 메소드
+        """
+
+        if not exact:
+            queries, params = zip(*[self.get_name_query(keyword) for keyword in keywords])
+            with self.lock:
+                return [place_id for place_id, in self.conn.execute(
+                    f'SELECT id FROM places WHERE id IN ({" UNION ".join(queries)}) ORDER BY {RANK_ORDER} LIMIT ?',
+                    [param for query_params in params for param in query_params] + [limit])]
+
+        if len(set(keywords)) != 1:
+            return list()
+
+        with self.lock:
+            return [place_id for place_id, in self.conn.execute(
+                'SELECT id FROM places WHERE name = ?', (keywords[0],))]
+
+
+    def get_popular_ids(self, limit: int) -> list:
+        with self.lock:
+            return [place_id for place_id, in self.conn.execute(
+                f'SELECT id FROM places ORDER BY {RANK_ORDER} LIMIT ?', (limit,))]
+
+
+    def get_neighbors(self, place_id: int) -> list:
+        with self.lock:
+            return [neighbor for neighbor, in self.conn.execute(
+                'SELECT neighbor FROM neighbors WHERE id = ? ORDER BY rank', (place_id,))]
+
+
+    def get_ids(self, names: list) -> list:
+        """
+        식당명 목록에 해당하는 맛집 id를 인기도 순으로 반환하는 메소드
+        """
+
+        with self.lock:
+            return [place_id for place_id, in self.conn.execute(
+                f'SELECT id FROM places WHERE name IN ({", ".join(["?"]*len(names))}) ORDER BY {RANK_ORDER}',
+                list(names))]
+
+
+    def get_coords(self, ids: list) -> tuple:
+        """
+        맛집 id 목록의 순서대로 경도(x)와 위도(y) 배열을 반환하는 메소드 (좌표가 없으면 nan)
+        """
+
+        coords = dict()
+
+        with self.lock:
+            for i in range(0, len(ids), 500):
+                chunk = list(ids[i:i+500])
+                for place_id, x, y in self.conn.execute(
+                        f'SELECT id, x, y FROM places WHERE id IN ({", ".join(["?"]*len(chunk))})', chunk):
+                    coords[place_id] = (x, y)
+
+        x, y = zip(*[coords.get(place_id, ('', '')) for place_id in ids]) if len(ids) else ((), ())
+        return (pd.to_numeric(pd.Series(x, dtype=object), errors='coerce').values,
+                pd.to_numeric(pd.Series(y, dtype=object), errors='coerce').values)
+
+
+    def get_frame(self, ids: list) -> pd.DataFrame:
+        """
+        맛집 id 목록의 순서대로 서비스 데이터프레임과 같은 형태의 데이터프레임을 반환하는 메소드
+        """
+
+        columns = [column for column, _ in PLACE_COLUMNS]
+        rows = dict()
+
+        with self.lock:
+            for i in range(0, len(ids), 500):
+                chunk = list(ids[i:i+500])
+                for row in self.conn.execute(
+                        f'SELECT id, {", ".join(columns)} FROM places WHERE id IN ({", ".join(["?"]*len(chunk))})',
+                        chunk):
+                    rows[row[0]] = row[1:]
+
+        df = pd.DataFrame([rows[place_id] for place_id in ids if place_id in rows], columns=columns)
+
+        for column in LIST_COLUMNS:
+            df[column] = [json.loads(value) for value in df[column]]
+
+        return df.rename(columns=dict(PLACE_COLUMNS))
@@ -0,0 +1,704 @@
+import numpy as np
+import threading
+from collections import OrderedDict
+from scipy import sparse
+from scipy.spatial import cKDTree
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+
+EARTH_RADIUS = 6371008.8 # 지구 평균 반지름 (미터)
+
+
+def get_unit_vectors(x, y) -> np.ndarray:
+    """
+    경도(x), 위도(y) 배열을 단위 구면 위의 3차원 좌표 배열로 변환하는 함수
+    """
+
+    lon, lat = np.radians(np.asarray(x, dtype=float)), np.radians(np.asarray(y, dtype=float))
+    return np.column_stack([np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)])
+
+
+def get_distances(origin: tuple, x, y) -> np.ndarray:
+    """
+    기준 위치 (x, y)에서 각 좌표까지의 대원 거리(미터) 배열을 반환하는 함수
+    좌표가 없는 위치의 거리는 무한대
+    """
+
+    chord = np.linalg.norm(get_unit_vectors(x, y) - get_unit_vectors([origin[0]], [origin[1]]), axis=1)
+    distances = 2 * EARTH_RADIUS * np.arcsin(np.clip(chord/2, 0, 1))
+
+    return np.where(np.isfinite(distances), distances, np.inf)
+
+
+class InvertedIndex:
+
+    substring_cache_size = 1024 # 사용자가 입력한 키워드별 부분 검색 결과를 보관할 최대 개수
+
+    def __init__(self, docs=list()):
+        self.postings = dict()
+        self.char_postings = dict()
+        self.substring_cache = OrderedDict()
+        self.row_ids = list()
+
+        for items in docs:
+            self.add_document(items)
+
+
+    def add_document(self, items: list):
+        """
+        목록 형태의 문서를 단어 단위로 분리해 단어별 문서 번호 목록에 추가하는 메소드
+        부분 일치 검색을 위해 단어를 구성하는 글자별로 단어 목록을 함께 기록
+        문서 번호는 추가된 순서대로 부여되며, 실제 행 번호는 row_ids를 통해 변환
+        """
+
+        doc_id = len(self.row_ids)
+        self.row_ids.append(doc_id)
+
+        if isinstance(items, str):
+            items = [items]
+        elif not hasattr(items, '__iter__'):
+            items = list()
+
+        for item in items:
+            for word in item.split():
+                if word not in self.postings:
+                    self.postings[word] = set()
+                    for char in set(word):
+                        self.char_postings.setdefault(char, set()).add(word)
+                self.postings[word].add(doc_id)
+
+        self.substring_cache.clear()
+
+
+    def reorder(self, order: np.ndarray):
+        """
+        데이터프레임의 행 순서가 바뀌었을 때 색인을 다시 만들지 않고 문서 번호와 행 번호의 대응만 갱신하는 메소드
+        order[i]는 새로운 i번째 행이 기존에 가지고 있던 행 번호
+        """
+
+        inverse = np.empty(len(order), dtype=np.int64)
+        inverse[order] = np.arange(len(order))
+        self.row_ids = inverse[np.array(self.row_ids, dtype=np.int64)].tolist()
+
+
+    def match_word(self, keyword: str) -> set:
+        """
+        키워드와 정확히 일치하는 단어를 가진 문서 번호 집합을 반환하는 메소드
+        """
+
+        return self.postings.get(keyword, set())
+
+
+    def match_substring(self, keyword: str) -> set:
+        """
+        키워드를 포함하는 단어를 가진 문서 번호 집합을 반환하는 메소드
+        키워드의 모든 글자를 포함하는 단어만 후보로 검사하며, 검색 결과는 데이터가 바뀔 때까지
+        최근에 사용한 substring_cache_size개의 키워드에 대해서만 캐시
+        """
+
+        if keyword in self.substring_cache:
+            self.substring_cache.move_to_end(keyword)
+            return self.substring_cache[keyword]
+
+        if not keyword:
+            return set(range(len(self.row_ids))) if self.postings else set()
+
+        char_sets = sorted([self.char_postings.get(char, set()) for char in set(keyword)], key=len)
+        candidates = char_sets[0].intersection(*char_sets[1:])
+
+        row_ids = set()
+        for word in candidates:
+            if keyword in word:
+                row_ids |= self.postings[word]
+
+        self.substring_cache[keyword] = row_ids
+        if len(self.substring_cache) > self.substring_cache_size:
+            self.substring_cache.popitem(last=False)
+
+        return row_ids
+
+
+    def search(self, keywords: list, exact=False) -> list:
+        """
+        키워드 목록과 연관성이 있는 행 번호를 오름차순으로 반환하는 메소드
+        일치 검색은 모든 키워드를 만족하는 교집합, 부분 검색은 하나라도 만족하는 합집합으로 계산
+        """
+
+        if not keywords:
+            return list()
+
+        if exact:
+            postings = sorted([self.match_word(keyword) for keyword in keywords], key=len)
+            doc_ids = postings[0].intersection(*postings[1:])
+        else:
+            doc_ids = set().union(*[self.match_substring(keyword) for keyword in keywords])
+
+        return sorted([self.row_ids[doc_id] for doc_id in doc_ids])
+
+
+class SimilarityIndex:
+
+    def __init__(self, weights: dict, k=50, block_size=256, drift_threshold=0.1):
+        self.weights = weights
+        self.k = k
+        self.block_size = block_size
+        self.drift_threshold = drift_threshold
+        self.vectorizers = dict()
+        self.unseen_tokens = dict()
+        self.vectors = sparse.csr_matrix((0,0))
+        self.neighbors = np.full((0,k), -1, dtype=np.int64)
+        self.scores = np.full((0,k), -np.inf)
+
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+
+    def fit(self, df):
+        """
+        분류, 메뉴, 리뷰 토큰을 벡터화하고 각 행에 대한 상위 k개의 유사한 행 번호를 계산하는 메소드
+        코사인 유사도의 가중합은 가중치의 제곱근을 곱한 정규화 벡터를 이어붙인 행렬의 내적과 같음
+        """
+
+        matrices = list()
+        self.unseen_tokens = {column: set() for column in self.weights}
+
+        if not len(df): # 빈 데이터프레임은 학습하지 않고 첫 데이터 추가 시 전체 학습
+            self.vectorizers = dict()
+            return self
+
+        for column, weight in self.weights.items():
+            vectorizer = self.make_vectorizer(column)
+            tokenized_data = df[column].fillna('') if column in df else [''] * len(df)
+            try:
+                matrix = vectorizer.fit_transform(tokenized_data)
+                self.vectorizers[column] = vectorizer
+            except ValueError: # 토큰이 하나도 없는 경우
+                matrix = sparse.csr_matrix((len(df), 0))
+                self.vectorizers[column] = None
+            matrices.append(normalize(matrix) * np.sqrt(weight))
+
+        self.vectors = sparse.hstack(matrices, format='csr')
+        self.neighbors, self.scores = self.get_top_neighbors(0, len(self))
+
+        return self
+
+
+    def transform(self, df) -> tuple:
+        """
+        기존에 학습한 어휘로 새로운 행을 벡터화하고, 어휘에 없는 토큰 목록을 함께 반환하는 메소드
+        """
+
+        matrices = list()
+        unseen_tokens = dict()
+
+        for column, weight in self.weights.items():
+            vectorizer = self.vectorizers.get(column)
+            tokenized_data = df[column].fillna('') if column in df else [''] * len(df)
+
+            if vectorizer is None:
+                matrix = sparse.csr_matrix((len(df), 0))
+                analyzer, vocabulary = self.make_vectorizer(column).build_analyzer(), dict()
+            else:
+                matrix = vectorizer.transform(tokenized_data)
+                analyzer, vocabulary = vectorizer.build_analyzer(), vectorizer.vocabulary_
+
+            unseen_tokens[column] = set(self.unseen_tokens.get(column, set()))
+            for doc in tokenized_data:
+                unseen_tokens[column].update(
+                    [token for token in analyzer(doc) if token not in vocabulary])
+
+            matrices.append(normalize(matrix) * np.sqrt(weight))
+
+        return sparse.hstack(matrices, format='csr'), unseen_tokens
+
+
+    def get_drift(self, unseen_tokens: dict) -> float:
+        """
+        마지막 학습 이후 등장한 새로운 토큰 수를 학습한 어휘 수로 나눈 비율 중 최댓값을 반환하는 메소드
+        """
+
+        drift = 0.0
+
+        for column, tokens in unseen_tokens.items():
+            vectorizer = self.vectorizers.get(column)
+            vocab_size = len(vectorizer.vocabulary_) if vectorizer is not None else 0
+            drift = max(drift, len(tokens) / max(vocab_size, 1))
+
+        return drift
+
+
+    def append(self, df) -> bool:
+        """
+        새로운 행을 기존 벡터 공간에 투영하고 영향을 받는 이웃 목록만 갱신하는 메소드
+        어휘 변화율이 drift_threshold를 넘으면 아무것도 바꾸지 않고 False를 반환하며, 이 경우 전체 재학습 필요
+        """
+
+        if not len(self) or not len(df):
+            return False
+
+        vectors, unseen_tokens = self.transform(df)
+
+        if self.get_drift(unseen_tokens) > self.drift_threshold:
+            return False
+
+        offset = len(self)
+        similarity = (self.vectors @ vectors.T).toarray()
+
+        self.unseen_tokens = unseen_tokens
+        self.vectors = sparse.vstack([self.vectors, vectors], format='csr')
+        self.merge_neighbors(similarity, offset)
+
+        neighbors, scores = self.get_top_neighbors(offset, len(self))
+        self.neighbors = np.vstack([self.neighbors, neighbors])
+        self.scores = np.vstack([self.scores, scores])
+
+        return True
+
+
+    def merge_neighbors(self, similarity: np.ndarray, offset: int):
+        """
+        기존 행과 새로운 행 사이의 유사도를 기존 상위 k개 이웃과 비교해 바뀐 행의 이웃 목록만 갱신하는 메소드
+        """
+
+        affected = np.flatnonzero(similarity.max(axis=1) > self.scores[:, -1])
+
+        if not len(affected):
+            return
+
+        new_ids = np.arange(offset, offset+similarity.shape[1])
+        candidates = np.hstack([self.neighbors[affected],
+                                np.broadcast_to(new_ids, (len(affected), len(new_ids)))])
+        candidate_scores = np.hstack([self.scores[affected], similarity[affected]])
+
+        top_index = np.argpartition(-candidate_scores, self.k-1, axis=1)[:, :self.k]
+        top_scores = np.take_along_axis(candidate_scores, top_index, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top_index = np.take_along_axis(top_index, order, axis=1)
+
+        self.neighbors[affected] = np.take_along_axis(candidates, top_index, axis=1)
+        self.scores[affected] = np.take_along_axis(candidate_scores, top_index, axis=1)
+
+
+    def reorder(self, order: np.ndarray):
+        """
+        데이터프레임의 행 순서가 바뀌었을 때 벡터와 이웃 목록을 새로운 행 번호에 맞게 재배열하는 메소드
+        order[i]는 새로운 i번째 행이 기존에 가지고 있던 행 번호
+        """
+
+        inverse = np.empty(len(order), dtype=np.int64)
+        inverse[order] = np.arange(len(order))
+
+        self.vectors = self.vectors[order]
+        self.scores = self.scores[order]
+        self.neighbors = self.neighbors[order]
+
+        valid = self.neighbors >= 0
+        self.neighbors[valid] = inverse[self.neighbors[valid]]
+
+
+    def make_vectorizer(self, column: str):
+        """
+        열의 종류에 맞는 벡터화 객체를 생성하는 메소드
+        """
+
+        if column in {'분류명 토큰화', '메뉴 토큰화'}:
+            return CountVectorizer(min_df=0, ngram_range=(1,2))
+        elif column in {'리뷰 토큰화'}:
+            return TfidfVectorizer()
+        else:
+            raise Exception(f'대상이 유효하지 않습니다.')
+
+
+    def get_top_neighbors(self, start: int, end: int) -> tuple:
+        """
+        지정한 범위의 행에 대해 자기 자신을 제외한 상위 k개의 유사한 행 번호와 유사도를 반환하는 메소드
+        N×N 유사도 행렬 대신 block_size 단위로 나누어 계산하므로 메모리 사용량은 N·k에 비례
+        """
+
+        size = len(self)
+        neighbors = np.full((end-start, self.k), -1, dtype=np.int64)
+        scores = np.full((end-start, self.k), -np.inf)
+        top_k = min(self.k, size-1)
+
+        if top_k <= 0:
+            return neighbors, scores
+
+        for block_start in range(start, end, self.block_size):
+            block_end = min(block_start+self.block_size, end)
+            rows = np.arange(block_end-block_start)
+
+            similarity = (self.vectors[block_start:block_end] @ self.vectors.T).toarray()
+            similarity[rows, rows+block_start] = -np.inf
+
+            top_index = np.argpartition(-similarity, top_k-1, axis=1)[:, :top_k]
+            top_scores = np.take_along_axis(similarity, top_index, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+
+            neighbors[rows+block_start-start, :top_k] = np.take_along_axis(top_index, order, axis=1)
+            scores[rows+block_start-start, :top_k] = np.take_along_axis(top_scores, order, axis=1)
+
+        return neighbors, scores
+
+
+    def get_neighbors(self, row_id: int) -> np.ndarray:
+        """
+        특정 행과 유사한 순서대로 정렬된 행 번호 배열을 반환하는 메소드
+        """
+
+        neighbors = self.neighbors[row_id]
+        return neighbors[neighbors >= 0]
+
+
+class BM25Index:
+
+    def __init__(self, weights: dict, k1=1.2, b=0.75, popularity_weight=0.2):
+        self.weights = weights
+        self.k1 = k1
+        self.b = b
+        self.popularity_weight = popularity_weight
+        self.size = 0
+        self.vocabs = {column: dict() for column in weights}
+        self.counts = {column: sparse.csr_matrix((0,0)) for column in weights}
+        self.popularity = np.zeros(0)
+        self.scored = None # (BM25 가중치 행렬, 단어 배열), 행이 추가되면 다음 검색 시 다시 계산
+
+
+    def __len__(self) -> int:
+        return self.size
+
+
+    def fit(self, df, popularity=None):
+        """
+        토큰 열마다 단어 빈도 행렬을 생성하고 행 순서대로 전달한 인기도를 설정하는 메소드
+        """
+
+        self.size = 0
+        self.vocabs = {column: dict() for column in self.weights}
+        self.counts = {column: sparse.csr_matrix((0,0)) for column in self.weights}
+        self.append(df)
+        self.set_popularity(np.zeros(len(df)) if popularity is None else popularity)
+
+        return self
+
+
+    def append(self, df):
+        """
+        새로운 행의 단어 빈도만 계산해 기존 단어 빈도 행렬 뒤에 추가하는 메소드
+        기존 문서는 다시 토큰화하지 않으며, 문서 수와 평균 길이에 따른 가중치는 다음 검색 시 한 번만 다시 계산
+        """
+
+        if not len(df):
+            return self
+
+        for column in self.weights:
+            docs = df[column].fillna('') if column in df else [''] * len(df)
+            counts = self.get_count_matrix(docs, self.vocabs[column])
+            prev = self.counts[column]
+            prev = sparse.csr_matrix((prev.data, prev.indices, prev.indptr), shape=(self.size, counts.shape[1]))
+            self.counts[column] = sparse.vstack([prev, counts], format='csr')
+
+        self.size += len(df)
+        self.scored = None
+
+        return self
+
+
+    def reorder(self, order: np.ndarray):
+        """
+        데이터프레임의 행 순서가 바뀌었을 때 단어 빈도와 가중치 행렬을 새로운 행 번호에 맞게 재배열하는 메소드
+        order[i]는 새로운 i번째 행이 기존에 가지고 있던 행 번호
+        """
+
+        for column, counts in self.counts.items():
+            self.counts[column] = counts[order]
+
+        if self.scored is not None:
+            matrix, terms = self.scored
+            self.scored = (matrix[order], terms)
+
+
+    def set_popularity(self, popularity):
+        """
+        행 순서대로 전달한 인기도를 최댓값으로 나눠 점수와 함께 사용하도록 설정하는 메소드
+        """
+
+        popularity = np.asarray(popularity, dtype=float)
+        self.popularity = popularity / popularity.max() if len(popularity) and popularity.max() > 0 else popularity
+
+
+    def get_count_matrix(self, docs, vocab: dict) -> sparse.csr_matrix:
+        """
+        공백으로 구분된 토큰 문서 목록의 단어 빈도 행렬을 반환하는 메소드
+        처음 나온 단어는 vocab 뒤에 추가되므로 기존 단어의 열 번호는 바뀌지 않음
+        """
+
+        indptr, indices = [0], list()
+
+        for doc in docs:
+            tokens = doc.split() if isinstance(doc, str) else list()
+            indices += [vocab.setdefault(token, len(vocab)) for token in tokens]
+            indptr.append(len(indices))
+
+        counts = sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(indptr)-1, len(vocab)))
+        counts.sum_duplicates()
+
+        return counts
+
+
+    def get_scored_matrix(self) -> tuple:
+        """
+        열마다 BM25 가중치를 계산한 희소 행렬을 열 가중치를 곱해 하나로 이어붙인 행렬과 열별 단어 배열을 반환하는 메소드
+        검색 시에는 키워드와 일치하는 단어 위치만 1인 벡터와의 곱 한 번으로 전체 행의 점수를 계산
+        """
+
+        scored = self.scored
+
+        if scored is None:
+            matrices = [self.get_bm25_matrix(self.counts[column]) * weight for column, weight in self.weights.items()]
+            matrix = sparse.hstack(matrices, format='csr') if matrices else sparse.csr_matrix((self.size, 0))
+            terms = np.array([term for column in self.weights for term in self.vocabs[column]], dtype=str)
+            scored = self.scored = (matrix, terms)
+
+        return scored
+
+
+    def get_bm25_matrix(self, tf: sparse.csr_matrix) -> sparse.csr_matrix:
+        """
+        단어 빈도 행렬의 0이 아닌 값에만 문서 길이로 보정한 BM25 가중치를 계산하는 메소드
+        """
+
+        size = tf.shape[0]
+        doc_len = np.asarray(tf.sum(axis=1)).ravel()
+        avg_len = doc_len.mean() if size and doc_len.mean() > 0 else 1.0
+        doc_freq = np.bincount(tf.indices, minlength=tf.shape[1])
+
+        rows = np.repeat(np.arange(size), np.diff(tf.indptr))
+        data = self.get_bm25_values(tf.data, doc_freq[tf.indices], doc_len[rows], avg_len, size)
+
+        return sparse.csr_matrix((data, tf.indices, tf.indptr), shape=tf.shape)
+
+
+    def get_bm25_values(self, tf: np.ndarray, doc_freq: np.ndarray, doc_len: np.ndarray,
+                        avg_len: float, size: int) -> np.ndarray:
+        """
+        단어 빈도마다 해당 단어가 나온 문서 수와 문서 길이로 BM25 가중치를 계산하는 메소드
+        전체 문서 수(size)와 평균 길이(avg_len)를 따로 전달하므로 데이터베이스에서 읽은 일부 단어에도 사용
+        """
+
+        idf = np.log1p((size - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len)
+
+        return idf * tf * (self.k1 + 1) / (tf + norm)
+
+
+    def get_query_vector(self, terms: np.ndarray, keywords: list, exact=False) -> np.ndarray:
+        """
+        키워드와 일치하는(부분 검색은 키워드를 포함하는) 단어 위치에 일치한 키워드 수를 가진 벡터를 반환하는 메소드
+        """
+
+        query = np.zeros(len(terms))
+
+        for keyword in keywords:
+            if exact:
+                query += terms == keyword
+            else:
+                query += np.char.find(terms, keyword) >= 0
+
+        return query
+
+
+    def get_scores(self, keywords: list, exact=False) -> np.ndarray:
+        """
+        전체 행에 대해 최댓값으로 나눈 BM25 점수와 인기도를 가중 평균한 연관도 점수 배열을 반환하는 메소드
+        """
+
+        matrix, terms = self.get_scored_matrix()
+        return self.blend_scores(matrix @ self.get_query_vector(terms, keywords, exact))
+
+
+    def blend_scores(self, scores: np.ndarray) -> np.ndarray:
+        if len(scores) and scores.max() > 0:
+            scores = scores / scores.max()
+
+        return (1 - self.popularity_weight) * scores + self.popularity_weight * self.popularity
+
+
+    def rank(self, row_ids: list, keywords: list, exact=False) -> list:
+        """
+        검색된 행 번호를 연관도 점수가 높은 순서대로 정렬해 반환하는 메소드 (점수가 같으면 기존 순서 유지)
+        """
+
+        if not len(row_ids) or not len(self):
+            return list(row_ids)
+
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        order = np.argsort(-self.get_scores(keywords, exact)[row_ids], kind='stable')
+
+        return row_ids[order].tolist()
+
+
+class SpatialIndex:
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.row_ids = np.flatnonzero(np.isfinite(self.x) & np.isfinite(self.y))
+        self.tree = cKDTree(get_unit_vectors(self.x[self.row_ids], self.y[self.row_ids])) if len(self.row_ids) else None
+
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+
+    def get_distances(self, origin: tuple, row_ids=None) -> np.ndarray:
+        """
+        기준 위치에서 각 행(row_ids가 없으면 전체 행)까지의 거리(미터) 배열을 반환하는 메소드
+        """
+
+        row_ids = np.arange(len(self.x)) if row_ids is None else np.asarray(row_ids, dtype=np.int64)
+        return get_distances(origin, self.x[row_ids], self.y[row_ids])
+
+
+    def query_radius(self, origin: tuple, radius: float) -> list:
+        """
+        기준 위치에서 radius미터 안에 있는 행 번호를 가까운 순서대로 반환하는 메소드
+        구면 위의 거리를 현의 길이로 바꿔 KD-트리에서 탐색
+        """
+
+        if self.tree is None:
+            return list()
+
+        chord = 2 * np.sin(min(radius / EARTH_RADIUS, np.pi) / 2)
+        row_ids = self.row_ids[self.tree.query_ball_point(get_unit_vectors([origin[0]], [origin[1]])[0], chord)]
+        order = np.argsort(self.get_distances(origin, row_ids), kind='stable')
+
+        return row_ids[order].tolist()
+
+
+    def query_knn(self, origin: tuple, k: int) -> list:
+        """
+        기준 위치에서 가장 가까운 k개의 행 번호를 가까운 순서대로 반환하는 메소드
+        """
+
+        k = min(k, len(self))
+
+        if not k:
+            return list()
+
+        _, index = self.tree.query(get_unit_vectors([origin[0]], [origin[1]])[0], k=k)
+        return self.row_ids[np.atleast_1d(index)].tolist()
+
+
+class ResultIds:
+
+    def __init__(self, display: int):
+        self.display = display
+        self.row_ids = list()
+        self.seen = set()
+
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+
+    def is_full(self) -> bool:
+        return len(self.row_ids) >= self.display
+
+
+    def extend(self, row_ids):
+        """
+        이미 포함된 행을 제외하고 순서대로 행 번호를 추가하되, display개가 차면 중단하는 메소드
+        """
+
+        for row_id in row_ids:
+            if self.is_full():
+                break
+            if row_id not in self.seen:
+                self.seen.add(row_id)
+                self.row_ids.append(row_id)
+
+        return self
+
+
+class QueryCache:
+
+    def __init__(self, maxsize=1024, max_ids=1000000):
+        self.maxsize = maxsize
+        self.max_ids = max_ids
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.num_ids = 0
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get_key(self, keywords: list, target: str, exact: bool, display) -> tuple:
+        return (tuple(sorted(set(keywords))), target, exact, display)
+
+
+    def get(self, key: tuple, version: int):
+        """
+        데이터 버전이 같을 때만 캐시된 행 번호 목록을 반환하는 메소드 (없으면 None)
+        데이터 버전이 바뀌었다면 이전 버전의 결과는 모두 제거
+        """
+
+        with self.lock:
+            if self.version != version:
+                self.clear_entries()
+                self.version = version
+
+            row_ids = self.entries.get(key)
+
+            if row_ids is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+            return list(row_ids)
+
+
+    def put(self, key: tuple, version: int, row_ids: list):
+        """
+        검색을 시작할 때의 데이터 버전이 캐시가 마지막으로 확인한 버전과 같으면 결과를 저장하고,
+        (검색 도중 데이터가 바뀌었는지는 호출하는 쪽에서 검색 후의 데이터 버전으로 확인)
+        항목 수가 maxsize를 넘거나 저장된 행 번호 수가 max_ids를 넘으면 가장 오래 사용하지 않은 결과부터 제거하는 메소드
+        """
+
+        if len(row_ids) > self.max_ids:
+            return
+
+        with self.lock:
+            if self.version != version:
+                return
+
+            if key in self.entries:
+                self.num_ids -= len(self.entries.pop(key))
+
+            self.entries[key] = tuple(row_ids)
+            self.num_ids += len(row_ids)
+
+            while len(self.entries) > self.maxsize or self.num_ids > self.max_ids:
+                _, evicted = self.entries.popitem(last=False)
+                self.num_ids -= len(evicted)
+                self.evictions += 1
+
+
+    def clear_entries(self):
+        self.entries.clear()
+        self.num_ids = 0
+
+
+    def get_stats(self) -> dict:
+        """
+        캐시 적중 및 실패 횟수와 현재 저장된 결과 수를 반환하는 메소드
+        """
+
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self.entries), 'row_ids': self.num_ids, 'evictions': self.evictions}
@@ -0,0 +1,112 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class StageTimer:
+
+    def __init__(self, log_path=str()):
+        self.log_path = log_path
+        self.lock = threading.Lock()
+        self.stages = dict()
+
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """
+        with 블록의 실행 시간을 name 단계에 누적하는 메소드 (예외가 발생해도 기록)
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, **fields)
+
+
+    def add(self, name: str, seconds: float, count=1, **fields):
+        """
+        단계별 호출 횟수, 누적 시간, 최대 시간을 갱신하고 log_path가 있으면 한 줄씩 기록을 남기는 메소드
+        여러 항목을 한 번에 처리한 경우 count로 처리한 항목 수를 전달
+        """
+
+        with self.lock:
+            stage = self.stages.setdefault(name, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            stage['count'] += count
+            stage['seconds'] += seconds
+            stage['max_seconds'] = max(stage['max_seconds'], seconds)
+
+            if self.log_path:
+                line = json.dumps({'time': str(datetime.now()), 'stage': name, 'seconds': seconds,
+                                   'count': count, **fields}, ensure_ascii=False, default=str)
+                os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+                with open(self.log_path,'a', encoding='UTF-8') as f:
+                    f.write(line+'\n')
+
+
+    def get_summary(self) -> list:
+        """
+        누적 시간이 긴 순서대로 단계별 호출 횟수, 누적 시간, 평균 시간, 최대 시간을 반환하는 메소드
+        """
+
+        with self.lock:
+            summary = [{'stage': name, **stage, 'mean_seconds': stage['seconds'] / max(stage['count'], 1)}
+                       for name, stage in self.stages.items()]
+
+        return sorted(summary, key=lambda stage: stage['seconds'], reverse=True)
+
+
+    def get_report(self) -> str:
+        """
+        단계별 측정 결과를 사람이 읽기 쉬운 표 형태의 문자열로 반환하는 메소드
+        """
+
+        lines = [f'{"stage":<28}{"count":>8}{"total(s)":>12}{"mean(s)":>12}{"max(s)":>12}']
+        for stage in self.get_summary():
+            lines.append(f'{stage["stage"]:<28}{stage["count"]:>8}{stage["seconds"]:>12.4f}'
+                         f'{stage["mean_seconds"]:>12.4f}{stage["max_seconds"]:>12.4f}')
+
+        return '\n'.join(lines)
+
+
+    def set_log_path(self, log_path: str):
+        """
+        단계별 기록을 남길 JSONL 파일 경로를 지정하는 메소드
+        STAGE_LOG_PATH 환경 변수가 있으면 해당 경로를 우선 사용하며, 빈 값이면 기록하지 않음
+        """
+
+        with self.lock:
+            self.log_path = os.environ.get('STAGE_LOG_PATH', log_path)
+
+
+    def reset(self):
+        with self.lock:
+            self.stages = dict()
+
+
+timer = StageTimer() # 스크래핑과 검색 단계가 함께 사용하는 전역 측정 객체
+
+
+def profile_call(func, *args, path=str(), limit=30, **kwargs) -> tuple:
+    """
+    함수 하나를 cProfile로 실행해 결과와 누적 시간 기준 상위 limit개 함수의 통계 문자열을 반환하는 함수
+    path를 지정하면 pstats 형식의 원본 통계를 파일로 저장
+    """
+
+    profile = cProfile.Profile()
+    result = profile.runcall(func, *args, **kwargs)
+
+    if path:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        profile.dump_stats(path)
+
+    stream = io.StringIO()
+    pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(limit)
+
+    return result, stream.getvalue()
@@ -0,0 +1,123 @@
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+import pandas as pd
+
+
+REGISTRY_COLUMNS = ['사업장명','도로명전체주소','영업상태명'] # 원본 파일에서 읽을 열 (나머지 열은 파싱하지 않음)
+
+CANDIDATE_COLUMNS = ['사업장명','도로명전체주소']
+
+
+def get_region_key(local_info: dict) -> str:
+    """
+    서비스 지역의 시, 구, 동으로 지역별 후보 파일 이름에 사용할 키를 반환하는 함수
+    """
+
+    region = [local_info.get(key, '') for key in ['si','gu','dong']]
+    region_hash = hashlib.sha256(json.dumps(region, ensure_ascii=False).encode('UTF-8')).hexdigest()[:8]
+
+    return '_'.join([name for name in region if name] + [region_hash])
+
+
+def get_candidate_path(local_info: dict, output_dir='data/regions') -> str:
+    return os.path.join(output_dir, get_region_key(local_info)+'.csv')
+
+
+def match_region(addresses: pd.Series, local_info: dict) -> pd.Series:
+    """
+    도로명 주소가 서비스 지역의 시, 구, 동을 모두 포함하는지 여부를 반환하는 함수
+    """
+
+    match = addresses.notnull()
+
+    for key in ['si','gu','dong']:
+        if local_info.get(key):
+            match &= addresses.str.contains(local_info[key], regex=False, na=False)
+
+    return match
+
+
+def ingest_registry(source_path: str, regions: list, output_dir='data/regions', chunksize=100000,
+                    encoding='cp949') -> dict:
+    """
+    전국 인허가 음식점 원본 파일을 chunksize행씩 나눠 읽으면서 폐업한 음식점을 제외하고
+    여러 서비스 지역의 후보 음식점을 한 번에 분류해 지역별 후보 파일로 저장하는 함수
+    메모리에는 읽고 있는 chunk와 지역별 음식점 이름만 유지하며, 완료 후 지역별 파일 경로를 반환
+    원본 압축 파일(.zip)도 압축을 풀지 않고 바로 읽을 수 있음
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    regions = {get_region_key(local_info): local_info for local_info in regions}
+    paths = {key: get_candidate_path(local_info, output_dir) for key, local_info in regions.items()}
+    seen = {key: set() for key in paths}
+    stats = {'rows': 0, 'closed': 0, 'matched': 0}
+
+    for path in paths.values():
+        pd.DataFrame(columns=CANDIDATE_COLUMNS).to_csv(path+'.tmp', index=False)
+
+    reader = pd.read_csv(source_path, encoding=encoding, usecols=REGISTRY_COLUMNS, dtype=str,
+                         chunksize=chunksize, on_bad_lines='skip')
+
+    for chunk in reader:
+        stats['rows'] += len(chunk)
+        is_open = chunk['영업상태명'] != '폐업'
+        stats['closed'] += int((~is_open).sum())
+        chunk = chunk.loc[is_open & chunk['사업장명'].notnull(), CANDIDATE_COLUMNS]
+
+        for key, local_info in regions.items():
+            region_df = chunk[match_region(chunk['도로명전체주소'], local_info)]
+            region_df = region_df.drop_duplicates(['사업장명'])
+            region_df = region_df[~region_df['사업장명'].isin(seen[key])]
+
+            seen[key].update(region_df['사업장명'])
+            stats['matched'] += len(region_df)
+            region_df.to_csv(paths[key]+'.tmp', mode='a', header=False, index=False)
+
+    for path in paths.values():
+        os.replace(path+'.tmp', path)
+
+    print(f'[{datetime.now()}] 인허가 음식점 데이터 처리 완료 {stats}') # 로그 기록
+
+    return paths
+
+
+def load_candidates(local_info: dict, output_dir='data/regions') -> list:
+    """
+    ingest_registry()로 저장한 서비스 지역의 후보 음식점 이름 목록을 반환하는 함수 (파일이 없으면 None)
+    """
+
+    path = get_candidate_path(local_info, output_dir)
+
+    if not os.path.exists(path):
+        return None
+
+    return pd.read_csv(path, usecols=['사업장명'], dtype=str)['사업장명'].dropna().tolist()
+
+
+def main():
+    """
+    전국 인허가 음식점 원본 파일에서 지정한 서비스 지역들의 후보 음식점 파일을 생성하는 함수
+    ex) python registry.py 07_24_05_P_CSV.zip --region 서울특별시 강남구 삼성동 --region 경기도 광명시 ""
+    """
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('source')
+    parser.add_argument('--region', nargs=3, action='append', metavar=('SI','GU','DONG'), required=True)
+    parser.add_argument('--output', default='data/regions')
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--encoding', default='cp949')
+    args = parser.parse_args()
+
+    regions = [{'si': si, 'gu': gu, 'dong': dong} for si, gu, dong in args.region]
+    paths = ingest_registry(args.source, regions, args.output, args.chunksize, args.encoding)
+
+    for path in paths.values():
+        print(f'[{datetime.now()}] {path}') # 로그 기록
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+from profiler import timer
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+class RateLimiter:
+
+    def __init__(self, rate=1.0):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+
+    def wait(self):
+        """
+        모든 작업자를 통틀어 초당 rate회를 넘지 않도록 다음 요청 시각까지 대기하는 메소드
+        """
+
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+    def report_success(self):
+        pass # 고정 간격 제한기는 응답에 따라 간격을 바꾸지 않음
+
+
+    def report_block(self):
+        pass
+
+
+class AdaptiveRateLimiter(RateLimiter):
+
+    def __init__(self, rate=1.0, min_rate=None, increase=0.05, cooldown=30.0):
+        super().__init__(rate)
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate else rate / 16
+        self.increase = increase
+        self.cooldown = cooldown
+        self.successes = 0
+        self.blocks = 0
+
+
+    def set_rate(self, rate: float):
+        self.rate = rate
+        self.interval = 1.0 / rate if rate else 0.0
+
+
+    def report_success(self):
+        """
+        페이지를 정상적으로 불러오면 초당 요청 수를 increase만큼 늘려 처음 지정한 rate까지 회복하는 메소드
+        """
+
+        with self.lock:
+            self.successes += 1
+            if self.max_rate:
+                self.set_rate(min(self.rate + self.increase, self.max_rate))
+
+
+    def report_block(self):
+        """
+        차단 또는 오류 페이지가 확인되면 초당 요청 수를 절반으로 줄이고 cooldown초 동안 모든 작업자의 요청을 멈추는 메소드
+        """
+
+        with self.lock:
+            self.blocks += 1
+            if self.max_rate:
+                self.set_rate(max(self.rate / 2, self.min_rate))
+            self.next_time = max(self.next_time, time.monotonic() + self.cooldown)
+
+
+    def get_stats(self) -> dict:
+        return {'rate': self.rate, 'successes': self.successes, 'blocks': self.blocks}
+
+
+def wait_until(condition, timeout=10.0, interval=0.1, message='페이지를 불러오는 과정에서 문제가 발생했습니다.'):
+    """
+    condition()이 참인 값을 반환할 때까지 interval초 간격으로 확인해 해당 값을 반환하는 함수
+    요소가 아직 없어서 발생하는 예외는 무시하고, timeout초가 지나면 예외 발생
+    대기한 시간은 page_wait 단계에 누적
+    """
+
+    start = time.monotonic()
+
+    try:
+        while True:
+            try:
+                result = condition()
+                if result:
+                    return result
+            except Exception:
+                pass
+
+            if time.monotonic() - start > timeout:
+                raise Exception(message)
+
+            time.sleep(interval)
+    finally:
+        timer.add('page_wait', time.monotonic() - start)
+
+
+class DriverPool:
+
+    def __init__(self, workers=1, headless=True):
+        self.workers = max(workers, 1)
+        self.headless = headless
+        self.executable_path = str()
+
+
+    def make_driver(self) -> 'webdriver.Chrome':
+        """
+        작업자 하나가 사용할 크롬 드라이버를 생성하는 메소드
+        selenium은 브라우저를 실행하는 경우에만 불러옴
+        """
+
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument('--headless')
+            options.add_argument('--disable-gpu')
+
+        service = Service(executable_path=self.executable_path)
+        return webdriver.Chrome(service=service, options=options)
+
+
+    def run(self, items: list, func):
+        """
+        작업 목록을 공유 큐에 넣고 작업자마다 드라이버를 하나씩 할당해 func(driver, item)을 병렬로 실행하는 메소드
+        func에서 예외가 발생하면 해당 드라이버만 교체하고 다음 작업을 계속하며,
+        드라이버를 생성하지 못하면 남은 작업을 중단하고 첫 번째 예외를 다시 발생시킴
+        """
+
+        if not items: # 작업이 없으면 크롬 드라이버를 설치하거나 브라우저를 실행하지 않음
+            return
+
+        item_queue = queue.Queue()
+        for item in items:
+            item_queue.put(item)
+
+        errors = list()
+        self.prepare()
+
+        threads = [threading.Thread(target=self.run_worker, args=(item_queue, func, errors))
+                   for _ in range(min(self.workers, len(items)))]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+
+    def prepare(self):
+        from webdriver_manager.chrome import ChromeDriverManager
+        self.executable_path = ChromeDriverManager().install()
+
+
+    def run_worker(self, item_queue: queue.Queue, func, errors: list):
+        """
+        큐가 빌 때까지 작업을 하나씩 꺼내 처리하는 작업자 메소드
+        드라이버는 작업 사이에 재사용하고, 작업이 실패하면 종료한 뒤 다음 작업에서 새로 생성
+        """
+
+        driver = None
+
+        try:
+            while not errors:
+                try:
+                    item = item_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if driver is None:
+                    driver = self.make_driver()
+
+                try:
+                    func(driver, item)
+                except Exception as e: # 차단 페이지나 브라우저 오류 이후의 상태를 알 수 없으므로 드라이버 교체
+                    print(f'[{datetime.now()}] 작업 실패로 드라이버를 교체합니다. ({type(e)}, {e})') # 로그 기록
+                    self.retire_driver(driver)
+                    driver = None
+        except Exception as e:
+            errors.append(e)
+        finally:
+            self.retire_driver(driver)
+
+
+    def retire_driver(self, driver: 'webdriver.Chrome'):
+        """
+        드라이버를 종료하는 메소드 (이미 비정상 종료된 드라이버의 예외는 무시)
+        """
+
+        if driver is None:
+            return
+
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+class HTTPPool(DriverPool):
+
+    def prepare(self):
+        pass # 브라우저를 사용하지 않으므로 크롬 드라이버 설치 불필요
+
+
+    def make_driver(self):
+        """
+        브라우저 없이 HTTP 요청으로 상세 정보를 수집하는 작업자는 드라이버 대신 None을 전달받음
+        """
+
+        return None
+
+
+class Checkpoint:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.error_path = os.path.splitext(path)[0] + '.errors.jsonl'
+        self.lock = threading.Lock()
+        self.places = self.load(self.path)
+        self.errors = self.load(self.error_path)
+
+
+    def load(self, path: str) -> dict:
+        """
+        한 줄에 하나의 장소가 기록된 체크포인트 파일을 장소명별 딕셔너리로 불러오는 메소드
+        비정상 종료로 마지막 줄이 잘린 경우 다음 기록이 이어 붙지 않도록 해당 줄을 파일에서 잘라냄
+        """
+
+        places = dict()
+
+        if not os.path.exists(path):
+            return places
+
+        with open(path,'rb+') as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    print(f'[{datetime.now()}] 잘린 체크포인트 기록을 제거합니다. ({path})') # 로그 기록
+                    f.truncate(offset)
+                    break
+                offset += len(line)
+
+                try:
+                    record = json.loads(line.decode('UTF-8'))
+                    places[record['name']] = record['place']
+                except (ValueError, KeyError):
+                    continue
+
+        return places
+
+
+    def append(self, path: str, name: str, place: dict):
+        """
+        장소 하나를 체크포인트 파일 끝에 기록하고 즉시 디스크에 반영하는 메소드
+        """
+
+        line = json.dumps({'name': name, 'place': place}, ensure_ascii=False, default=str)
+
+        with self.lock:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path,'a', encoding='UTF-8') as f:
+                f.write(line+'\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+
+    def write_place(self, name: str, place: dict):
+        self.places[name] = place
+        self.append(self.path, name, place)
+
+
+    def write_error(self, name: str, place: dict):
+        self.errors[name] = place
+        self.append(self.error_path, name, place)
+
+
+    def get_retry_queue(self) -> dict:
+        """
+        실패한 뒤 아직 성공하지 못한 장소들을 에러 기록을 제외하고 반환하는 메소드
+        """
+
+        return {name: {key: value for key, value in place.items() if key != 'log'}
+                for name, place in self.errors.items() if name not in self.places}
@@ -0,0 +1,156 @@
+import json
+import os
+import pickle
+import sys
+import time
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+
+class LocalSentimentModel:
+
+    def __init__(self, batch_size=1024):
+        self.batch_size = batch_size
+        self.vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(1,3), min_df=2, sublinear_tf=True)
+        self.classifier = LogisticRegression(max_iter=1000, class_weight='balanced')
+        self.reviews = 0
+        self.seconds = 0.0
+
+
+    def fit(self, reviews: list, labels: list) -> 'LocalSentimentModel':
+        """
+        리뷰 목록과 감정 분류 결과(positive, negative, neutral)로 글자 n-gram 기반 분류 모델을 학습하는 메소드
+        형태소 분석기 없이 동작하도록 띄어쓰기 단위 안의 1~3글자 조각을 특징으로 사용
+        """
+
+        self.classifier.fit(self.vectorizer.fit_transform(reviews), labels)
+        return self
+
+
+    def predict(self, reviews: list) -> list:
+        """
+        리뷰 목록의 감정을 batch_size개씩 묶어 행렬 연산으로 분류한 결과를 순서대로 반환하는 메소드
+        """
+
+        start = time.perf_counter()
+        labels = list()
+
+        for i in range(0, len(reviews), self.batch_size):
+            vectors = self.vectorizer.transform(reviews[i:i+self.batch_size])
+            labels += self.classifier.predict(vectors).tolist()
+
+        self.reviews += len(reviews)
+        self.seconds += time.perf_counter() - start
+
+        return labels
+
+
+    def evaluate(self, reviews: list, labels: list) -> dict:
+        """
+        저장된 감정 분류 결과와의 일치율, 감정별 일치율, 초당 처리 리뷰 수를 반환하는 메소드
+        """
+
+        start = time.perf_counter()
+        predictions = np.array(self.predict(reviews))
+        seconds = time.perf_counter() - start
+        labels = np.array(labels)
+
+        return {'reviews': len(reviews), 'agreement': float(np.mean(predictions == labels)) if len(labels) else 0.0,
+                'label_agreement': {label: float(np.mean(predictions[labels == label] == label))
+                                    for label in np.unique(labels)},
+                'reviews_per_second': len(reviews) / seconds if seconds else 0.0}
+
+
+    def analyze_all(self, reviews: list) -> list:
+        """
+        ClovaSentimentClient와 같은 형태로 리뷰 목록의 감정을 반환하는 메소드 (request_sentiment에서 사용)
+        """
+
+        return self.predict(list(reviews)) if reviews else list()
+
+
+    def get_stats(self) -> dict:
+        """
+        지금까지 분류한 리뷰 수와 초당 처리 리뷰 수를 반환하는 메소드
+        """
+
+        return {'reviews': self.reviews, 'seconds': self.seconds,
+                'reviews_per_second': self.reviews / self.seconds if self.seconds else 0.0}
+
+
+    def save_cache(self):
+        pass # 외부 API를 호출하지 않으므로 저장할 캐시가 없음
+
+
+    def close(self):
+        pass
+
+
+    def save(self, path: str):
+        """
+        학습된 벡터화 객체와 분류기를 파일로 저장하는 메소드
+        스크립트로 실행해도 불러올 수 있도록 클래스 객체 대신 구성 요소만 저장
+        """
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        with open(path+'.tmp','wb') as f:
+            pickle.dump({'batch_size': self.batch_size, 'vectorizer': self.vectorizer,
+                         'classifier': self.classifier}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path+'.tmp', path)
+
+
+    @staticmethod
+    def load(path: str) -> 'LocalSentimentModel':
+        with open(path,'rb') as f:
+            components = pickle.load(f)
+
+        if not isinstance(components, dict) or 'classifier' not in components:
+            raise Exception('감정 분류 모델 파일이 올바르지 않습니다.')
+
+        model = LocalSentimentModel(components['batch_size'])
+        model.vectorizer, model.classifier = components['vectorizer'], components['classifier']
+
+        return model
+
+
+def load_training_data(data_paths: list) -> tuple:
+    """
+    서비스 데이터 파일들에서 CLOVA가 분류한 리뷰와 감정 목록을 중복 없이 반환하는 함수
+    """
+
+    samples = dict()
+
+    for data_path in data_paths:
+        with open(data_path,'r', encoding='UTF-8') as f:
+            service_data = json.load(f)
+
+        for place in service_data.get('places', dict()).values():
+            for review, label in zip(place.get('review', list()), place.get('review_sentiment', list())):
+                if review and label in {'positive','negative','neutral'}:
+                    samples[review] = label
+
+    return list(samples.keys()), list(samples.values())
+
+
+def main(model_path: str, data_paths: list, test_size=0.2, seed=0):
+    """
+    저장된 감정 분류 결과로 모델을 학습하고 검증 데이터의 일치율과 처리량을 기록한 뒤 모델을 저장하는 함수
+    검증 후에는 전체 데이터로 다시 학습해 저장
+    ex) python sentiment.py cache/sentiment_model.pkl data/service_data.json data/gm_service_data.json
+    """
+
+    reviews, labels = load_training_data(data_paths)
+    train_reviews, test_reviews, train_labels, test_labels = train_test_split(
+        reviews, labels, test_size=test_size, random_state=seed, stratify=labels)
+
+    model = LocalSentimentModel().fit(train_reviews, train_labels)
+    print(json.dumps(model.evaluate(test_reviews, test_labels), ensure_ascii=False, indent=4))
+
+    LocalSentimentModel().fit(reviews, labels).save(model_path)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1], sys.argv[2:] if len(sys.argv) > 2 else ['data/service_data.json','data/gm_service_data.json'])
@@ -0,0 +1,95 @@
+import numpy as np
+import os
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+
+SERVICE_SCHEMA = pa.schema([
+    ('식당명', pa.string()),
+    ('분류명', pa.string()),
+    ('별점', pa.float64()),
+    ('리뷰 수', pa.int64()),
+    ('긍정 리뷰 수', pa.int64()),
+    ('부정 리뷰 수', pa.int64()),
+    ('블로그 리뷰 수', pa.int64()),
+    ('웹페이지 주소', pa.string()),
+    ('이미지 주소', pa.string()),
+    ('도로명 주소', pa.string()),
+    ('지번 주소', pa.string()),
+    ('전화번호', pa.string()),
+    ('x', pa.string()),
+    ('y', pa.string()),
+    ('메뉴', pa.list_(pa.string())),
+    ('리뷰', pa.list_(pa.string())),
+    ('리뷰 감정', pa.list_(pa.string())),
+    ('분류명 토큰화', pa.string()),
+    ('메뉴 토큰화', pa.string()),
+    ('리뷰 토큰화', pa.string()),
+])
+
+
+def to_service_table(df: pd.DataFrame) -> pa.Table:
+    """
+    서비스 데이터프레임을 목록 열을 유지한 Arrow 테이블로 변환하는 함수
+    빈 값이 문자열로 채워진 열도 스키마에 맞는 타입으로 변환
+    """
+
+    arrays = list()
+
+    for field in SERVICE_SCHEMA:
+        values = df[field.name] if field.name in df else pd.Series([None]*len(df), dtype=object)
+
+        if pa.types.is_list(field.type):
+            values = [[str(item) for item in value] if isinstance(value, (list, tuple, np.ndarray)) else list()
+                      for value in values]
+        elif pa.types.is_floating(field.type):
+            values = pd.to_numeric(values, errors='coerce').fillna(0.0).astype(np.float64)
+        elif pa.types.is_integer(field.type):
+            values = pd.to_numeric(values, errors='coerce').fillna(0).astype(np.int64)
+        else:
+            values = values.fillna('').astype(str)
+
+        arrays.append(pa.array(values, type=field.type))
+
+    return pa.Table.from_arrays(arrays, schema=SERVICE_SCHEMA)
+
+
+def write_service_table(df: pd.DataFrame, path: str):
+    """
+    서비스 데이터프레임을 메모리 매핑이 가능한 비압축 Arrow IPC 파일로 저장하는 함수
+    """
+
+    table = to_service_table(df)
+
+    with pa.OSFile(path+'.tmp', 'wb') as sink:
+        with pa.ipc.new_file(sink, SERVICE_SCHEMA) as writer:
+            writer.write_table(table)
+
+    os.replace(path+'.tmp', path)
+
+
+def read_service_table(path: str, columns=None) -> pa.Table:
+    """
+    Arrow IPC 파일을 메모리 매핑으로 열어 columns로 지정한 열의 버퍼만 복사 없이 반환하는 함수
+    """
+
+    return feather.read_table(path, columns=columns, memory_map=True)
+
+
+def get_pandas_type(arrow_type: pa.DataType):
+    """
+    목록 열은 파이썬 리스트로 변환하지 않고 Arrow 배열을 그대로 사용하는 pandas 타입을 반환하는 함수
+    행을 순회하거나 선택할 때 해당 행의 값만 리스트로 변환
+    """
+
+    return pd.ArrowDtype(arrow_type) if pa.types.is_list(arrow_type) else None
+
+
+def read_service_df(path: str, columns=None) -> pd.DataFrame:
+    """
+    Arrow IPC 파일에서 필요한 열만 읽어 서비스 데이터프레임 형태로 반환하는 함수
+    숫자 열은 블록을 합치지 않아 메모리 매핑된 버퍼를 그대로 사용하고, 목록 열은 Arrow 배열로 유지
+    """
+
+    return read_service_table(path, columns).to_pandas(types_mapper=get_pandas_type, split_blocks=True)
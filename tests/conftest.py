@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profiler import timer
+
+
+class StubServer:
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = list()
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.make_request_handler())
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+
+    def make_request_handler(self):
+        """
+        요청을 기록하고 handler(method, path, query, body)가 반환한 (상태 코드, 헤더, 본문)으로 응답하는 핸들러 클래스
+        본문이 dict 또는 list이면 json으로 변환
+        """
+
+        stub = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+
+            def handle_request(self, method: str):
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length).decode('UTF-8') if length else str()
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+                with stub.lock:
+                    stub.requests.append({'method': method, 'path': url.path, 'query': query,
+                                          'body': body, 'headers': dict(self.headers)})
+
+                status, headers, content = stub.handler(method, url.path, query, body)
+                if isinstance(content, (dict, list)):
+                    content = json.dumps(content, ensure_ascii=False)
+                content = content.encode('UTF-8') if isinstance(content, str) else content
+
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                self.handle_request('GET')
+
+            def do_POST(self):
+                self.handle_request('POST')
+
+            def log_message(self, *args):
+                pass
+
+        return RequestHandler
+
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    """
+    테스트마다 로컬 HTTP 스텁 서버를 생성하는 함수를 반환하고, 테스트가 끝나면 서버를 종료
+    """
+
+    servers = list()
+
+    def start(handler) -> StubServer:
+        server = StubServer(handler)
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture(autouse=True)
+def stage_log(monkeypatch):
+    """
+    테스트마다 전역 단계 측정 객체의 기록 경로와 누적 결과를 초기화하고, 테스트가 끝나면 원래대로 되돌림
+    """
+
+    monkeypatch.delenv('STAGE_LOG_PATH', raising=False)
+    monkeypatch.setattr(timer, 'log_path', str())
+    monkeypatch.setattr(timer, 'stages', dict())
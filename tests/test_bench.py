@@ -0,0 +1,58 @@
+import json
+import os
+import bench
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'gm_service_data.json')
+
+
+def load_source() -> dict:
+    with open(DATA_PATH, 'r', encoding='UTF-8') as f:
+        return json.load(f)
+
+
+def test_synthetic_data_has_requested_size_and_source_fields():
+    source = load_source()
+    service_data = bench.make_service_data(source, 250, seed=1)
+    places = service_data['places']
+
+    assert len(places) == 250 and service_data['errors'] == dict()
+    assert sorted(place['id'] for place in places.values()) == sorted(str(i) for i in range(250))
+    assert bench.make_service_data(source, 250, seed=1) == service_data
+    assert bench.make_service_data(source, 250, seed=2) != service_data
+
+    source_places = list(source['places'].values())
+    for name, place in places.items():
+        base = source['places'][name.rsplit(' ', 1)[0]]
+        assert (place['menu'], place['menu_token']) in [(p['menu'], p['menu_token']) for p in source_places]
+        assert (place['review'], place['review_sentiment']) in [(p['review'], p['review_sentiment']) for p in source_places]
+        for axis in ['x', 'y']:
+            if base.get(axis):
+                assert abs(float(place[axis]) - float(base[axis])) <= 0.01
+
+
+def test_run_size_measures_every_stage_without_errors():
+    results = bench.run_size(load_source(), 60, display=5)
+
+    stages = [result['stage'] for result in results]
+    assert stages[:5] == ['load', 'dict_to_df', 'update_dataframe', 'make_similar_index', 'make_search_index']
+    assert stages[5:] == ['advanced_search'] * len(bench.SEARCH_TARGETS) * 2
+    assert all(result['size'] == 60 and result['error'] is None for result in results)
+    assert all(result['seconds'] >= 0 and result['peak_bytes'] > 0 for result in results)
+
+
+def test_compare_reports_only_increases_over_tolerance(tmp_path):
+    baseline = [{'size': 10, 'stage': 'load', 'seconds': 1.0, 'peak_bytes': 10<<20},
+                {'size': 10, 'stage': 'advanced_search', 'target': '메뉴 검색', 'exact': False,
+                 'seconds': 0.001, 'peak_bytes': 1000}]
+    path = tmp_path/'baseline.json'
+    path.write_text(json.dumps({'results': baseline}), encoding='UTF-8')
+
+    results = [{'size': 10, 'stage': 'load', 'seconds': 1.5, 'peak_bytes': 11<<20},
+               {'size': 10, 'stage': 'advanced_search', 'target': '메뉴 검색', 'exact': False,
+                'seconds': 0.005, 'peak_bytes': 5000}, # 최소 변화량보다 작은 증가는 측정 오차
+               {'size': 100, 'stage': 'load', 'seconds': 9.0, 'peak_bytes': 1}]
+
+    regressions = bench.compare(results, str(path), tolerance=0.2)
+
+    assert [(regression['stage'], regression['metric'], regression['baseline']) for regression in regressions] == \
+        [('load', 'seconds', 1.0)]
@@ -0,0 +1,66 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from data import KakaoPlaceData
+from index import BM25Index
+
+WEIGHTS = {'분류명 토큰화': 0.5, '메뉴 토큰화': 1.0, '리뷰 토큰화': 0.5}
+
+QUERIES = [(['냉면'], True), (['냉면'], False), (['국밥', '맛있'], False), (['파스타'], True), (['없는단어'], False)]
+
+
+def make_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        '분류명 토큰화': ['한식 냉면', '한식 국밥', '양식', '한식', None],
+        '메뉴 토큰화': ['물냉면 비빔냉면', '순대국밥 국밥', '파스타 피자', '냉면 냉면 수육', '국밥'],
+        '리뷰 토큰화': ['맛있어요 냉면', '국물 맛있어요', '파스타 최고', '', '맛있어요 국밥 국밥 국밥'],
+    })
+
+
+def test_append_matches_full_fit():
+    df = make_df()
+    popularity = np.arange(len(df), dtype=float)
+
+    fitted = BM25Index(WEIGHTS).fit(df, popularity)
+    appended = BM25Index(WEIGHTS).fit(df[:2], popularity[:2])
+    appended.get_scores(['냉면']) # 가중치 행렬을 먼저 계산해도 행 추가 후 다시 계산
+    appended.append(df[2:]).set_popularity(popularity)
+
+    assert len(appended) == len(fitted) == len(df)
+    for keywords, exact in QUERIES:
+        np.testing.assert_allclose(appended.get_scores(keywords, exact), fitted.get_scores(keywords, exact))
+
+
+def test_reorder_moves_scores_with_rows():
+    df = make_df()
+    order = np.array([4, 2, 0, 3, 1])
+
+    index = BM25Index(WEIGHTS).fit(df)
+    scores = index.get_scores(['국밥'])
+    index.reorder(order)
+
+    np.testing.assert_allclose(index.get_scores(['국밥']), scores[order])
+    assert sorted(index.rank([0, 1, 2, 3, 4], ['국밥'])[:2]) == [0, 4]
+
+
+def test_update_dataframe_updates_rank_index_in_place():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'gm_service_data.json')
+    with open(path, 'r', encoding='UTF-8') as f:
+        places = json.load(f)['places']
+
+    local_info = {'si': '경기도', 'gu': '광명시', 'dong': '', 'address': ['경기 광명시 광명동']}
+    place_data = KakaoPlaceData({'places': places})
+    df = place_data.dict_to_df(places, local_info)
+    place_data.update_dataframe(df[:-10])
+
+    rank_index = place_data.rank_index
+    place_data.update_dataframe(df[-10:]) # 유사도 색인의 어휘 변화가 작아 부분적으로 갱신
+    version = place_data.version
+    place_data.update_dataframe(df[:0])
+
+    assert place_data.rank_index is rank_index
+    assert place_data.version == version
+    for keywords, exact in QUERIES:
+        np.testing.assert_allclose(rank_index.get_scores(keywords, exact),
+                                   place_data.make_rank_index().get_scores(keywords, exact))
@@ -0,0 +1,110 @@
+import json
+import os
+import pandas as pd
+import pytest
+from admin import KakaoAdmin
+from data import KakaoPlaceData
+from database import TOKEN_COLUMNS, PlaceDatabase
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'gm_service_data.json')
+
+LOCAL_INFO = {'si': '경기도', 'gu': '광명시', 'dong': '', 'address': ['경기 광명시 광명동']}
+
+QUERIES = [['냉면'], ['맛있어요'], ['국밥'], ['치킨'], ['파스타'], ['냉면', '만두'], ['맛', '친절'], ['set'], ['CHICKEN]'], ['(200g)'], ['ps)']]
+
+TARGETS = ['일반 검색', '식당명 검색', '메뉴 검색', '리뷰 검색', '전체 검색']
+
+
+@pytest.fixture(scope='module')
+def admin(tmp_path_factory):
+    with open(DATA_PATH, 'r', encoding='UTF-8') as f:
+        service_data = json.load(f)
+
+    admin = KakaoAdmin('test', '', dict(), LOCAL_INFO)
+    admin.set_service_data(service_data=service_data)
+    admin.use_api = False # 검색 결과가 없어도 카카오 API를 요청하지 않음
+    admin.set_database(str(tmp_path_factory.mktemp('db')/'places.db'))
+    return admin
+
+
+def get_names(admin: KakaoAdmin, database, keywords: list, target: str, exact: bool) -> list:
+    admin.database = database
+    try:
+        return admin.get_records(admin.find_ids(keywords, target, 30, exact))['식당명'].tolist()
+    except Exception as e:
+        return str(e)
+
+
+@pytest.mark.parametrize('target', TARGETS)
+@pytest.mark.parametrize('exact', [False, True])
+def test_database_returns_same_places_as_dataframe(admin, target, exact):
+    database = admin.database
+
+    try:
+        for keywords in QUERIES:
+            assert get_names(admin, None, keywords, target, exact) == \
+                   get_names(admin, database, keywords, target, exact), (keywords, target, exact)
+    finally:
+        admin.database = database
+
+
+def test_database_matches_whitespace_tokens_without_folding_case(admin):
+    database, place_data = admin.database, admin.service_data
+    df = place_data.get_dataframe()
+    names = df['식당명'].tolist()
+
+    for column, keywords, exact in [('리뷰', ['맛있어요'], True), ('메뉴', ['냉면'], True),
+                                     ('메뉴', ['set'], True), ('메뉴', ['CHICKEN]'], True), ('메뉴', ['ps)'], False)]:
+        row_ids = place_data.search_rows(column, keywords, exact)
+        assert row_ids
+        place_ids = database.search(column, keywords, exact, len(df))
+        assert database.get_frame(place_ids)['식당명'].tolist() == [names[row_id] for row_id in row_ids]
+
+
+@pytest.fixture
+def database(admin, tmp_path) -> PlaceDatabase:
+    database = PlaceDatabase(str(tmp_path/'places.db'), KakaoPlaceData.rank_weights)
+    database.import_data(admin.service_data)
+    return database
+
+
+@pytest.mark.parametrize('keyword', ['냉', '냉면', '물냉면', 'et', 'Set', '(200g)', '점'])
+def test_substring_index_finds_same_terms_and_names_as_instr(database, keyword):
+    for column in ['menu', 'review']:
+        vocab = [term for term, in database.conn.execute('SELECT term FROM vocab WHERE col = ?', (column,))]
+        assert sorted(database.match_terms(column, keyword)) == sorted(term for term in vocab if keyword in term)
+
+    names = dict(database.conn.execute('SELECT id, name FROM places'))
+    place_ids = database.search_name([keyword], False, len(names))
+    assert sorted(place_ids) == sorted(place_id for place_id, name in names.items() if keyword in name)
+
+
+def test_counts_and_neighbors_follow_upserts(admin, database):
+    df = admin.service_data.get_dataframe()
+    changed = df.iloc[:1].assign(**{'리뷰 토큰화': '맛있다 맛있다 친절하다'})
+    added = df.iloc[1:2].assign(식당명='새로운 맛집')
+    place_ids = database.upsert_places(pd.concat([changed, added]))
+
+    assert database.count() == database.conn.execute('SELECT COUNT(*) FROM places').fetchone()[0] == len(df) + 1
+    for column in TOKEN_COLUMNS:
+        assert database.get_meta(f'length:{column}') == \
+               database.conn.execute('SELECT SUM(length) FROM lengths WHERE col = ?', (column,)).fetchone()[0]
+
+    # 추가된 맛집은 같은 토큰을 가진 원래 맛집을 가장 유사한 맛집으로 가짐
+    neighbors = database.get_neighbors(place_ids[1])
+    assert 0 < len(neighbors) <= database.neighbor_k
+    assert neighbors[0] == database.get_ids([df['식당명'].iloc[1]])[0]
+    assert place_ids[1] not in neighbors
+
+
+def test_database_without_substring_index_is_rebuilt_on_open(admin, database):
+    expected = database.search('메뉴', ['냉면'], False, 30), database.search_name(['국밥'], False, 30)
+
+    with database.conn:
+        for table in ['vocab_fts', 'vocab_grams', 'name_fts', 'name_grams']:
+            database.conn.execute(f'DROP TABLE {table}')
+        database.conn.execute("DELETE FROM meta WHERE key != 'version'")
+
+    reopened = PlaceDatabase(database.path, KakaoPlaceData.rank_weights)
+    assert reopened.count() == len(admin.service_data.get_dataframe())
+    assert (reopened.search('메뉴', ['냉면'], False, 30), reopened.search_name(['국밥'], False, 30)) == expected
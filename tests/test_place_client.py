@@ -0,0 +1,148 @@
+import json
+import os
+import pytest
+from client import KakaoPlaceClient
+from data import KakaoPlaceData
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'kakao_place')
+
+PLACE_URL = 'http://place.map.kakao.com/12345'
+
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURE_DIR, name+'.json'), 'r', encoding='UTF-8') as f:
+        return json.load(f)
+
+
+def serve_fixtures(method: str, path: str, query: dict, body: str) -> tuple:
+    """
+    /main/v/{id}와 /commentlist/v/{id}/{마지막 리뷰 id} 요청에 저장된 응답을 반환하는 스텁 서버 핸들러
+    """
+
+    parts = path.strip('/').split('/')
+    name = '_'.join([parts[0]] + parts[2:])
+    if os.path.exists(os.path.join(FIXTURE_DIR, name+'.json')):
+        return 200, dict(), load_fixture(name)
+    return 404, dict(), {'error': path}
+
+
+class FakeElement:
+
+    def __init__(self, text='', children=dict(), style='', on_click=None):
+        self.text = text
+        self.children = children
+        self.style = style
+        self.on_click = on_click
+
+    def find_elements_by_class_name(self, name: str) -> list:
+        return list(self.children.get(name.strip(), list()))
+
+    def find_element_by_class_name(self, name: str) -> 'FakeElement':
+        elements = self.find_elements_by_class_name(name)
+        if not elements:
+            raise Exception(f'{name} 요소가 없습니다.')
+        return elements[0]
+
+    find_elements_by_xpath = find_elements_by_class_name
+    find_element_by_tag_name = find_element_by_class_name
+
+    def get_attribute(self, name: str) -> str:
+        return self.style
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def click(self):
+        self.on_click()
+
+
+class FakeDriver:
+    """
+    맛집 페이지 응답과 같은 데이터를 브라우저가 그린 요소처럼 제공하는 Selenium 드라이버 대역 (리뷰는 페이지당 5개)
+    """
+
+    def __init__(self, main: dict, comment_pages: list):
+        basic_info = main['basicInfo']
+        feedback = basic_info['feedback']
+        comments = [item['contents'] for page in [main['comment']] + comment_pages for item in page['list']]
+
+        self.title = basic_info['placenamefull']
+        self.pages = [comments[i:i+5] for i in range(0, len(comments), 5)]
+        self.page = 0
+        self.elements = {
+            'bg_present': [FakeElement(style=f'background-image: url("{basic_info["mainphotourl"][len("https:"):]}");')],
+            'inner_place': [FakeElement(children={'link_evaluation': [FakeElement(children={
+                'span': [FakeElement(f'{round(feedback["scoresum"] / feedback["scorecnt"], 1)}')]})]})],
+            'total_evaluation': [FakeElement(children={'span': [FakeElement(str(feedback['comntcnt']))]})],
+            'cont_review': [FakeElement(children={'num_g': [FakeElement(str(feedback['blogrvwcnt']))]})],
+            'list_menu': [FakeElement(children={'loss_word': [FakeElement(menu['menu'])
+                                                              for menu in main['menuInfo']['menuList']]})],
+        }
+
+    def get(self, url: str):
+        self.page = 0
+
+    def find_elements_by_class_name(self, name: str) -> list:
+        if name == 'evaluation_review':
+            buttons = {f'div/a[{i}]': [FakeElement(on_click=self.next_page)] for i in range(1, 7)}
+            return [FakeElement(children={'txt_comment': [FakeElement(text) for text in self.pages[self.page]],
+                                          **buttons})]
+        return self.elements.get(name, list())
+
+    def find_element_by_class_name(self, name: str) -> FakeElement:
+        return FakeElement(children={name: self.find_elements_by_class_name(name)}).find_element_by_class_name(name)
+
+    def next_page(self):
+        self.page += 1
+
+
+def make_client(url: str) -> KakaoPlaceClient:
+    return KakaoPlaceClient({'urls': {'kakao_place': url}, 'keys': dict()}, backoff=0)
+
+
+def test_refresh_reuses_main_response_for_new_reviews(stub_server):
+    main = {'basicInfo': {'mainphotourl': '', 'feedback': {'scoresum': 9, 'scorecnt': 2, 'comntcnt': 4, 'blogrvwcnt': 1}},
+            'menuInfo': {'menuList': [{'menu': '물냉면'}]},
+            'comment': {'hasNext': True, 'list': [{'commentid': 2, 'contents': '새 리뷰'}]}}
+    comments = {'comment': {'hasNext': False, 'list': [{'commentid': 1, 'contents': '저장된 리뷰'}]}}
+    server = stub_server(lambda method, path, query, body: (200, dict(), main if path.startswith('/main') else comments))
+
+    place = {'place_url': PLACE_URL}
+    stored = {'place_url': PLACE_URL, 'review_num': 3, 'blog_num': 1,
+              'review': ['저장된 리뷰'], 'review_sentiment': ['positive']}
+    new_reviews, sentiments = KakaoPlaceData().request_delta(None, place, stored, place_client=make_client(server.url))
+
+    assert [request['path'] for request in server.requests] == ['/main/v/12345', '/commentlist/v/12345/2']
+    assert (new_reviews, sentiments) == (['새 리뷰'], ['positive'])
+    assert place['menu'] == ['물냉면'] and place['review'] == ['새 리뷰', '저장된 리뷰'] and place['raiting'] == 4.5
+
+
+def test_request_details_reads_place_page_fields(stub_server):
+    server = stub_server(serve_fixtures)
+    details = make_client(server.url).request_details(PLACE_URL)
+
+    assert [request['path'] for request in server.requests] == ['/main/v/12345', '/commentlist/v/12345/7019']
+    assert details == {
+        'bg_image': load_fixture('main_12345')['basicInfo']['mainphotourl'],
+        'raiting': 4.4,
+        'review_num': 7,
+        'blog_num': 12,
+        'menu': ['평양냉면', '비빔냉면', '접시만두'],
+        'review': ['육수가 깔끔하고 면이 쫄깃해요', '만두도 맛있어요', '웨이팅이 길지만 기다릴 만해요',
+                   '슴슴한 평양냉면 좋아하시면 추천', '제 입맛에는 조금 싱거웠어요', '주차가 불편해요'],
+    }
+
+
+def test_http_fetcher_returns_same_place_as_selenium(stub_server):
+    server = stub_server(serve_fixtures)
+    driver = FakeDriver(load_fixture('main_12345'), [load_fixture('commentlist_12345_7019')['comment']])
+
+    assert make_client(server.url).request_details(PLACE_URL) == KakaoPlaceData().request_details(driver, PLACE_URL)
+    assert driver.page == 1 # 리뷰 7개를 두 페이지로 나누어 수집
+
+
+def test_blocked_place_page_raises(stub_server):
+    server = stub_server(lambda method, path, query, body: (403, dict(), {'error': 'forbidden'}))
+
+    with pytest.raises(Exception):
+        make_client(server.url).request_details(PLACE_URL)
@@ -0,0 +1,48 @@
+import json
+from admin import KakaoAdmin
+from data import KakaoPlaceData
+from profiler import timer
+from test_region_admin import admin, make_new_place
+
+
+def read_log(path) -> list:
+    with open(path, 'r', encoding='UTF-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_stage_timer_writes_one_json_line_per_stage(tmp_path):
+    path = tmp_path/'log'/'stages.jsonl'
+    timer.set_log_path(str(path))
+
+    with timer.stage('search_name', keywords=['냉면']):
+        pass
+    timer.add('page_wait', 0.5, count=3)
+
+    records = read_log(path)
+    assert [(record['stage'], record['count']) for record in records] == [('search_name', 1), ('page_wait', 3)]
+    assert records[0]['keywords'] == ['냉면'] and records[1]['seconds'] == 0.5
+    assert {stage['stage']: stage['count'] for stage in timer.get_summary()} == {'search_name': 1, 'page_wait': 3}
+
+
+def test_stage_log_path_can_be_changed_or_disabled_by_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv('STAGE_LOG_PATH', str(tmp_path/'env.jsonl'))
+    timer.set_log_path('log/stage_timing.jsonl')
+    assert timer.log_path == str(tmp_path/'env.jsonl')
+
+    monkeypatch.setenv('STAGE_LOG_PATH', '')
+    timer.set_log_path('log/stage_timing.jsonl')
+    with timer.stage('search_name'):
+        pass
+    assert not (tmp_path/'log').exists()
+
+
+def test_region_admin_logs_search_stages_by_default(admin, monkeypatch):
+    monkeypatch.setattr(KakaoAdmin, 'request_places',
+                        staticmethod(lambda *args: KakaoPlaceData({'places': make_new_place('새로운 맛집', '쿼카버거')})))
+
+    admin.advanced_search(['냉면'], '메뉴 검색', 5)
+    admin.advanced_search(['쿼카버거'], '메뉴 검색', 5)
+
+    stages = [record['stage'] for record in read_log('log/stage_timing.jsonl')]
+    for stage in ['load_shard', 'search_region', 'search_by_row:메뉴', 'federated_search']:
+        assert stage in stages
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+from admin import KakaoAdmin
+from index import QueryCache
+
+
+def make_admin(version=1) -> KakaoAdmin:
+    admin = KakaoAdmin('test', '', dict())
+    admin.service_data = SimpleNamespace(version=version)
+    return admin
+
+
+def test_search_ids_caches_result_when_data_is_unchanged():
+    admin = make_admin()
+    calls = list()
+
+    def find_ids(keywords, target, display, exact):
+        calls.append(keywords)
+        return [3, 1, 2]
+
+    admin.find_ids = find_ids
+
+    assert admin.search_ids(['냉면'], '메뉴 검색', 3) == [3, 1, 2]
+    assert admin.search_ids(['냉면'], '메뉴 검색', 3) == [3, 1, 2]
+    assert len(calls) == 1
+
+
+def test_search_ids_skips_cache_when_data_changes_during_search():
+    admin = make_admin()
+    calls = list()
+
+    def find_ids(keywords, target, display, exact):
+        # 검색 결과가 없어 카카오 API로 새로운 맛집을 추가한 경우처럼 검색 도중 데이터 버전이 바뀜
+        calls.append(keywords)
+        admin.service_data.version += 1
+        return [0]
+
+    admin.find_ids = find_ids
+    admin.search_ids(['새로운 맛집'], '일반 검색', 1)
+
+    assert admin.query_cache.get_stats()['entries'] == 0
+    assert admin.query_cache.get(admin.query_cache.get_key(['새로운 맛집'], '일반 검색', False, 1), 1) is None
+
+    admin.find_ids = lambda keywords, target, display, exact: calls.append(keywords) or [0]
+    admin.search_ids(['새로운 맛집'], '일반 검색', 1)
+
+    assert len(calls) == 2
+
+
+def test_query_cache_drops_results_of_previous_version():
+    cache = QueryCache()
+    key = cache.get_key(['국밥'], '메뉴 검색', False, 10)
+
+    assert cache.get(key, 1) is None
+    cache.put(key, 1, [1, 2])
+    assert cache.get(key, 1) == [1, 2]
+    assert cache.get(key, 2) is None
+
+    cache.put(key, 1, [1, 2]) # 이전 버전의 결과는 저장하지 않음
+    assert cache.get(key, 2) is None
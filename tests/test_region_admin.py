@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import threading
+import pytest
+from admin import KakaoAdmin, RegionAdmin
+from data import KakaoPlaceData
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+REGIONS = {
+    '광명': {'local_info': {'si': '경기도', 'gu': '광명시', 'dong': '', 'address': ['경기 광명시 광명동']},
+             'data_path': 'gm_service_data.json'},
+    '삼성동': {'local_info': {'si': '서울특별시', 'gu': '강남구', 'dong': '삼성동', 'address': ['서울 강남구 삼성동']},
+              'data_path': 'service_data.json'},
+}
+
+
+@pytest.fixture
+def admin(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # 캐시 파일과 갱신된 서비스 데이터는 임시 폴더에 저장
+    (tmp_path/'log').mkdir()
+
+    regions = dict()
+    for region, region_info in REGIONS.items():
+        shutil.copy(os.path.join(DATA_DIR, region_info['data_path']), tmp_path)
+        regions[region] = {'local_info': region_info['local_info'], 'data_path': region_info['data_path']}
+
+    return RegionAdmin('test', '', dict(), regions)
+
+
+def make_new_place(name: str, menu: str) -> dict:
+    with open(os.path.join(DATA_DIR, 'service_data.json'), 'r', encoding='UTF-8') as f:
+        place = next(iter(json.load(f)['places'].values()))
+
+    place = dict(place, menu=[menu], menu_token=menu)
+    place['place_url'] = place['place_url'] + '0'
+    return {name: place}
+
+
+def test_search_requests_api_once_and_adds_place_to_its_region(admin, monkeypatch):
+    calls = list()
+
+    def request_places(service_info, local_info, keyword):
+        calls.append((keyword, local_info['address']))
+        return KakaoPlaceData({'places': make_new_place('새로운 맛집', '쿼카버거')})
+
+    monkeypatch.setattr(KakaoAdmin, 'request_places', staticmethod(request_places))
+
+    place_ids = admin.search_ids(['쿼카버거'], '메뉴 검색', 5)
+
+    assert calls == [('쿼카버거', [''])]
+    assert [region for region, _ in place_ids] == ['삼성동']
+    assert admin.get_records(place_ids)['식당명'].tolist() == ['새로운 맛집']
+    assert all(not shard.use_api for shard in admin.shards.values())
+
+    # 추가된 맛집은 지역 데이터 파일에 저장되어 다시 요청하지 않고 검색됨
+    df = admin.advanced_search(['쿼카버거'], '메뉴 검색', 5)
+    assert df[['지역','식당명']].values.tolist()[0] == ['삼성동', '새로운 맛집']
+    assert len(calls) == 1
+
+
+def test_search_does_not_request_api_when_any_region_has_a_match(admin, monkeypatch):
+    monkeypatch.setattr(KakaoAdmin, 'request_places', staticmethod(lambda *args: pytest.fail('API 요청')))
+
+    # 식당명에는 없지만 다른 열에 있는 키워드는 API를 요청하지 않고 결과 없음으로 처리
+    with pytest.raises(Exception, match='검색 결과가 없어요'):
+        admin.search_ids(['냉면'], '식당명 검색', 5, exact=True)
+
+
+def test_search_raises_when_api_finds_no_place_in_searched_regions(admin, monkeypatch):
+    monkeypatch.setattr(KakaoAdmin, 'request_places',
+                        staticmethod(lambda *args: KakaoPlaceData({'places': dict()})))
+
+    with pytest.raises(Exception, match='검색 결과가 없어요'):
+        admin.search_ids(['쿼카버거'], '메뉴 검색', 5, regions='광명')
+
+
+def test_search_waits_for_places_being_added_to_a_shared_region(admin, monkeypatch):
+    monkeypatch.setattr(KakaoAdmin, 'request_places', staticmethod(lambda *args: pytest.fail('API 요청')))
+    shard = admin.get_shard('삼성동')
+    places = make_new_place('새로운 맛집', '쿼카버거')
+    result_df = shard.service_data.dict_to_df(places, shard.local_info)
+
+    started, release = threading.Event(), threading.Event()
+    data_class = type(shard.service_data)
+    update_dataframe = data_class.update_dataframe
+
+    def blocked_update(self, df):
+        started.set()
+        release.wait(5)
+        update_dataframe(self, df)
+
+    # 인스턴스는 백그라운드에서 pickle로 저장되므로 클래스의 메소드를 대신함
+    monkeypatch.setattr(data_class, 'update_dataframe', blocked_update)
+
+    writer = threading.Thread(target=shard.add_places, args=({'places': places}, result_df))
+    writer.start()
+    assert started.wait(5)
+
+    results = list()
+    reader = threading.Thread(target=lambda: results.append(admin.advanced_search(['쿼카버거'], '메뉴 검색', 5)))
+    reader.start()
+    reader.join(0.2)
+    assert reader.is_alive() # 색인을 갱신하는 동안에는 검색이 기다림
+
+    release.set()
+    writer.join(5)
+    reader.join(5)
+    assert results[0]['식당명'].tolist()[0] == '새로운 맛집'
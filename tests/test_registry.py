@@ -0,0 +1,77 @@
+import os
+import zipfile
+import pandas as pd
+import pytest
+import registry
+from data import KakaoPlaceData
+
+SAMSEONG = {'si': '서울특별시', 'gu': '강남구', 'dong': '삼성동'}
+
+GWANGMYEONG = {'si': '경기도', 'gu': '광명시', 'dong': ''}
+
+ROWS = [
+    ['1', '젠제로', '서울특별시 강남구 선릉로126길 14 (삼성동)', '영업/정상', '일반음식점'],
+    ['2', '폐업한 식당', '서울특별시 강남구 봉은사로 471 (삼성동)', '폐업', '일반음식점'],
+    ['3', '역삼 식당', '서울특별시 강남구 테헤란로 1 (역삼동)', '영업/정상', '일반음식점'],
+    ['4', '광명 냉면', '경기도 광명시 오리로 1', '영업/정상', '일반음식점'],
+    ['5', '젠제로', '서울특별시 강남구 선릉로126길 14 (삼성동)', '영업/정상', '휴게음식점'], # 다른 chunk의 중복
+    ['6', '주소 없는 식당', '', '영업/정상', '일반음식점'],
+    ['7', '맘스터치 삼성중앙점', '서울특별시 강남구 봉은사로 471, 상가동 (삼성동)', '영업/정상', '휴게음식점'],
+    ['8', '광명 국밥', '경기도 광명시 광명로 2', '폐업', '일반음식점'],
+    ['9', '', '경기도 광명시 오리로 3', '영업/정상', '일반음식점'], # 이름이 없는 행
+]
+
+
+@pytest.fixture
+def source_path(tmp_path) -> str:
+    """
+    원본과 같이 cp949로 인코딩되고 사용하지 않는 열이 포함된 인허가 음식점 파일을 생성
+    """
+
+    df = pd.DataFrame(ROWS, columns=['번호', '사업장명', '도로명전체주소', '영업상태명', '업태구분명'])
+    path = tmp_path/'registry.csv'
+    df.to_csv(path, index=False, encoding='cp949')
+
+    return str(path)
+
+
+def test_ingest_registry_splits_open_places_by_region(source_path, tmp_path):
+    output_dir = str(tmp_path/'regions')
+    paths = registry.ingest_registry(source_path, [SAMSEONG, GWANGMYEONG], output_dir, chunksize=2)
+
+    assert sorted(paths.values()) == sorted([registry.get_candidate_path(SAMSEONG, output_dir),
+                                             registry.get_candidate_path(GWANGMYEONG, output_dir)])
+    assert sorted(os.listdir(output_dir)) == sorted(os.path.basename(path) for path in paths.values())
+    assert registry.load_candidates(SAMSEONG, output_dir) == ['젠제로', '맘스터치 삼성중앙점']
+    assert registry.load_candidates(GWANGMYEONG, output_dir) == ['광명 냉면']
+    assert registry.load_candidates({'si': '부산광역시', 'gu': '', 'dong': ''}, output_dir) is None
+
+
+def test_ingest_registry_reads_zip_without_extracting(source_path, tmp_path):
+    zip_path = str(tmp_path/'registry.zip')
+    with zipfile.ZipFile(zip_path, 'w') as f:
+        f.write(source_path, 'registry.csv')
+
+    paths = registry.ingest_registry(zip_path, [SAMSEONG], str(tmp_path/'regions'))
+
+    assert pd.read_csv(paths[registry.get_region_key(SAMSEONG)])['사업장명'].tolist() == ['젠제로', '맘스터치 삼성중앙점']
+
+
+def test_region_keys_differ_for_regions_with_same_names():
+    keys = {registry.get_region_key(local_info) for local_info in
+            [SAMSEONG, GWANGMYEONG, {'si': '서울특별시', 'gu': '강남구', 'dong': ''}, {'si': '서울특별시', 'gu': '강남구삼성동', 'dong': ''}]}
+
+    assert len(keys) == 4
+    assert registry.get_region_key(SAMSEONG).startswith('서울특별시_강남구_삼성동_')
+
+
+def test_make_place_list_uses_region_candidates_before_preprocessed_file(source_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    pd.DataFrame({'사업장명': ['전처리된 식당'], '도로명전체주소': ['']}).to_csv('data/rest.csv', index=False)
+    registry.ingest_registry(source_path, [GWANGMYEONG])
+
+    place_data = KakaoPlaceData()
+
+    assert place_data.make_place_list(dict(GWANGMYEONG, address=['경기 광명시'])) == ['광명 냉면']
+    assert place_data.make_place_list(SAMSEONG) == ['전처리된 식당']
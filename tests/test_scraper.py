@@ -0,0 +1,255 @@
+import json
+import shutil
+import threading
+import time
+import pytest
+import scraper
+from data import KakaoPlaceData
+from profiler import timer
+from scraper import AdaptiveRateLimiter, Checkpoint, DriverPool, RateLimiter, wait_until
+from test_place_client import FakeDriver as PlaceDriver
+from test_place_client import PLACE_URL, load_fixture, make_client, serve_fixtures
+
+
+class FakeDriver:
+
+    def __init__(self, number: int):
+        self.number = number
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+class FakePool(DriverPool):
+    """
+    크롬 드라이버 대신 생성 및 종료 여부만 기록하는 드라이버를 사용하는 테스트용 작업자 풀
+    """
+
+    def __init__(self, workers=1, fail_make=False):
+        super().__init__(workers)
+        self.fail_make = fail_make
+        self.drivers = list()
+        self.lock = threading.Lock()
+
+    def prepare(self):
+        pass
+
+    def make_driver(self) -> FakeDriver:
+        if self.fail_make:
+            raise RuntimeError('driver')
+        with self.lock:
+            driver = FakeDriver(len(self.drivers))
+            self.drivers.append(driver)
+        return driver
+
+
+def test_driver_pool_reuses_driver_per_worker():
+    pool = FakePool(workers=2)
+    done = list()
+
+    def work(driver, item):
+        time.sleep(0.01) # 두 작업자가 모두 작업을 가져가도록 대기
+        done.append((driver.number, item))
+
+    pool.run(list(range(10)), work)
+
+    assert sorted(item for _, item in done) == list(range(10))
+    assert len(pool.drivers) == 2
+    assert all(driver.closed for driver in pool.drivers)
+
+
+def test_driver_pool_retires_driver_after_error():
+    pool = FakePool(workers=1)
+    done = list()
+
+    def work(driver, item):
+        if item == 2:
+            raise RuntimeError('blocked')
+        done.append((driver.number, item))
+
+    pool.run(list(range(5)), work)
+
+    assert done == [(0, 0), (0, 1), (1, 3), (1, 4)]
+    assert len(pool.drivers) == 2
+    assert all(driver.closed for driver in pool.drivers)
+
+
+def test_driver_pool_raises_when_driver_cannot_start():
+    pool = FakePool(workers=2, fail_make=True)
+
+    with pytest.raises(RuntimeError, match='driver'):
+        pool.run(list(range(3)), lambda driver, item: None)
+
+
+def test_checkpoint_resumes_from_truncated_file(tmp_path):
+    path = tmp_path/'checkpoint.jsonl'
+    records = [{'name': name, 'place': {'place_url': f'http://place.map.kakao.com/{i}'}}
+               for i, name in enumerate(['가게1', '가게2'])]
+    lines = [json.dumps(record, ensure_ascii=False) for record in records]
+    path.write_text('\n'.join(lines)+'\n'+lines[0][:15], encoding='UTF-8') # 기록 중 비정상 종료
+
+    checkpoint = Checkpoint(str(path))
+    assert list(checkpoint.places) == ['가게1', '가게2']
+
+    checkpoint.write_place('가게3', {'place_url': 'http://place.map.kakao.com/3'})
+    checkpoint.write_error('가게4', {'place_url': 'http://place.map.kakao.com/4', 'log': {'error': 'blocked'}})
+    checkpoint.write_error('가게1', {'place_url': 'http://place.map.kakao.com/0', 'log': {'error': 'blocked'}})
+
+    resumed = Checkpoint(str(path))
+    assert list(resumed.places) == ['가게1', '가게2', '가게3']
+    assert resumed.get_retry_queue() == {'가게4': {'place_url': 'http://place.map.kakao.com/4'}}
+
+
+def test_driver_pool_does_not_install_driver_without_items(monkeypatch):
+    monkeypatch.setattr(DriverPool, 'prepare', lambda self: pytest.fail('크롬 드라이버 설치'))
+
+    DriverPool(workers=2).run(list(), lambda driver, item: pytest.fail('작업 실행'))
+
+
+def make_place_page(main: dict, comment_pages: list) -> str:
+    """
+    맛집 페이지 데이터로 카카오 맛집 페이지와 같은 구조의 HTML을 생성하는 함수
+    리뷰는 페이지당 5개씩 보여주고, 페이지 버튼을 누르면 잠시 뒤 다음 페이지를 그림
+    """
+
+    basic_info = main['basicInfo']
+    feedback = basic_info['feedback']
+    comments = [item['contents'] for page in [main['comment']] + comment_pages for item in page['list']]
+    menus = ''.join([f'<li><span class="loss_word">{menu["menu"]}</span></li>' for menu in main['menuInfo']['menuList']])
+    buttons = ''.join([f'<a href="#" onclick="nextPage(); return false;">{i}</a>' for i in range(1, 7)])
+
+    return f'''<html><head><title>{basic_info["placenamefull"]}</title></head><body>
+        <div class="bg_present" style='background-image: url("{basic_info["mainphotourl"][len("https:"):]}");'></div>
+        <div class="inner_place"><a class="link_evaluation"><span>{round(feedback["scoresum"] / feedback["scorecnt"], 1)}</span></a></div>
+        <div class="total_evaluation"><span>{feedback["comntcnt"]}</span></div>
+        <div class="cont_review"><span class="num_g">{feedback["blogrvwcnt"]}</span></div>
+        <ul class="list_menu">{menus}</ul>
+        <div class="evaluation_review"><ul id="comments"></ul><div>{buttons}</div></div>
+        <script>
+            const comments = {json.dumps(comments, ensure_ascii=False)};
+            let page = 0;
+            function render() {{
+                document.getElementById('comments').innerHTML = comments.slice(page*5, page*5+5)
+                    .map(comment => '<li><p class="txt_comment ">' + comment + '</p></li>').join('');
+            }}
+            function nextPage() {{ page += 1; setTimeout(render, 100); }}
+            render();
+        </script>
+    </body></html>'''
+
+
+class CountingPool(DriverPool):
+    """
+    로컬에 설치된 크롬 드라이버로 실제 브라우저를 실행하고 생성한 드라이버 수를 기록하는 작업자 풀
+    """
+
+    def __init__(self, workers=1):
+        super().__init__(workers)
+        self.created = 0
+
+    def prepare(self):
+        self.executable_path = shutil.which('chromedriver')
+
+    def make_driver(self):
+        self.created += 1
+        return super().make_driver()
+
+
+@pytest.mark.skipif(not shutil.which('chromedriver'), reason='크롬 드라이버가 설치되어 있지 않음')
+def test_driver_pool_scrapes_place_pages_and_replaces_blocked_browser(stub_server):
+    pytest.importorskip('selenium.webdriver.chrome.service')
+    page = make_place_page(load_fixture('main_12345'), [load_fixture('commentlist_12345_7019')['comment']])
+    blocked = '<html><head><title>403 Forbidden</title></head><body>Forbidden</body></html>'
+    server = stub_server(lambda method, path, query, body:
+                         (403, {'Content-Type': 'text/html'}, blocked) if path == '/blocked'
+                         else (200, {'Content-Type': 'text/html; charset=utf-8'}, page))
+
+    urls = [server.url+'/12345', server.url+'/blocked', server.url+'/12345', server.url+'/12345']
+    results, lock = list(), threading.Lock()
+
+    def scrape(driver, url):
+        details = KakaoPlaceData().request_details(driver, url)
+        with lock:
+            results.append(details)
+
+    pool = CountingPool(workers=1)
+    pool.run(urls, scrape)
+
+    # 차단된 페이지 이후에만 브라우저를 교체하고, 나머지 페이지는 같은 브라우저에서 리뷰 페이지를 넘기며 수집
+    assert pool.created == 2
+    expected = make_client(stub_server(serve_fixtures).url).request_details(PLACE_URL)
+    assert results == [expected] * 3
+
+
+def test_wait_until_returns_first_ready_value_and_records_wait():
+    calls = list()
+
+    def condition():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise Exception('요소가 아직 없음')
+        return len(calls) >= 3 and 'ready'
+
+    assert wait_until(condition, timeout=1, interval=0.01) == 'ready'
+    assert len(calls) == 3
+
+    with pytest.raises(Exception, match='시간 초과'):
+        wait_until(lambda: False, timeout=0.05, interval=0.01, message='시간 초과')
+    assert timer.stages['page_wait']['count'] == 2
+
+
+def test_rate_limiter_spaces_consecutive_requests(monkeypatch):
+    sleeps = list()
+    monkeypatch.setattr(scraper.time, 'sleep', sleeps.append)
+
+    limiter = RateLimiter(rate=10)
+    for _ in range(4):
+        limiter.wait()
+
+    assert len(sleeps) == 3
+    assert sleeps == pytest.approx([0.1, 0.2, 0.3], abs=0.02)
+
+
+def test_adaptive_rate_limiter_slows_down_on_block_and_recovers(monkeypatch):
+    sleeps = list()
+    monkeypatch.setattr(scraper.time, 'sleep', sleeps.append)
+    limiter = AdaptiveRateLimiter(rate=4, min_rate=1, increase=0.5, cooldown=5)
+
+    limiter.report_block()
+    assert limiter.rate == 2 and limiter.interval == 0.5
+    limiter.wait() # 차단 이후에는 cooldown초 동안 모든 요청을 멈춤
+    assert sleeps[-1] == pytest.approx(5, abs=0.1)
+
+    for _ in range(3):
+        limiter.report_block()
+    assert limiter.rate == 1 # min_rate 아래로는 줄이지 않음
+
+    for _ in range(10):
+        limiter.report_success()
+    assert limiter.rate == 4 # 처음 지정한 rate까지만 회복
+    assert limiter.get_stats() == {'rate': 4, 'successes': 10, 'blocks': 4}
+
+
+class BlockedDriver:
+
+    title = '403 Forbidden'
+
+    def find_elements_by_class_name(self, name: str) -> list:
+        return list()
+
+    def find_element_by_tag_name(self, name: str):
+        return type('Body', (), {'text': 'Forbidden'})()
+
+
+def test_wait_for_page_reports_ready_and_blocked_pages():
+    limiter = AdaptiveRateLimiter(rate=4, cooldown=0)
+    place_data = KakaoPlaceData()
+
+    place_data.wait_for_page(PlaceDriver(load_fixture('main_12345'), list()), limiter)
+    assert limiter.get_stats() == {'rate': 4, 'successes': 1, 'blocks': 0}
+
+    with pytest.raises(Exception, match='blocked'):
+        place_data.wait_for_page(BlockedDriver(), limiter)
+    assert limiter.get_stats() == {'rate': 2, 'successes': 1, 'blocks': 1}
+    assert timer.stages['page_wait']['seconds'] < 1 # 차단 페이지는 시간 초과를 기다리지 않음
@@ -0,0 +1,98 @@
+import threading
+import time
+import pytest
+import requests
+from client import KakaoSearchClient
+
+
+def make_client(url: str, **kwargs) -> KakaoSearchClient:
+    service_info = {'urls': {'kakao_search': url+'/v2/local/search/keyword.json'},
+                    'keys': {'kakao_rest': 'rest-key'}}
+    return KakaoSearchClient(service_info, backoff=0, **kwargs)
+
+
+def make_page(query: str, page: int, last_page: int) -> dict:
+    documents = [{'place_name': f'{query} {page}-{i}'} for i in range(2)]
+    return {'documents': documents, 'meta': {'is_end': page >= last_page}}
+
+
+def test_search_requests_pages_until_last_page(stub_server):
+    server = stub_server(lambda method, path, query, body:
+                         (200, dict(), make_page(query['query'], int(query['page']), 3)))
+    client = make_client(server.url, max_pages=5)
+
+    documents = client.search('치킨')
+
+    assert [document['place_name'] for document in documents] == \
+        [f'치킨 {page}-{i}' for page in range(1, 4) for i in range(2)]
+    assert [request['query']['page'] for request in server.requests] == ['1', '2', '3']
+    assert server.requests[0]['headers']['Authorization'] == 'KakaoAK rest-key'
+
+
+def test_search_stops_at_max_pages(stub_server):
+    server = stub_server(lambda method, path, query, body:
+                         (200, dict(), make_page(query['query'], int(query['page']), 10)))
+    client = make_client(server.url)
+
+    assert len(client.search('치킨')) == 2
+    assert len(server.requests) == 1
+
+
+def test_search_retries_after_rate_limit(stub_server):
+    lock = threading.Lock()
+    responses = [(429, {'Retry-After': '0'}, {'errorType': 'RequestThrottled'}),
+                 (503, dict(), {'errorType': 'ServiceUnavailable'})]
+
+    def handler(method, path, query, body):
+        with lock:
+            if responses:
+                return responses.pop(0)
+        return 200, dict(), make_page(query['query'], 1, 1)
+
+    server = stub_server(handler)
+    client = make_client(server.url)
+
+    assert len(client.search('치킨')) == 2
+    assert len(server.requests) == 3
+
+
+def test_search_all_requests_each_query_once(stub_server):
+    server = stub_server(lambda method, path, query, body:
+                         (200, dict(), make_page(query['query'], 1, 1)))
+    client = make_client(server.url, workers=2)
+
+    results = client.search_all(['치킨', '피자', '치킨', '족발'])
+
+    assert list(results) == ['치킨', '피자', '족발']
+    assert sorted(request['query']['query'] for request in server.requests) == ['족발', '치킨', '피자']
+
+    # 캐시된 검색어는 다시 요청하지 않고, 반환된 결과를 수정해도 캐시에 영향이 없음
+    results['치킨'][0]['place_name'] = str()
+    assert client.search('치킨')[0]['place_name'] == '치킨 1-0'
+    assert len(server.requests) == 3
+
+
+def test_search_retries_timeouts(stub_server):
+    delays = [0.5]
+
+    def handler(method, path, query, body):
+        if delays:
+            time.sleep(delays.pop()) # 첫 요청은 클라이언트의 제한 시간보다 늦게 응답
+        return 200, dict(), make_page(query['query'], 1, 1)
+
+    server = stub_server(handler)
+    client = make_client(server.url, timeout=0.2)
+
+    assert len(client.search('치킨')) == 2
+    assert len(server.requests) == 2
+
+
+def test_connection_errors_are_retried_with_backoff_then_raised(monkeypatch):
+    sleeps = list()
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    client = KakaoSearchClient({'urls': {'kakao_search': 'http://127.0.0.1:1/search'}, 'keys': {'kakao_rest': ''}},
+                               retries=3, backoff=0.5)
+
+    with pytest.raises(requests.ConnectionError):
+        client.search('치킨')
+    assert sleeps == [0.5, 1.0, 2.0]
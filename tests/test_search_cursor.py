@@ -0,0 +1,87 @@
+import pandas as pd
+from admin import SearchCursor
+from test_search_results import admin
+
+
+class FakeAdmin:
+    """
+    행 번호 목록에서 검색 결과를 반환하고 호출 내용을 기록하는 테스트용 관리자 객체
+    """
+
+    def __init__(self, size: int):
+        self.row_ids = list(range(size))
+        self.version = 0
+        self.searches = list()
+        self.fetches = list()
+        self.on_fetch = None
+
+    def get_data_version(self) -> int:
+        return self.version
+
+    def search_ids(self, keywords, target, display, exact) -> list:
+        self.searches.append(display)
+        return self.row_ids[:display]
+
+    def get_records(self, row_ids: list) -> pd.DataFrame:
+        self.fetches.append(list(row_ids))
+        if self.on_fetch:
+            self.on_fetch()
+        return pd.DataFrame({'식당명': [f'맛집{row_id}' for row_id in row_ids]})
+
+
+def test_cursor_ranks_and_fetches_only_needed_pages():
+    fake = FakeAdmin(100)
+    cursor = SearchCursor(fake, ['냉면'], '일반 검색', False, batch_size=10)
+
+    assert cursor.get_record(0)['식당명'] == '맛집0'
+    assert cursor.get_record(1)['식당명'] == '맛집1' # 미리 생성한 페이지
+    assert fake.searches == [10]
+    assert fake.fetches == [[0, 1], [2]]
+    assert sorted(cursor.records) == [1, 2]
+
+    assert cursor.get_record(9)['식당명'] == '맛집9' # 다음 페이지가 순위 밖이면 검색 범위를 두 배로 늘림
+    assert fake.searches == [10, 20]
+    assert cursor.row_ids == list(range(20))
+
+
+def test_cursor_stops_searching_after_last_result():
+    fake = FakeAdmin(3)
+    cursor = SearchCursor(fake, ['냉면'], '일반 검색', False, batch_size=10)
+
+    assert cursor.has_page(2) and not cursor.has_page(3)
+    assert cursor.get_record(2)['식당명'] == '맛집2'
+    assert fake.searches == [10]
+
+
+def test_cursor_reranks_when_data_changes():
+    fake = FakeAdmin(20)
+    cursor = SearchCursor(fake, ['냉면'], '일반 검색', False, batch_size=10)
+    cursor.get_record(0)
+
+    fake.row_ids = list(reversed(fake.row_ids))
+    fake.version += 1
+    assert cursor.get_record(0)['식당명'] == '맛집19'
+
+    # 순위를 계산한 뒤 맛집 정보를 가져오는 사이에 데이터가 바뀌면 바뀐 순위로 다시 가져옴
+    def change_once():
+        fake.on_fetch = None
+        fake.row_ids = list(range(20))
+        fake.version += 1
+
+    fake.on_fetch = change_once
+    assert cursor.get_record(5)['식당명'] == '맛집5'
+    assert fake.fetches[-2:] == [[14, 13], [5, 6]]
+    assert sorted(cursor.records) == [5, 6]
+
+
+def test_cursor_pages_match_full_search(admin):
+    cursor = admin.search_cursor(['냉면'], '일반 검색', batch_size=4)
+    expected = admin.advanced_search(['냉면'], '일반 검색', 30)['식당명'].tolist()
+
+    names = list()
+    page = 0
+    while cursor.has_page(page) and page < 30:
+        names.append(cursor.get_record(page)['식당명'])
+        page += 1
+
+    assert names == expected
@@ -0,0 +1,57 @@
+import json
+import os
+import pandas as pd
+import pytest
+from admin import KakaoAdmin
+from index import ResultIds
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'gm_service_data.json')
+
+LOCAL_INFO = {'si': '경기도', 'gu': '광명시', 'dong': '', 'address': ['경기 광명시 광명동']}
+
+
+@pytest.fixture(scope='module')
+def admin():
+    with open(DATA_PATH, 'r', encoding='UTF-8') as f:
+        service_data = json.load(f)
+
+    admin = KakaoAdmin('test', '', dict(), LOCAL_INFO)
+    admin.set_service_data(service_data=service_data)
+    admin.use_api = False
+    return admin
+
+
+def get_expected_names(admin: KakaoAdmin, keyword: str, display: int) -> list:
+    """
+    검색 단계마다 데이터프레임을 이어붙이고 중복을 제거하는 기존 방식으로 일반 검색 결과의 식당명을 반환하는 함수
+    """
+
+    place_data = admin.service_data
+    df = place_data.get_dataframe()
+
+    result_df = pd.concat([df[df['식당명'].str.contains(keyword, regex=False)],
+                           df.iloc[place_data.search_rows('메뉴', [keyword], False)]])
+    result_df = result_df[~result_df.index.duplicated()]
+    result_df = pd.concat([result_df, df.iloc[place_data.similr_index.get_neighbors(result_df.index[0])], df])
+    result_df = result_df[~result_df.index.duplicated()]
+
+    return result_df.head(display)['식당명'].tolist()
+
+
+def test_result_ids_keep_first_order_without_duplicates():
+    result = ResultIds(4).extend([3, 1, 3]).extend([2, 1, 5, 7])
+
+    assert result.row_ids == [3, 1, 2, 5]
+    assert result.is_full() and len(result) == 4
+    assert result.extend([0]).row_ids == [3, 1, 2, 5]
+
+
+@pytest.mark.parametrize('keyword', ['냉면', '국밥', '치킨', '커피'])
+@pytest.mark.parametrize('display', [5, 30, 1000])
+def test_search_result_matches_appended_frames(admin, keyword, display):
+    df = admin.advanced_search([keyword], '일반 검색', display)
+    size = min(display, len(admin.service_data.get_dataframe()))
+
+    assert df['식당명'].tolist() == get_expected_names(admin, keyword, display)
+    assert len(df) == size and df['식당명'].is_unique
+    assert df.index.tolist() == list(range(size))
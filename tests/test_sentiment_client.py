@@ -0,0 +1,76 @@
+import json
+from client import ClovaSentimentClient
+from data import KakaoPlaceData
+
+
+def make_client(url: str, tmp_path, **kwargs) -> ClovaSentimentClient:
+    service_info = {'urls': {'naver_clova': url+'/sentiment-analysis/v1/analyze'},
+                    'keys': {'naver_clova': ('client-id', 'client-secret')}}
+    return ClovaSentimentClient(service_info, cache_path=str(tmp_path/'sentiment.json'), backoff=0, **kwargs)
+
+
+def make_response(sentiment: str) -> dict:
+    return {'document': {'sentiment': sentiment, 'confidence': {'positive': 1.0, 'negative': 0.0, 'neutral': 0.0}}}
+
+
+def test_analyze_all_requests_each_uncached_review_once(stub_server, tmp_path):
+    labels = {'맛있어요': 'positive', '별로예요': 'negative', '그냥 그래요': 'neutral'}
+    server = stub_server(lambda method, path, query, body:
+                         (200, dict(), make_response(labels[json.loads(body)['content']])))
+    client = make_client(server.url, tmp_path)
+
+    reviews = ['맛있어요', '별로예요', '맛있어요', '그냥 그래요', '별로예요']
+    assert client.analyze_all(reviews) == ['positive', 'negative', 'positive', 'neutral', 'negative']
+    assert sorted(json.loads(request['body'])['content'] for request in server.requests) == sorted(labels)
+    assert server.requests[0]['headers']['X-NCP-APIGW-API-KEY-ID'] == 'client-id'
+
+    # 캐시된 리뷰는 다시 요청하지 않고, 캐시 파일을 불러온 새로운 클라이언트도 그대로 사용
+    assert client.analyze_all(['별로예요', '맛있어요']) == ['negative', 'positive']
+    client.save_cache()
+    assert make_client(server.url, tmp_path).analyze_all(['그냥 그래요']) == ['neutral']
+    assert len(server.requests) == 3
+    assert client.get_stats() == {'hits': 2, 'misses': 5, 'hit_rate': 2/7}
+
+
+def test_analyze_retries_rate_limited_and_server_errors(stub_server, tmp_path):
+    responses = [(429, {'Retry-After': '0'}, {'error': 'rate limited'}),
+                 (503, dict(), {'error': 'unavailable'}),
+                 (200, dict(), make_response('positive'))]
+    server = stub_server(lambda method, path, query, body: responses.pop(0))
+    client = make_client(server.url, tmp_path, retries=3)
+
+    assert client.analyze_all(['친절해요']) == ['positive']
+    assert len(server.requests) == 3
+
+
+def test_failed_reviews_fall_back_to_error_and_are_not_cached(stub_server, tmp_path):
+    server = stub_server(lambda method, path, query, body: (500, dict(), {'error': 'internal'}))
+    client = make_client(server.url, tmp_path, retries=1)
+
+    assert client.analyze_all(['맛있어요', '맛있어요']) == ['error', 'error']
+    assert len(server.requests) == 2 # 처음 요청과 한 번의 재시도
+
+    assert client.analyze_all(['맛있어요']) == ['error']
+    assert len(server.requests) == 4
+    assert client.cache == dict()
+
+
+def test_connection_pool_covers_all_concurrent_callers(tmp_path):
+    client = make_client('http://127.0.0.1:1', tmp_path, workers=4, callers=3)
+    adapter = client.session.get_adapter('http://127.0.0.1:1')
+
+    assert adapter._pool_maxsize == 12
+
+
+def test_request_sentiment_without_client_persists_cache(stub_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # 기본 캐시 파일(cache/sentiment.json)은 임시 폴더에 저장
+    server = stub_server(lambda method, path, query, body: (200, dict(), make_response('positive')))
+    service_info = {'urls': {'naver_clova': server.url+'/sentiment-analysis/v1/analyze'},
+                    'keys': {'naver_clova': ('client-id', 'client-secret')}}
+
+    assert KakaoPlaceData().request_sentiment(service_info, ['맛있어요', '친절해요'])['positive'] == 2
+    assert (tmp_path/'cache'/'sentiment.json').exists()
+
+    # 다음 실행에서는 저장된 캐시를 사용하므로 다시 요청하지 않음
+    assert KakaoPlaceData().request_sentiment(service_info, ['친절해요'])['review_sentiment'] == ['positive']
+    assert len(server.requests) == 2
@@ -0,0 +1,78 @@
+import os
+import pickle
+from collections import Counter
+import pytest
+from sklearn.model_selection import train_test_split
+from data import KakaoPlaceData
+from sentiment import LocalSentimentModel, load_training_data
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+DATA_PATHS = [os.path.join(DATA_DIR, 'service_data.json'), os.path.join(DATA_DIR, 'gm_service_data.json')]
+
+
+@pytest.fixture(scope='module')
+def samples() -> tuple:
+    reviews, labels = load_training_data(DATA_PATHS)
+    return train_test_split(reviews, labels, test_size=0.2, random_state=0, stratify=labels)
+
+
+@pytest.fixture(scope='module')
+def model(samples) -> LocalSentimentModel:
+    train_reviews, _, train_labels, _ = samples
+    return LocalSentimentModel(batch_size=128).fit(train_reviews, train_labels)
+
+
+def test_training_data_has_unique_labelled_reviews():
+    reviews, labels = load_training_data(DATA_PATHS)
+
+    assert len(reviews) == len(set(reviews)) == len(labels)
+    assert set(labels) == {'positive', 'negative', 'neutral'}
+    assert all(reviews)
+
+
+def test_model_agrees_with_stored_labels_on_held_out_reviews(model, samples):
+    _, test_reviews, _, test_labels = samples
+    majority = max(Counter(test_labels).values()) / len(test_labels)
+
+    stats = model.evaluate(test_reviews, test_labels)
+
+    assert stats['reviews'] == len(test_reviews)
+    assert stats['agreement'] > max(0.75, majority + 0.2) # 다수 감정으로만 분류하는 것보다 정확
+    assert set(stats['label_agreement']) == {'positive', 'negative', 'neutral'}
+    assert all(agreement > 0.5 for agreement in stats['label_agreement'].values())
+
+
+def test_batched_predictions_match_single_batch(model, samples):
+    _, test_reviews, _, _ = samples
+    reviews = test_reviews[:300]
+
+    batched = model.predict(reviews)
+    model.batch_size = len(reviews)
+    try:
+        assert model.predict(reviews) == batched
+    finally:
+        model.batch_size = 128
+
+    assert model.analyze_all(tuple(reviews[:5])) == batched[:5] and model.analyze_all(list()) == list()
+    assert model.get_stats()['reviews'] >= 2*len(reviews)
+
+
+def test_saved_model_is_used_by_request_sentiment(model, samples, tmp_path):
+    _, test_reviews, _, _ = samples
+    path = str(tmp_path/'model'/'sentiment_model.pkl')
+    model.save(path)
+
+    place_data = KakaoPlaceData({'places': dict()})
+    client = place_data.make_sentiment_client(dict(), sentiment_model=path)
+    sentiment_dict = place_data.request_sentiment(dict(), test_reviews[:20], client)
+
+    assert isinstance(client, LocalSentimentModel)
+    assert sentiment_dict['review_sentiment'] == model.predict(test_reviews[:20])
+    assert sentiment_dict['positive'] == sentiment_dict['review_sentiment'].count('positive')
+    assert sentiment_dict['negative'] == sentiment_dict['review_sentiment'].count('negative')
+
+    with open(path, 'wb') as f:
+        pickle.dump(['not a model'], f)
+    with pytest.raises(Exception, match='감정 분류 모델'):
+        LocalSentimentModel.load(path)
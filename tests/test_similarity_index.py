@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from index import SimilarityIndex
+
+WEIGHTS = {'분류명 토큰화': 0.3, '메뉴 토큰화': 0.5, '리뷰 토큰화': 1.0}
+
+
+def make_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        '분류명 토큰화': ['한식 냉면', '한식 국밥', '양식 파스타', '한식 냉면', '양식 피자', '한식', '일식 초밥', None],
+        '메뉴 토큰화': ['물냉면 비빔냉면 수육', '순대국밥 국밥', '파스타 피자', '냉면 수육', '피자 파스타 샐러드',
+                    '국밥 수육', '초밥 우동', '우동'],
+        '리뷰 토큰화': ['육수 맛있어요', '국물 맛있어요', '파스타 최고', '육수 시원해요', '피자 최고 맛있어요',
+                    '', '초밥 신선해요', '우동 국물 맛있어요'],
+    })
+
+
+def get_dense_similarity(df: pd.DataFrame) -> np.ndarray:
+    """
+    열마다 전체 코사인 유사도 행렬을 계산해 가중합한 N×N 행렬을 반환하는 함수 (기존 방식)
+    """
+
+    similarity = np.zeros((len(df), len(df)))
+
+    for column, weight in WEIGHTS.items():
+        vectorizer = TfidfVectorizer() if column == '리뷰 토큰화' else CountVectorizer(min_df=0, ngram_range=(1,2))
+        similarity += weight * cosine_similarity(vectorizer.fit_transform(df[column].fillna('')))
+
+    return similarity
+
+
+def test_top_neighbors_match_dense_similarity():
+    df = make_df()
+    dense = get_dense_similarity(df)
+    np.fill_diagonal(dense, -np.inf)
+
+    index = SimilarityIndex(WEIGHTS, k=3, block_size=3).fit(df) # 여러 블록에 걸쳐 계산
+
+    for row_id in range(len(df)):
+        neighbors = index.get_neighbors(row_id)
+        assert row_id not in neighbors
+        np.testing.assert_allclose(index.scores[row_id], np.sort(dense[row_id])[::-1][:3])
+        np.testing.assert_allclose(dense[row_id, neighbors], index.scores[row_id])
+
+
+def test_neighbors_are_padded_when_there_are_fewer_rows_than_k():
+    index = SimilarityIndex(WEIGHTS, k=5).fit(make_df()[:3])
+
+    assert index.neighbors.shape == (3, 5)
+    assert all(len(index.get_neighbors(row_id)) == 2 for row_id in range(3))
+    assert len(SimilarityIndex(WEIGHTS, k=5).fit(make_df()[:1]).get_neighbors(0)) == 0
+
+
+def make_known_rows() -> pd.DataFrame:
+    """
+    학습한 어휘(단어 및 두 단어 묶음)만으로 이루어진 새로운 행을 생성하는 함수
+    """
+
+    return pd.DataFrame({
+        '분류명 토큰화': ['한식 국밥', '양식 파스타'],
+        '메뉴 토큰화': ['냉면 수육', '파스타 피자'],
+        '리뷰 토큰화': ['국물 맛있어요', '파스타 최고'],
+    })
+
+
+def test_append_with_known_vocabulary_matches_full_fit():
+    weights = {'분류명 토큰화': 0.3, '메뉴 토큰화': 0.5} # 단어 빈도 벡터는 어휘가 같으면 다시 학습해도 같음
+    df, new_df = make_df(), make_known_rows()
+
+    appended = SimilarityIndex(weights, k=3).fit(df)
+    assert appended.append(new_df)
+    fitted = SimilarityIndex(weights, k=3).fit(pd.concat([df, new_df], ignore_index=True))
+
+    assert len(appended) == len(fitted) == len(df) + len(new_df)
+    np.testing.assert_allclose(appended.vectors.toarray(), fitted.vectors.toarray())
+    np.testing.assert_allclose(appended.scores, fitted.scores)
+
+
+def test_append_updates_neighbors_of_existing_rows():
+    df, new_df = make_df(), make_known_rows()
+
+    index = SimilarityIndex(WEIGHTS, k=3).fit(df)
+    assert index.append(new_df)
+
+    similarity = (index.vectors @ index.vectors.T).toarray()
+    np.fill_diagonal(similarity, -np.inf)
+
+    # 기존 행의 이웃 목록에도 새로운 행이 반영되어 전체 비교 결과와 같음
+    assert any(row_id >= len(df) for row_id in index.neighbors[:len(df)].ravel())
+    for row_id in range(len(index)):
+        np.testing.assert_allclose(index.scores[row_id], np.sort(similarity[row_id])[::-1][:3])
+        np.testing.assert_allclose(similarity[row_id, index.get_neighbors(row_id)], index.scores[row_id])
+
+
+def test_append_refuses_rows_over_drift_threshold():
+    df = make_df()
+    new_df = pd.DataFrame({'분류명 토큰화': ['중식'], '메뉴 토큰화': ['짜장면 짬뽕 탕수육 마라탕 꿔바로우'],
+                           '리뷰 토큰화': ['불맛 최고']})
+
+    index = SimilarityIndex(WEIGHTS, k=3, drift_threshold=0.1).fit(df)
+    vectors, neighbors = index.vectors.copy(), index.neighbors.copy()
+
+    assert index.get_drift(index.transform(new_df)[1]) > 0.1
+    assert not index.append(new_df) # 전체 재학습이 필요하며 기존 색인은 그대로 유지
+    assert len(index) == len(df)
+    assert (index.vectors != vectors).nnz == 0
+    np.testing.assert_array_equal(index.neighbors, neighbors)
+
+    assert SimilarityIndex(WEIGHTS, k=3, drift_threshold=10.0).fit(df).append(new_df)
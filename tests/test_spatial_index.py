@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from index import EARTH_RADIUS, SpatialIndex
+from test_search_results import admin
+
+ORIGIN = (126.8645, 37.4784) # 광명시청 부근
+
+
+def get_haversine(origin: tuple, x, y) -> np.ndarray:
+    lon1, lat1 = np.radians(origin[0]), np.radians(origin[1])
+    lon2, lat2 = np.radians(np.asarray(x, dtype=float)), np.radians(np.asarray(y, dtype=float))
+    a = np.sin((lat2-lat1)/2)**2 + np.cos(lat1)*np.cos(lat2)*np.sin((lon2-lon1)/2)**2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+
+def make_points(size=500, seed=0) -> tuple:
+    rng = np.random.default_rng(seed)
+    x = ORIGIN[0] + rng.uniform(-0.05, 0.05, size)
+    y = ORIGIN[1] + rng.uniform(-0.05, 0.05, size)
+    x[::50] = np.nan # 좌표가 없는 맛집
+    return x, y
+
+
+@pytest.mark.parametrize('radius', [0, 300, 1500, 5000])
+def test_query_radius_matches_brute_force(radius):
+    x, y = make_points()
+    distances = get_haversine(ORIGIN, x, y)
+    expected = [i for i in np.argsort(distances, kind='stable') if distances[i] <= radius]
+
+    row_ids = SpatialIndex(x, y).query_radius(ORIGIN, radius)
+
+    assert row_ids == expected
+    assert not any(np.isnan(x[row_ids]))
+
+
+@pytest.mark.parametrize('k', [1, 10, 490, 1000])
+def test_query_knn_matches_brute_force(k):
+    x, y = make_points()
+    distances = get_haversine(ORIGIN, x, y)
+    expected = np.argsort(np.where(np.isnan(distances), np.inf, distances), kind='stable')[:min(k, 490)]
+
+    index = SpatialIndex(x, y)
+
+    assert len(index) == 490
+    assert index.query_knn(ORIGIN, k) == expected.tolist()
+    np.testing.assert_allclose(index.get_distances(ORIGIN, expected), distances[expected], rtol=1e-9)
+
+
+def test_empty_index_returns_no_rows():
+    index = SpatialIndex([np.nan], [np.nan])
+
+    assert index.query_radius(ORIGIN, 1000) == list() and index.query_knn(ORIGIN, 5) == list()
+    assert index.get_distances(ORIGIN).tolist() == [np.inf]
+
+
+def test_search_near_origin_sorts_keyword_results_by_distance(admin):
+    df = admin.service_data.get_dataframe().set_index('식당명')
+    get_result_distances = lambda result: get_haversine(ORIGIN, df.loc[result['식당명'], 'x'], df.loc[result['식당명'], 'y'])
+
+    within = df.index[get_haversine(ORIGIN, df['x'], df['y']) <= 2000]
+    result = admin.advanced_search(['냉면'], '메뉴 검색', len(df), origin=ORIGIN, radius=2000)
+
+    assert 0 < len(result) < len(df)
+    assert set(result['식당명']) == set(within) # 반경 제한이 있으면 연관도 순위 전체에서 거리로 선택
+    assert np.all(np.diff(get_result_distances(result)) >= 0)
+
+    top = admin.advanced_search(['냉면'], '메뉴 검색', 3)
+    result = admin.advanced_search(['냉면'], '메뉴 검색', 3, origin=ORIGIN)
+
+    assert set(result['식당명']) == set(top['식당명']) # 반경 제한이 없으면 상위 결과만 거리순으로 정렬
+    assert np.all(np.diff(get_result_distances(result)) >= 0)
@@ -0,0 +1,89 @@
+import builtins
+import json
+import os
+import pandas as pd
+import pytest
+import storage
+from admin import KakaoAdmin
+from data import KakaoPlaceData
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'gm_service_data.json')
+
+LOCAL_INFO = {'si': '경기도', 'gu': '광명시', 'dong': '', 'address': ['경기 광명시 광명동']}
+
+
+@pytest.fixture(scope='module')
+def service_df() -> pd.DataFrame:
+    with open(DATA_PATH, 'r', encoding='UTF-8') as f:
+        places = json.load(f)['places']
+
+    place_data = KakaoPlaceData({'places': places})
+    place_data.update_dataframe(place_data.dict_to_df(places, LOCAL_INFO))
+    return place_data.get_dataframe()
+
+
+def test_read_service_df_reads_selected_columns_and_keeps_lists_in_arrow(service_df, tmp_path):
+    path = str(tmp_path/'service_data.arrow')
+    storage.write_service_table(service_df, path)
+
+    df = storage.read_service_df(path, columns=['식당명', '별점', '메뉴'])
+
+    assert df.columns.tolist() == ['식당명', '별점', '메뉴']
+    assert isinstance(df['메뉴'].dtype, pd.ArrowDtype)
+    assert df['식당명'].tolist() == service_df['식당명'].tolist()
+    assert df['별점'].tolist() == service_df['별점'].tolist()
+    assert list(df['메뉴']) == [list(menu) for menu in service_df['메뉴']]
+
+
+def test_arrow_service_data_is_not_read_in_full_and_searches_like_json(service_df, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path/'service_data.arrow')
+    storage.write_service_table(service_df, path)
+
+    opened = list()
+    builtin_open = builtins.open
+
+    def open_file(file, *args, **kwargs):
+        opened.append(str(file))
+        return builtin_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, 'open', open_file)
+
+    arrow_admin = KakaoAdmin('test', '', dict(), LOCAL_INFO)
+    arrow_admin.set_service_data(data_path=path)
+    cached_admin = KakaoAdmin('test', '', dict(), LOCAL_INFO)
+    cached_admin.set_service_data(data_path=path) # 수정 시각과 크기가 같으므로 캐시 파일을 불러옴
+
+    assert path not in opened
+    assert cached_admin.get_artifact_path(path) == arrow_admin.get_artifact_path(path)
+
+    json_admin = KakaoAdmin('test', '', dict(), LOCAL_INFO)
+    json_admin.service_data = KakaoPlaceData(df=service_df)
+
+    for admin in [arrow_admin, cached_admin]:
+        for keywords, target in [(['냉면'], '메뉴 검색'), (['맛있어요'], '리뷰 검색'), (['국밥'], '전체 검색')]:
+            assert admin.advanced_search(keywords, target, 10)['식당명'].tolist() == \
+                   json_admin.advanced_search(keywords, target, 10)['식당명'].tolist()
+
+
+def test_places_added_to_cached_arrow_data_are_saved_as_arrow(service_df, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path/'log').mkdir()
+    (tmp_path/'data').mkdir()
+    path = str(tmp_path/'service_data.arrow')
+    storage.write_service_table(service_df, path)
+    KakaoAdmin('test', '', dict(), LOCAL_INFO).set_service_data(data_path=path) # 캐시 파일 생성
+
+    admin = KakaoAdmin('test', '', dict(), LOCAL_INFO)
+    admin.set_service_data(data_path=path) # 캐시 파일에서 불러옴
+
+    with open(DATA_PATH, 'r', encoding='UTF-8') as f:
+        place = dict(next(iter(json.load(f)['places'].values())), menu=['쿼카버거'], menu_token='쿼카버거')
+    place['place_url'] = place['place_url'] + '0'
+    places = {'새로운 맛집': place}
+    admin.add_places({'places': places}, admin.service_data.dict_to_df(places, {'address': ['']}))
+
+    assert not os.path.exists('data/service_data.json')
+    df = storage.read_service_df(path, columns=['식당명'])
+    assert len(df) == len(service_df) + 1
+    assert '새로운 맛집' in df['식당명'].tolist()
@@ -0,0 +1,89 @@
+import sys
+import pytest
+import tokenizer
+
+# 형태소 분석 대신 공백으로 나누고, 호출한 문자열과 생성된 프로세스 번호를 기록하는 형태소 분석기
+# (spawn으로 생성한 작업자 프로세스에서도 불러오도록 파일로 작성)
+FAKE_OKT = '''
+import os
+
+
+class Okt:
+
+    calls = list()
+
+    def __init__(self):
+        with open(os.environ['FAKE_OKT_LOG'], 'a') as f:
+            f.write(str(os.getpid()) + '\\n')
+
+    def phrases(self, text):
+        self.calls.append(text)
+        return text.split()
+
+    def pos(self, text, norm=False, stem=False):
+        self.calls.append(text)
+        return [(word, 'Josa' if word in ('이', '가') else 'Noun') for word in text.split()]
+'''
+
+
+@pytest.fixture
+def okt(tmp_path, monkeypatch):
+    """
+    가짜 konlpy 패키지를 사용하도록 형태소 분석기와 토큰화 캐시를 초기화하고, 테스트가 끝나면 다시 초기화
+    """
+
+    package = tmp_path/'konlpy'
+    package.mkdir()
+    (package/'__init__.py').write_text('', encoding='UTF-8')
+    (package/'tag.py').write_text(FAKE_OKT, encoding='UTF-8')
+
+    monkeypatch.setenv('FAKE_OKT_LOG', str(tmp_path/'okt.log'))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ['konlpy', 'konlpy.tag']:
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    monkeypatch.setattr(tokenizer, 'okt', None)
+    tokenizer.get_tokenized_menu.cache_clear()
+    tokenizer.get_tokenized_review.cache_clear()
+
+    yield tokenizer.get_okt()
+
+    tokenizer.get_tokenized_menu.cache_clear()
+    tokenizer.get_tokenized_review.cache_clear()
+
+
+def make_places(size: int) -> list:
+    return [{'category_name': f'음식점 > 한식 > 냉면,국수{i}', 'menu': ['물냉면', f'만두{i}'],
+             'review': [f'육수가 시원해요{i}', 'ㅋㅋ 또 올게요']} for i in range(size)]
+
+
+def test_token_dict_tokenizes_each_menu_and_review_once(okt):
+    first = tokenizer.get_token_dict('음식점 > 한식 > 냉면,국수', ['물냉면', '물냉면 (대)', '물냉면'], ['맛있어요', ''])
+    second = tokenizer.get_token_dict('음식점 > 양식', ['물냉면'], ['맛있어요'])
+
+    assert okt is tokenizer.get_okt() # 프로세스마다 한 번만 생성
+    assert sorted(okt.calls) == ['', '맛있어요', '물냉면', '물냉면 대']
+    assert first['category_token'] == '한식 냉면 국수'
+    assert sorted(first['menu_token'].split()) == ['대', '물냉면'] # 여러 메뉴에 나온 토큰은 한 번만 포함
+    assert second['menu_token'] == '물냉면'
+
+
+def test_review_tokens_keep_content_words_only(okt):
+    tokens = tokenizer.get_tokenized_review('ㅋㅋ 육수 가 시원해요!')
+
+    assert tokens == '육수 시원해요'
+
+
+def test_process_pool_returns_same_tokens_in_place_order(okt, tmp_path):
+    places = make_places(7)
+
+    single = tokenizer.tokenize_places(places, workers=1)
+    pooled = tokenizer.tokenize_places(places, workers=2, batch_size=2)
+
+    for token_dicts in [single, pooled]: # 메뉴 토큰은 메뉴 안에서 순서가 정해져 있지 않음
+        for token_dict in token_dicts:
+            token_dict['menu_token'] = sorted(token_dict['menu_token'].split())
+    assert pooled == single
+
+    pids = (tmp_path/'okt.log').read_text().split()
+    assert len(pids) == len(set(pids)) >= 2 # 작업자 프로세스에서 각각 한 번씩만 형태소 분석기를 생성
+    assert pids[0] == str(tokenizer.os.getpid())
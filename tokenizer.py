@@ -0,0 +1,124 @@
+import json
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+
+okt = None # 프로세스마다 한 번만 생성해 재사용하는 형태소 분석기
+
+
+def get_okt() -> 'Okt':
+    """
+    현재 프로세스의 형태소 분석기를 반환하는 함수 (JVM을 사용하므로 최초 호출 시에만 생성)
+    konlpy는 토큰화가 필요한 경우에만 불러옴
+    """
+
+    global okt
+
+    if okt is None:
+        from konlpy.tag import Okt
+        okt = Okt()
+
+    return okt
+
+
+@lru_cache(maxsize=16384)
+def get_tokenized_menu(menu: str) -> str:
+    """
+    메뉴 하나를 토큰화하는 함수 (같은 메뉴는 캐시된 결과를 사용)
+    """
+
+    menu = re.sub('[-=+,#/\?:^.@*\"※~ㆍ!』‘|\(\)\[\]`\'…》\”\“\’·]', '', menu)
+    menu = ' '.join(get_okt().phrases(menu))
+
+    return ' '.join(set(menu.split()))
+
+
+@lru_cache(maxsize=65536)
+def get_tokenized_review(review: str) -> str:
+    """
+    리뷰 하나를 토큰화하는 함수 (같은 리뷰는 캐시된 결과를 사용)
+    """
+
+    token_list = list()
+
+    review = re.sub('[-=+,#/\?:^.@*\"※~ㆍ!』‘|\(\)\[\]`\'…》\”\“\’·]', '', review)
+    review = re.sub('([ㄱ-ㅎㅏ-ㅣ]+)', '', review)
+
+    for word, pos in get_okt().pos(review, norm=True, stem=True):
+        if pos in ['Noun','Verb','Adjective','Adverb']:
+            token_list.append(word)
+
+    return ' '.join(token_list)
+
+
+def get_token_dict(category: str, menus: list, reviews: list) -> dict:
+    """
+    분류, 메뉴, 리뷰 데이터를 토큰화하는 함수
+    """
+
+    token_dict = dict()
+
+    token_dict['category_token'] = ' '.join(
+        [cat.replace(',',' ') for cat in category.split(' > ')[1:]])
+    # 여러 장소에 반복되는 메뉴와 리뷰가 캐시를 공유하도록 문자열 하나씩 토큰화한 뒤 합침
+    menu_tokens = [token for menu in menus for token in get_tokenized_menu(menu).split()]
+    token_dict['menu_token'] = ' '.join(dict.fromkeys(menu_tokens))
+    token_dict['review_token'] = ' '.join(
+        [tokens for tokens in map(get_tokenized_review, reviews) if tokens])
+
+    return token_dict
+
+
+def tokenize_batch(batch: list) -> list:
+    """
+    (분류, 메뉴 목록, 리뷰 목록) 묶음을 한 번에 토큰화하는 작업자 함수
+    """
+
+    return [get_token_dict(category, menus, reviews) for category, menus, reviews in batch]
+
+
+def tokenize_places(places: list, workers=None, batch_size=32) -> list:
+    """
+    장소 목록의 토큰 딕셔너리를 순서대로 반환하는 함수
+    형태소 분석기를 유지하는 workers개의 프로세스에 batch_size개씩 나누어 전달하며,
+    JVM이 시작된 프로세스를 복제하지 않도록 작업자 프로세스는 spawn 방식으로 생성
+    """
+
+    workers = workers if workers else os.cpu_count()
+    batch = [(place.get('category_name',''), place.get('menu',list()), place.get('review',list()))
+             for place in places]
+
+    if workers <= 1 or len(batch) <= batch_size:
+        return tokenize_batch(batch)
+
+    batches = [batch[i:i+batch_size] for i in range(0, len(batch), batch_size)]
+    mp_context = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        return [token_dict for token_dicts in executor.map(tokenize_batch, batches)
+                for token_dict in token_dicts]
+
+
+def main(data_path: str, workers=None):
+    """
+    스크래핑 없이 저장된 서비스 데이터의 모든 장소를 다시 토큰화해 같은 파일에 저장하는 함수
+    ex) python tokenizer.py data/gm_service_data.json
+    """
+
+    with open(data_path,'r', encoding='UTF-8') as f:
+        service_data = json.load(f)
+
+    places = list(service_data['places'].values())
+    for place, token_dict in zip(places, tokenize_places(places, workers)):
+        place.update(token_dict)
+
+    with open(data_path,'w', encoding='UTF-8') as f:
+        json.dump(service_data, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else None)